@@ -0,0 +1,72 @@
+import json
+import math
+from argparse import ArgumentParser
+
+
+def convergence_report(
+    configurations: list[str],
+    parameter_files: list[str],
+    solution_metrics: list[str],
+    benchmark: str,
+    tool: str,
+    report_file: str,
+) -> dict:
+    """
+    Collects the errors of all configurations of a tool (metrics ending with "_error") and
+    computes the observed convergence rates between consecutive element sizes,
+    rate = log(e_coarse / e_fine) / log(h_coarse / h_fine).
+    """
+    levels = []
+    for configuration, parameter_file, metrics_file in zip(configurations, parameter_files, solution_metrics):
+        with open(parameter_file) as f:
+            parameters = json.load(f)
+        with open(metrics_file) as f:
+            metrics = json.load(f)
+        levels.append(
+            {
+                "configuration": configuration,
+                "element-size": parameters["element-size"]["value"],
+                "element-degree": parameters.get("element-degree"),
+                "errors": {name: value for name, value in metrics.items() if name.endswith("_error")},
+            }
+        )
+    levels.sort(key=lambda level: level["element-size"], reverse=True)
+
+    for coarse, fine in zip(levels, levels[1:]):
+        fine["rates"] = {
+            name: math.log(coarse["errors"][name] / error) / math.log(coarse["element-size"] / fine["element-size"])
+            for name, error in fine["errors"].items()
+            if error > 0.0 and coarse["errors"].get(name, 0.0) > 0.0
+        }
+
+    report = {
+        "benchmark": benchmark,
+        "tool": tool,
+        "levels": levels,
+        # rates of the two finest levels
+        "rates": levels[-1].get("rates", {}),
+    }
+    with open(report_file, "w") as f:
+        json.dump(report, f, indent=4)
+    for name, rate in report["rates"].items():
+        print(f"{tool} {name}: observed rate {rate:.2f}")
+    return report
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Observed convergence rates of the manufactured solution benchmark.")
+    parser.add_argument("--input_configuration", nargs="+", required=True, help="Configuration names (input)")
+    parser.add_argument("--input_parameter_file", nargs="+", required=True, help="Path to the JSON file containing simulation parameters (input)")
+    parser.add_argument("--input_solution_metrics", nargs="+", required=True, help="Path to the metrics JSON file (input)")
+    parser.add_argument("--input_benchmark", required=True, help="Name of the benchmark (input)")
+    parser.add_argument("--input_tool", required=True, help="Name of the tool (input)")
+    parser.add_argument("--output_report_file", required=True, help="Path to the convergence report JSON file (output)")
+    args = parser.parse_args()
+    convergence_report(
+        args.input_configuration,
+        args.input_parameter_file,
+        args.input_solution_metrics,
+        args.input_benchmark,
+        args.input_tool,
+        args.output_report_file,
+    )
@@ -0,0 +1,67 @@
+import json
+from argparse import ArgumentParser
+
+import gmsh
+
+
+def create_mesh(parameter_file, mesh_file):
+    from pint import UnitRegistry
+
+    ureg = UnitRegistry()
+    with open(parameter_file) as f:
+        parameters = json.load(f)
+
+    configuration = parameters["configuration"]
+    length = (
+        ureg.Quantity(parameters["length"]["value"], parameters["length"]["unit"])
+        .to_base_units()
+        .magnitude
+    )
+    element_size = (
+        ureg.Quantity(
+            parameters["element-size"]["value"], parameters["element-size"]["unit"]
+        )
+        .to_base_units()
+        .magnitude
+    )
+    # square [0, length]^2, the manufactured displacement is prescribed on the whole boundary
+    gmsh.initialize()
+    gmsh.model.add(configuration)
+
+    gmsh.option.setNumber("Mesh.CharacteristicLengthMin", element_size)
+    gmsh.option.setNumber("Mesh.CharacteristicLengthMax", element_size)
+    gmsh.option.setNumber("Mesh.CharacteristicLengthFactor", 1.0)
+    gmsh.option.setNumber("Mesh.ElementOrder", parameters["element-order"])
+
+    z = 0.0
+    lc = 1.0
+
+    p1 = gmsh.model.geo.addPoint(0.0, 0.0, z, lc)
+    p2 = gmsh.model.geo.addPoint(length, 0.0, z, lc)
+    p3 = gmsh.model.geo.addPoint(length, length, z, lc)
+    p4 = gmsh.model.geo.addPoint(0.0, length, z, lc)
+
+    lines = [
+        gmsh.model.geo.addLine(p1, p2),
+        gmsh.model.geo.addLine(p2, p3),
+        gmsh.model.geo.addLine(p3, p4),
+        gmsh.model.geo.addLine(p4, p1),
+    ]
+
+    curve = gmsh.model.geo.addCurveLoop(lines)
+    plane = gmsh.model.geo.addPlaneSurface([curve])
+    gmsh.model.geo.synchronize()
+    gmsh.model.addPhysicalGroup(2, [plane], 1, name="surface")
+    gmsh.model.addPhysicalGroup(1, lines, 1, name="boundary")
+
+    gmsh.model.mesh.generate(2)
+    gmsh.write(mesh_file)
+    gmsh.finalize()
+
+
+if __name__ == "__main__":
+    PARSER = ArgumentParser(description="Create the mesh of the square for the manufactured solution benchmark")
+    PARSER.add_argument("--input_parameter_file", required=True, help="JSON file containing simulation parameters")
+    PARSER.add_argument("--output_mesh_file", required=True, help="Output path for the generated mesh (.msh)")
+    ARGS = vars(PARSER.parse_args())
+    create_mesh(ARGS["input_parameter_file"], ARGS["output_mesh_file"])
@@ -0,0 +1,36 @@
+process run_simulation {
+    tag "${configuration}"
+    publishDir "${params.result_dir}/fenics/"
+    conda './fenics/environment_simulation.yml'
+
+    input:
+    path python_script
+    // mms_codegen.py is imported from the project directory, as input it is part of the task hash
+    path codegen
+    tuple val(configuration), path(parameter_file), path(mesh_file), path(source_terms)
+
+    output:
+    tuple val(configuration), path("solution_field_data_${configuration}.zip"), path("solution_metrics_${configuration}.json")
+
+    script:
+    """
+    python3 $python_script --input_parameter_file $parameter_file --input_mesh_file $mesh_file --input_source_terms $source_terms --output_solution_file_zip "solution_field_data_${configuration}.zip" --output_metrics_file "solution_metrics_${configuration}.json"
+    """
+}
+
+workflow fenics_workflow {
+
+    take:
+    input_data // tuple(configuration, parameters, mesh, source terms)
+    result_dir
+
+    main:
+    params.result_dir = result_dir
+    run_sim_script = Channel.value(file('fenics/run_fenics_simulation.py'))
+    codegen = Channel.value(file('mms_codegen.py'))
+    output_process_run_simulation = run_simulation( run_sim_script, codegen, input_data )
+
+    emit:
+    output_process_run_simulation
+
+}
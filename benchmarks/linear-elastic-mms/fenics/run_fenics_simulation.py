@@ -0,0 +1,177 @@
+import json
+import sys
+from argparse import ArgumentParser
+from pathlib import Path
+
+import dolfinx as df
+import numpy as np
+import ufl
+from dolfinx.fem.petsc import LinearProblem
+from mpi4py import MPI
+from pint import UnitRegistry
+
+# Add parent directory to sys.path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from mms_codegen import load_source_terms
+
+
+def run_fenics_simulation(
+    parameter_file: str,
+    mesh_file: str,
+    source_terms_file: str,
+    solution_file_zip: str,
+    metrics_file: str,
+) -> None:
+    """
+    Solves the plane stress problem of the manufactured solution on the square: the body force
+    is the UFL expression of the generated source term module (see mms_codegen.py) and the
+    manufactured displacement is prescribed on the whole boundary. The L2 and H1 (semi-norm)
+    errors of the displacement and the maximum error at the dofs are written to the metrics file.
+    """
+    ureg = UnitRegistry()
+    with open(parameter_file) as f:
+        parameters = json.load(f)
+
+    E = (
+        ureg.Quantity(
+            parameters["young-modulus"]["value"], parameters["young-modulus"]["unit"]
+        )
+        .to_base_units()
+        .magnitude
+    )
+    nu = (
+        ureg.Quantity(
+            parameters["poisson-ratio"]["value"], parameters["poisson-ratio"]["unit"]
+        )
+        .to_base_units()
+        .magnitude
+    )
+    source_terms = load_source_terms(source_terms_file)
+
+    mesh, cell_tags, facet_tags = df.io.gmshio.read_from_msh(
+        mesh_file,
+        comm=MPI.COMM_WORLD,
+        gdim=2,
+    )
+    V = df.fem.functionspace(mesh, ("CG", parameters["element-degree"], (2,)))
+
+    u_exact = df.fem.Function(V, name="u_exact")
+    u_exact.interpolate(source_terms.displacement)
+    u_exact.x.scatter_forward()
+    bcs = [df.fem.dirichletbc(u_exact, df.fem.locate_dofs_topological(V, 1, facet_tags.find(1)))]
+
+    def eps(v):
+        return ufl.sym(ufl.grad(v))
+
+    def sigma(v):
+        # plane stress
+        epsilon = eps(v)
+        return (
+            E
+            / (1.0 - nu**2)
+            * ((1.0 - nu) * epsilon + nu * ufl.tr(epsilon) * ufl.Identity(2))
+        )
+
+    x = ufl.SpatialCoordinate(mesh)
+    u_ = ufl.TestFunction(V)
+    v_ = ufl.TrialFunction(V)
+    problem = LinearProblem(
+        ufl.inner(sigma(u_), eps(v_)) * ufl.dx,
+        ufl.inner(source_terms.body_force_ufl(x), u_) * ufl.dx,
+        bcs=bcs,
+        petsc_options={
+            "ksp_type": "preonly",
+            "pc_type": "lu",
+            "pc_factor_mat_solver_type": "mumps",
+        },
+    )
+    u = problem.solve()
+    u.name = "u"
+
+    # errors with respect to the UFL expression of the manufactured displacement, integrated
+    # with a higher quadrature degree than the one of the forms
+    dx_error = ufl.Measure(
+        "dx", domain=mesh, metadata={"quadrature_degree": parameters["quadrature-degree"]}
+    )
+    error = u - source_terms.displacement_ufl(x)
+
+    def norm(form):
+        return np.sqrt(
+            MPI.COMM_WORLD.allreduce(df.fem.assemble_scalar(df.fem.form(form)), op=MPI.SUM)
+        )
+
+    u_error = df.fem.Function(V, name="error")
+    u_error.x.array[:] = u.x.array - u_exact.x.array
+    owned_size = V.dofmap.index_map.size_local * V.dofmap.index_map_bs
+
+    metrics = {
+        "l2_error": norm(ufl.inner(error, error) * dx_error),
+        "h1_error": norm(ufl.inner(ufl.grad(error), ufl.grad(error)) * dx_error),
+        "max_nodal_error": MPI.COMM_WORLD.allreduce(
+            float(np.max(np.abs(u_error.x.array[:owned_size]))), op=MPI.MAX
+        ),
+        "l2_norm": norm(ufl.inner(u_exact, u_exact) * dx_error),
+        "dofs": MPI.COMM_WORLD.allreduce(owned_size, op=MPI.SUM),
+    }
+
+    output_dir = Path(solution_file_zip).parent
+    configuration = parameters["configuration"]
+    files = {"displacements": u, "error": u_error}
+    for name, function in files.items():
+        with df.io.VTKFile(
+            MPI.COMM_WORLD,
+            str(output_dir / f"solution_field_data_{name}_{configuration}.vtk"),
+            "w",
+        ) as vtk:
+            vtk.write_function(function, 0.0)
+
+    if MPI.COMM_WORLD.rank == 0:
+        # store all .vtu, .pvtu and .vtk files for this configuration in the zip file
+        import zipfile
+
+        with zipfile.ZipFile(solution_file_zip, "w") as zipf:
+            for name in files:
+                for filepath in output_dir.glob(f"solution_field_data_{name}_{configuration}*"):
+                    if filepath.suffix in [".vtk", ".vtu", ".pvtu"]:
+                        zipf.write(filepath, arcname=filepath.name)
+        with open(metrics_file, "w") as f:
+            json.dump(metrics, f, indent=4)
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        description="Run the FEniCS simulation of the manufactured solution.\n"
+        "Inputs: --input_parameter_file, --input_mesh_file, --input_source_terms\n"
+        "Outputs: --output_solution_file_zip, --output_metrics_file"
+    )
+    parser.add_argument(
+        "--input_parameter_file",
+        required=True,
+        help="JSON file containing simulation parameters (input)",
+    )
+    parser.add_argument(
+        "--input_mesh_file", required=True, help="Path to the mesh file (input)"
+    )
+    parser.add_argument(
+        "--input_source_terms",
+        required=True,
+        help="Path to the source term module generated by mms_codegen.py (input)",
+    )
+    parser.add_argument(
+        "--output_solution_file_zip",
+        required=True,
+        help="Path to the zipped solution files (output)",
+    )
+    parser.add_argument(
+        "--output_metrics_file",
+        required=True,
+        help="Path to the output metrics JSON file (output)",
+    )
+    args, _ = parser.parse_known_args()
+    run_fenics_simulation(
+        args.input_parameter_file,
+        args.input_mesh_file,
+        args.input_source_terms,
+        args.output_solution_file_zip,
+        args.output_metrics_file,
+    )
@@ -0,0 +1,127 @@
+import json
+import os
+import sys
+from argparse import ArgumentParser
+from pathlib import Path
+
+from pint import UnitRegistry
+
+# Add parent directory to sys.path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from mms_codegen import load_source_terms
+
+
+def create_kratos_input(
+    parameter_file: str,
+    mdpa_file: str,
+    source_terms_file: str,
+    kratos_input_template_file: str,
+    kratos_material_template_file: str,
+    kratos_input_file: str,
+    kratos_material_file: str,
+):
+    """
+    Writes the kratos input and material files of the manufactured solution. The Dirichlet data
+    of the boundary are the function strings of the generated source term module, the body
+    force is part of the MDPA file (see msh_to_mdpa.py).
+    """
+    ureg = UnitRegistry()
+    with open(parameter_file) as f:
+        parameters = json.load(f)
+
+    E = (
+        ureg.Quantity(
+            parameters["young-modulus"]["value"], parameters["young-modulus"]["unit"]
+        )
+        .to_base_units()
+        .magnitude
+    )
+    nu = (
+        ureg.Quantity(
+            parameters["poisson-ratio"]["value"], parameters["poisson-ratio"]["unit"]
+        )
+        .to_base_units()
+        .magnitude
+    )
+    bc = load_source_terms(source_terms_file).DISPLACEMENT_KRATOS
+
+    with open(kratos_material_template_file) as f:
+        material_string = f.read()
+
+    material_string = material_string.replace(r'"{{YOUNG_MODULUS}}"', str(E))
+    material_string = material_string.replace(r'"{{POISSON_RATIO}}"', str(nu))
+
+    with open(kratos_material_file, "w") as f:
+        f.write(material_string)
+
+    # relative paths, resolved when the simulation is run (see run_kratos_simulation.py)
+    with open(kratos_input_template_file) as f:
+        project_parameters_string = f.read()
+    project_parameters_string = project_parameters_string.replace(
+        r"{{MESH_FILE}}", os.path.splitext(os.path.basename(mdpa_file))[0]
+    )
+    project_parameters_string = project_parameters_string.replace(
+        r"{{MATERIAL_FILE}}", os.path.basename(kratos_material_file)
+    )
+    project_parameters_string = project_parameters_string.replace(
+        r"{{BOUNDARY_DISPLACEMENT_X}}", bc[0]
+    )
+    project_parameters_string = project_parameters_string.replace(
+        r"{{BOUNDARY_DISPLACEMENT_Y}}", bc[1]
+    )
+    project_parameters_string = project_parameters_string.replace(
+        r"{{OUTPUT_PATH}}", str(parameters["configuration"])
+    )
+
+    with open(kratos_input_file, "w") as f:
+        f.write(project_parameters_string)
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        description="Create Kratos input and material files of the manufactured solution."
+    )
+    parser.add_argument(
+        "--input_parameter_file",
+        required=True,
+        help="JSON file containing simulation parameters (input)",
+    )
+    parser.add_argument(
+        "--input_mdpa_file", required=True, help="Path to the MDPA mesh file (input)"
+    )
+    parser.add_argument(
+        "--input_source_terms",
+        required=True,
+        help="Path to the source term module generated by mms_codegen.py (input)",
+    )
+    parser.add_argument(
+        "--input_kratos_input_template",
+        required=True,
+        help="Path to the kratos input template file (input)",
+    )
+    parser.add_argument(
+        "--input_material_template",
+        required=True,
+        help="Path to the kratos material template file (input)",
+    )
+    parser.add_argument(
+        "--output_kratos_inputfile",
+        required=True,
+        help="Path to the kratos input file (output)",
+    )
+    parser.add_argument(
+        "--output_kratos_materialfile",
+        required=True,
+        help="Path to the kratos material file (output)",
+    )
+    args, _ = parser.parse_known_args()
+
+    create_kratos_input(
+        parameter_file=args.input_parameter_file,
+        mdpa_file=args.input_mdpa_file,
+        source_terms_file=args.input_source_terms,
+        kratos_input_template_file=args.input_kratos_input_template,
+        kratos_material_template_file=args.input_material_template,
+        kratos_input_file=args.output_kratos_inputfile,
+        kratos_material_file=args.output_kratos_materialfile,
+    )
@@ -0,0 +1,134 @@
+process mesh_to_mdpa {
+    tag "${configuration}"
+    publishDir "${params.result_dir}/kratos/"
+    conda './kratos/environment_simulation.yml'
+
+    input:
+    path python_script
+    // mms_codegen.py is imported from the project directory, as input it is part of the task hash
+    path codegen
+    tuple val(configuration), path(parameter_file), path(mesh_file), path(source_terms)
+
+    output:
+    tuple val(configuration), path("mesh_${configuration}.mdpa")
+
+    script:
+    """
+    python3 ${python_script} \
+        --input_parameter_file ${parameter_file} \
+        --input_mesh_file ${mesh_file} \
+        --input_source_terms ${source_terms} \
+        --output_mdpa_file mesh_${configuration}.mdpa
+    """
+}
+
+process create_kratos_input {
+    tag "${configuration}"
+    publishDir "${params.result_dir}/kratos/"
+    conda './kratos/environment_simulation.yml'
+
+    input:
+    path python_script
+    path codegen
+    tuple val(configuration), path(parameter_file), path(source_terms), path(mdpa)
+    path kratos_input_template
+    path kratos_material_template
+
+    output:
+    tuple val(configuration), path("ProjectParameters_${configuration}.json"), path("MaterialParameters_${configuration}.json")
+
+    script:
+    """
+    python3 ${python_script} \
+        --input_parameter_file ${parameter_file} \
+        --input_mdpa_file ${mdpa} \
+        --input_source_terms ${source_terms} \
+        --input_kratos_input_template ${kratos_input_template} \
+        --input_material_template ${kratos_material_template} \
+        --output_kratos_inputfile ProjectParameters_${configuration}.json \
+        --output_kratos_materialfile MaterialParameters_${configuration}.json
+    """
+}
+
+process run_kratos_simulation {
+    tag "${configuration}"
+    publishDir "${params.result_dir}/kratos/"
+    conda './kratos/environment_simulation.yml'
+
+    input:
+    path python_script
+    tuple val(configuration), path(mdpa), path(kratos_inputfile), path(kratos_materialfile)
+
+    output:
+    tuple val(configuration), path("${configuration}/Structure_0_1.vtk")
+
+    script:
+    """
+    python3 ${python_script} \
+        --input_kratos_inputfile ${kratos_inputfile} \
+        --input_kratos_materialfile ${kratos_materialfile} \
+        --input_mdpa_file ${mdpa} \
+        --output_result_dir ${configuration}
+    """
+}
+
+process postprocess_kratos_results {
+    tag "${configuration}"
+    publishDir "${params.result_dir}/kratos/"
+    conda './kratos/environment_simulation.yml'
+
+    input:
+    path python_script
+    path codegen
+    tuple val(configuration), path(parameter_file), path(source_terms), path(result_vtk)
+
+    output:
+    tuple val(configuration), path("solution_field_data_${configuration}.zip"), path("solution_metrics_${configuration}.json")
+
+    script:
+    """
+    python3 ${python_script} \
+        --input_parameter_file ${parameter_file} \
+        --input_result_vtk ${result_vtk} \
+        --input_source_terms ${source_terms} \
+        --output_solution_file_zip solution_field_data_${configuration}.zip \
+        --output_metrics_file solution_metrics_${configuration}.json
+    """
+}
+
+workflow kratos_workflow {
+    take:
+    input_data // tuple(configuration, parameters, mesh, source terms)
+    result_dir
+
+    main:
+    params.result_dir = result_dir
+    codegen = Channel.value(file('mms_codegen.py'))
+
+    output_process_mesh_to_mdpa = mesh_to_mdpa(Channel.value(file('kratos/msh_to_mdpa.py')), codegen, input_data)
+
+    // tuple(configuration, parameters, source terms)
+    parameters_and_source_terms = input_data.map { c, p, _m, s -> tuple(c, p, s) }
+
+    output_process_create_kratos_input = create_kratos_input(
+        Channel.value(file('kratos/create_kratos_input.py')),
+        codegen,
+        parameters_and_source_terms.join(output_process_mesh_to_mdpa),
+        Channel.value(file('kratos/input_template.json')),
+        Channel.value(file('kratos/StructuralMaterials_template.json'))
+    )
+
+    output_process_run_kratos_simulation = run_kratos_simulation(
+        Channel.value(file('kratos/run_kratos_simulation.py')),
+        output_process_mesh_to_mdpa.join(output_process_create_kratos_input)
+    )
+
+    output_process_postprocess_kratos_results = postprocess_kratos_results(
+        Channel.value(file('kratos/postprocess_results.py')),
+        codegen,
+        parameters_and_source_terms.join(output_process_run_kratos_simulation)
+    )
+
+    emit:
+    output_process_postprocess_kratos_results
+}
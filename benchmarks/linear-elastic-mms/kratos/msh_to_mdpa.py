@@ -0,0 +1,99 @@
+import json
+import re
+import sys
+from argparse import ArgumentParser
+from pathlib import Path
+
+import meshio
+import numpy as np
+from pint import UnitRegistry
+
+# Add parent directory to sys.path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from mms_codegen import load_source_terms
+
+
+def msh_to_mdpa(parameter_file: str, mesh_file: str, source_terms_file: str, mdpa_file: str):
+    """
+    Converts the GMSH mesh of the square to a Kratos MDPA file, as msh_to_mdpa.py of the linear
+    elastic plate with a hole (element types replaced, Line2D elements and gmsh:dim_tags removed).
+    Additionally, the file contains
+    - the SubModelPart boundary with the nodes of all four edges (Dirichlet boundary),
+    - the body force of the generated source term module (see mms_codegen.py) as nodal data
+      VOLUME_ACCELERATION_X and VOLUME_ACCELERATION_Y. The material has the density 1, the
+      elements therefore interpolate the body force per unit volume from the nodes.
+    """
+    ureg = UnitRegistry()
+    with open(parameter_file) as f:
+        parameters = json.load(f)
+    L = (
+        ureg.Quantity(parameters["length"]["value"], parameters["length"]["unit"])
+        .to_base_units()
+        .magnitude
+    )
+    source_terms = load_source_terms(source_terms_file)
+
+    mesh = meshio.read(mesh_file)
+    meshio.write(mdpa_file, mesh)
+
+    with open(mdpa_file, "r") as f:
+        text = f.read()
+
+    text = text.replace("Triangle2D3", "SmallDisplacementElement2D3N")
+    text = text.replace("Triangle2D6", "SmallDisplacementElement2D6N")
+    text = re.sub(r"Begin\s+Elements\s+Line2D[\n\s\d]*End\s+Elements", "", text)
+    text = re.sub(
+        r"Begin\s+NodalData\s+gmsh:dim_tags[\s\n]*(.*)End\s+NodalData\s+gmsh:dim_tags",
+        "",
+        text,
+        flags=re.DOTALL,
+    )
+
+    points = mesh.points[:, :2]
+    on_boundary = np.any(np.isclose(points, 0.0) | np.isclose(points, L), axis=1)
+    nodes = np.argwhere(on_boundary).flatten() + 1
+    text += "\nBegin SubModelPart boundary\n"
+    text += "    Begin SubModelPartNodes\n        "
+    text += "\n        ".join(map(str, nodes)) + "\n"
+    text += "    End SubModelPartNodes\n"
+    text += "End SubModelPart\n"
+
+    body_force = source_terms.body_force(points.T)
+    for component, values in zip("XY", body_force):
+        text += f"\nBegin NodalData VOLUME_ACCELERATION_{component}\n"
+        text += "".join(f"    {node} 0 {value!r}\n" for node, value in enumerate(values, start=1))
+        text += "End NodalData\n"
+
+    with open(mdpa_file, "w") as f:
+        f.write(text)
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        description="Convert GMSH mesh to Kratos MDPA format with the body force of the manufactured solution."
+    )
+    parser.add_argument(
+        "--input_parameter_file",
+        required=True,
+        help="JSON file containing simulation parameters (input)",
+    )
+    parser.add_argument(
+        "--input_mesh_file", required=True, help="Path to the mesh file (input)"
+    )
+    parser.add_argument(
+        "--input_source_terms",
+        required=True,
+        help="Path to the source term module generated by mms_codegen.py (input)",
+    )
+    parser.add_argument(
+        "--output_mdpa_file",
+        required=True,
+        help="Path to the MDPA file (output)",
+    )
+    args, _ = parser.parse_known_args()
+    msh_to_mdpa(
+        args.input_parameter_file,
+        args.input_mesh_file,
+        args.input_source_terms,
+        args.output_mdpa_file,
+    )
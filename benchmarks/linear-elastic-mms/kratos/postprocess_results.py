@@ -0,0 +1,79 @@
+import json
+import sys
+import zipfile
+from argparse import ArgumentParser
+from pathlib import Path
+
+import numpy as np
+import pyvista
+
+# Add parent directory to sys.path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from mms_codegen import load_source_terms
+
+
+def postprocess_results(
+    input_parameter_file, input_result_vtk, input_source_terms, output_metrics_file, output_solution_file_zip
+):
+    """
+    Writes the maximum and the root mean square of the displacement error at the nodes, the
+    manufactured displacement is the NumPy function of the generated source term module.
+    """
+    with open(input_parameter_file) as f:
+        parameters = json.load(f)
+    config = parameters["configuration"]
+
+    mesh = pyvista.read(str(input_result_vtk))
+    u_exact = load_source_terms(input_source_terms).displacement(mesh.points.T)
+    error = np.linalg.norm(mesh["DISPLACEMENT"][:, :2] - u_exact.T, axis=1)
+    metrics = {
+        "max_nodal_error": float(error.max()),
+        "rms_nodal_error": float(np.sqrt(np.mean(error**2))),
+        "nodes": int(mesh.n_points),
+    }
+    print("Max nodal error:", metrics["max_nodal_error"])
+    with open(output_metrics_file, "w") as f:
+        json.dump(metrics, f, indent=4)
+
+    with zipfile.ZipFile(output_solution_file_zip, "w") as zipf:
+        zipf.write(str(input_result_vtk), arcname=f"result_{config}.vtk")
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        description="Postprocess Kratos results of the manufactured solution and write metrics and zipped solution."
+    )
+    parser.add_argument(
+        "--input_parameter_file",
+        required=True,
+        help="JSON file containing simulation parameters (input)",
+    )
+    parser.add_argument(
+        "--input_result_vtk",
+        required=True,
+        help="Path to the Kratos result VTK file (input)",
+    )
+    parser.add_argument(
+        "--input_source_terms",
+        required=True,
+        help="Path to the source term module generated by mms_codegen.py (input)",
+    )
+    parser.add_argument(
+        "--output_solution_file_zip",
+        required=True,
+        help="Path to the zipped solution files (output)",
+    )
+    parser.add_argument(
+        "--output_metrics_file",
+        required=True,
+        help="Path to the output metrics JSON file (output)",
+    )
+    args, _ = parser.parse_known_args()
+
+    postprocess_results(
+        args.input_parameter_file,
+        args.input_result_vtk,
+        args.input_source_terms,
+        args.output_metrics_file,
+        args.output_solution_file_zip,
+    )
@@ -0,0 +1,71 @@
+import json
+import os
+from argparse import ArgumentParser
+
+
+def run_kratos_simulation(
+    kratos_input_file: str,
+    kratos_material_file: str,
+    mdpa_file: str,
+    output_dir: str,
+) -> None:
+    """
+    Runs the Kratos simulation of a kratos input file written by create_kratos_input.py. The
+    relative paths of the input file are replaced by the given files (e.g. the staged files
+    of a Nextflow task).
+    """
+    # Kratos is imported here (not at module level), it dominates the startup time of the script
+    import KratosMultiphysics
+    from KratosMultiphysics.StructuralMechanicsApplication.structural_mechanics_analysis import (
+        StructuralMechanicsAnalysis,
+    )
+
+    with open(kratos_input_file, "r") as kratos_input:
+        project_parameters = json.load(kratos_input)
+
+    solver_settings = project_parameters["solver_settings"]
+    solver_settings["model_import_settings"]["input_filename"] = os.path.splitext(os.path.abspath(mdpa_file))[0]
+    solver_settings["material_import_settings"]["materials_filename"] = os.path.abspath(kratos_material_file)
+    for vtk_output in project_parameters["output_processes"]["vtk_output"]:
+        vtk_output["Parameters"]["output_path"] = os.path.abspath(output_dir)
+    os.makedirs(output_dir, exist_ok=True)
+
+    model = KratosMultiphysics.Model()
+    simulation = StructuralMechanicsAnalysis(model, KratosMultiphysics.Parameters(json.dumps(project_parameters)))
+    simulation.Run()
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        description="Run the Kratos simulation of the manufactured solution.\n"
+        "Inputs: --input_kratos_inputfile, --input_kratos_materialfile, --input_mdpa_file\n"
+        "Outputs: --output_result_dir"
+    )
+    parser.add_argument(
+        "--input_kratos_inputfile",
+        required=True,
+        help="Path to the kratos input file (input)",
+    )
+    parser.add_argument(
+        "--input_kratos_materialfile",
+        required=True,
+        help="Path to the kratos material file (input)",
+    )
+    parser.add_argument(
+        "--input_mdpa_file",
+        required=True,
+        help="Path to the MDPA mesh file (input)",
+    )
+    parser.add_argument(
+        "--output_result_dir",
+        required=True,
+        help="Directory of the vtk results (output)",
+    )
+    args, _ = parser.parse_known_args()
+
+    run_kratos_simulation(
+        args.input_kratos_inputfile,
+        args.input_kratos_materialfile,
+        args.input_mdpa_file,
+        args.output_result_dir,
+    )
@@ -0,0 +1,98 @@
+include { fenics_workflow } from './fenics/fenics.nf'
+include { kratos_workflow } from './kratos/kratos.nf'
+
+process create_mesh {
+    tag "${configuration}"
+    publishDir "${params.result_dir}/mesh/"
+    conda 'environment_mesh.yml'
+
+    input:
+    path python_script
+    val configuration
+    path parameter_file
+
+    output:
+    tuple val(configuration), path("mesh_${configuration}.msh")
+
+    script:
+    """
+    python3 $python_script --input_parameter_file $parameter_file --output_mesh_file "mesh_${configuration}.msh"
+    """
+}
+
+process generate_source_terms {
+    // the source terms are derived once and afterwards copied from the cache (params.mms_cache)
+    tag "${configuration}"
+    publishDir "${params.result_dir}/source_terms/"
+    conda 'environment_codegen.yml'
+
+    input:
+    path python_script
+    val configuration
+    path parameter_file
+
+    output:
+    tuple val(configuration), path("source_terms_${configuration}.py")
+
+    script:
+    """
+    python3 $python_script --input_parameter_file $parameter_file --cache_dir ${params.mms_cache} --output_source_terms "source_terms_${configuration}.py"
+    """
+}
+
+process convergence_report {
+    publishDir "${params.result_dir}/${tool}/"
+    conda 'environment_postprocessing.yml'
+
+    input:
+    path python_script
+    tuple val(tool), val(configuration), val(parameter_file), val(solution_metrics)
+    val benchmark
+
+    output:
+    path("convergence_report.json")
+
+    script:
+    """
+    python3 $python_script \
+        --input_configuration ${configuration.join(' ')} \
+        --input_parameter_file ${parameter_file.join(' ')} \
+        --input_solution_metrics ${solution_metrics.join(' ')} \
+        --input_benchmark ${benchmark} \
+        --input_tool ${tool} \
+        --output_report_file "convergence_report.json"
+    """
+}
+
+workflow {
+    main:
+
+    def parameter_files_path = []
+    params.configurations.each { elem ->
+        parameter_files_path.add(file(params.configuration_to_parameter_file[elem]))
+    }
+
+    def ch_parameter_files = Channel.fromList(parameter_files_path)
+    def ch_configurations = Channel.fromList(params.configurations)
+
+    //Creating Mesh and source terms
+    output_process_create_mesh = create_mesh(Channel.value(file('create_mesh.py')), ch_configurations, ch_parameter_files)
+    output_process_generate_source_terms = generate_source_terms(Channel.value(file('mms_codegen.py')), ch_configurations, ch_parameter_files)
+
+    // tuple(configuration, parameters, mesh, source terms)
+    input_tool_workflows = ch_configurations.merge(ch_parameter_files)
+        .join(output_process_create_mesh)
+        .join(output_process_generate_source_terms)
+
+    //Running Simulations
+    fenics_workflow(input_tool_workflows, params.result_dir)
+    kratos_workflow(input_tool_workflows, params.result_dir)
+
+    //Convergence rates of each tool, tuple(tool, configurations, parameter files, metrics)
+    def metrics = fenics_workflow.out.map { c, _z, m -> tuple(c, 'fenics', m) }
+        .mix(kratos_workflow.out.map { c, _z, m -> tuple(c, 'kratos', m) })
+    def report_input = ch_configurations.merge(ch_parameter_files).cross(metrics)
+        .map { cp, ctm -> tuple(ctm[1], cp[0], cp[1], ctm[2]) }
+        .groupTuple()
+    convergence_report(Channel.value(file('convergence_report.py')), report_input, Channel.value(params.benchmark))
+}
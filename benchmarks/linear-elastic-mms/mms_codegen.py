@@ -0,0 +1,252 @@
+import hashlib
+import importlib.util
+import json
+import os
+import shutil
+import tempfile
+from argparse import ArgumentParser
+from functools import cache
+from pathlib import Path
+from types import ModuleType
+
+# Increase when the generated code changes, modules of older versions are not reused.
+GENERATOR_VERSION = 1
+
+# entries of the parameter file that determine the generated code
+SOURCE_TERM_PARAMETERS = ("manufactured-displacement", "young-modulus", "poisson-ratio")
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent / ".mms_cache"
+
+
+@cache
+def _unit_registry():
+    # creating a registry takes about 0.1 s, it is shared by all lookups of a process
+    from pint import UnitRegistry
+
+    return UnitRegistry()
+
+
+def _base_units(value: float, unit: str) -> list:
+    """Magnitude (12 significant digits) and unit of a quantity in base units, e.g. 210 GPa and 210e9 Pa are equal."""
+    quantity = _unit_registry().Quantity(value, unit).to_base_units()
+    return [float(f"{quantity.magnitude:.12g}"), f"{quantity.units:~}"]
+
+
+def cache_key(parameters: dict) -> str:
+    """
+    Hash of the manufactured displacement expressions and the material constants. The material
+    constants and the unit of the displacement are converted to base units with pint, the
+    expressions are hashed as given in the parameter file (whitespace removed), such that a
+    cache lookup does not need sympy.
+    """
+    key = {
+        name: _base_units(parameters[name]["value"], parameters[name]["unit"])
+        for name in SOURCE_TERM_PARAMETERS
+        if name != "manufactured-displacement"
+    }
+    manufactured = parameters["manufactured-displacement"]
+    key["manufactured-displacement"] = {
+        "value": ["".join(expression.split()) for expression in manufactured["value"]],
+        "unit": _base_units(1.0, manufactured["unit"]),
+    }
+    key["generator-version"] = GENERATOR_VERSION
+    return hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def generate_source(parameters: dict) -> str:
+    """
+    Derives the body force f = -div(sigma(u)) and the stress of the manufactured displacement u
+    (plane stress, expressions in x and y in base units) with sympy and returns the source
+    code of a module with
+    - `displacement(x)`, `body_force(x)` and `stress(x)`: NumPy functions of the points x
+      (2, N) or (3, N), returning (2, N) and the stress components xx, yy, xy (3, N),
+    - `displacement_ufl(x)` and `body_force_ufl(x)`: UFL expressions of the spatial
+      coordinate x = ufl.SpatialCoordinate(mesh),
+    - `DISPLACEMENT_KRATOS`: the displacement as function strings of X and Y for the
+      Dirichlet conditions of Kratos.
+    The expressions are simplified by common subexpression elimination.
+    """
+    import sympy as sp
+    from pint import UnitRegistry
+    from sympy.printing.str import StrPrinter
+
+    ureg = UnitRegistry()
+
+    def magnitude(name):
+        return (
+            ureg.Quantity(parameters[name]["value"], parameters[name]["unit"])
+            .to_base_units()
+            .magnitude
+        )
+
+    E = magnitude("young-modulus")
+    nu = magnitude("poisson-ratio")
+    manufactured = parameters["manufactured-displacement"]
+    scale = ureg.Quantity(1.0, manufactured["unit"]).to_base_units().magnitude
+
+    x, y = sp.symbols("x y", real=True)
+    u = sp.Matrix([scale * sp.sympify(expression, locals={"x": x, "y": y}) for expression in manufactured["value"]])
+    grad_u = u.jacobian([x, y])
+    eps = (grad_u + grad_u.T) / 2
+    # plane stress
+    sigma = E / (1 - nu**2) * ((1 - nu) * eps + nu * eps.trace() * sp.eye(2))
+    f = -sp.Matrix(
+        [
+            sp.diff(sigma[0, 0], x) + sp.diff(sigma[0, 1], y),
+            sp.diff(sigma[1, 0], x) + sp.diff(sigma[1, 1], y),
+        ]
+    )
+    stress = [sigma[0, 0], sigma[1, 1], sigma[0, 1]]
+
+    class CodePrinter(StrPrinter):
+        """Python code of an expression of x and y with the functions of `module`."""
+
+        def __init__(self, module: str, coordinates: tuple[str, str], renamed_functions: dict | None = None):
+            super().__init__()
+            self.module = module
+            self.coordinates = dict(zip((x, y), coordinates))
+            self.renamed_functions = renamed_functions or {}
+
+        def _print_Symbol(self, expr):
+            return self.coordinates.get(expr, expr.name)
+
+        def _print_Function(self, expr):
+            name = self.renamed_functions.get(expr.func.__name__, expr.func.__name__)
+            prefix = f"{self.module}." if self.module else ""
+            return f"{prefix}{name}({self.stringify(expr.args, ', ')})"
+
+        def _print_Abs(self, expr):
+            return f"abs({self._print(expr.args[0])})"
+
+        def _print_Pow(self, expr, rational=False):
+            if expr.exp in (sp.S.Half, -sp.S.Half):
+                prefix = f"{self.module}." if self.module else ""
+                root = f"{prefix}sqrt({self._print(expr.base)})"
+                return root if expr.exp is sp.S.Half else f"1/{root}"
+            return super()._print_Pow(expr, rational)
+
+        def _print_Float(self, expr):
+            return repr(float(expr))
+
+        def _print_NumberSymbol(self, expr):
+            return repr(float(expr))
+
+        _print_Pi = _print_NumberSymbol
+        _print_Exp1 = _print_NumberSymbol
+
+    def function_source(name, expressions, printer, result, docstring):
+        temporaries, reduced = sp.cse(list(expressions), symbols=sp.numbered_symbols("t"))
+        lines = [f"def {name}(x):", f'    """{docstring}"""']
+        if printer.module == "ufl":
+            lines.append("    import ufl")
+            lines.append("")
+        lines += [f"    {symbol} = {printer.doprint(value)}" for symbol, value in temporaries]
+        lines.append(f"    return {result.format(', '.join(printer.doprint(e) for e in reduced))}")
+        return "\n".join(lines)
+
+    numpy_printer = CodePrinter("np", ("x[0]", "x[1]"))
+    ufl_printer = CodePrinter("ufl", ("x[0]", "x[1]"), {"log": "ln"})
+    kratos_printer = CodePrinter("", ("X", "Y"))
+
+    functions = [
+        function_source(
+            "displacement", u, numpy_printer, "_stack(x, [{}])",
+            "Manufactured displacement (2, N) at the points x (2, N) or (3, N).",
+        ),
+        function_source(
+            "body_force", f, numpy_printer, "_stack(x, [{}])",
+            "Body force -div(sigma) (2, N) at the points x (2, N) or (3, N).",
+        ),
+        function_source(
+            "stress", stress, numpy_printer, "_stack(x, [{}])",
+            "Stress components xx, yy, xy (3, N) at the points x (2, N) or (3, N).",
+        ),
+        function_source(
+            "displacement_ufl", u, ufl_printer, "ufl.as_vector([{}])",
+            "Manufactured displacement of the spatial coordinate x = ufl.SpatialCoordinate(mesh).",
+        ),
+        function_source(
+            "body_force_ufl", f, ufl_printer, "ufl.as_vector([{}])",
+            "Body force -div(sigma) of the spatial coordinate x = ufl.SpatialCoordinate(mesh).",
+        ),
+    ]
+    kratos_strings = ", ".join(repr(kratos_printer.doprint(component)) for component in u)
+
+    header = [
+        f"# Generated by mms_codegen.py (generator version {GENERATOR_VERSION}), do not edit.",
+        f"# manufactured-displacement: {json.dumps(manufactured)}",
+        f"# young-modulus: {json.dumps(parameters['young-modulus'])}",
+        f"# poisson-ratio: {json.dumps(parameters['poisson-ratio'])}",
+        "import numpy as np",
+        "",
+        f'CACHE_KEY = "{cache_key(parameters)}"',
+        "",
+        "# Dirichlet data of the kratos input, function strings of X and Y",
+        f"DISPLACEMENT_KRATOS = ({kratos_strings})",
+        "",
+        "",
+        "def _stack(x, components):",
+        "    return np.stack([np.broadcast_to(c, np.shape(x[0])).astype(float) for c in components])",
+    ]
+    return "\n".join(header) + "\n\n\n" + "\n\n\n".join(functions) + "\n"
+
+
+def source_terms(parameters: dict, cache_dir: str | Path = DEFAULT_CACHE_DIR) -> tuple[Path, bool]:
+    """
+    Returns the path of the generated source term module of the parameters in `cache_dir`
+    and whether it was found in the cache. The module is only generated (and sympy only
+    imported) on a cache miss.
+    """
+    path = Path(cache_dir) / f"source_terms_{cache_key(parameters)}.py"
+    if path.exists():
+        return path, True
+    path.parent.mkdir(parents=True, exist_ok=True)
+    source = generate_source(parameters)
+    # written to a temporary file and renamed, such that concurrent jobs with the same key
+    # never import a partially written module
+    with tempfile.NamedTemporaryFile("w", dir=path.parent, suffix=".tmp", delete=False) as f:
+        f.write(source)
+    # the temporary file is only readable by its owner, the module gets the permissions of a
+    # new file (umask), such that a cache shared by several users can be read by all of them
+    umask = os.umask(0)
+    os.umask(umask)
+    os.chmod(f.name, 0o666 & ~umask)
+    os.replace(f.name, path)
+    return path, False
+
+
+def load_source_terms(path: str | Path) -> ModuleType:
+    """Imports a source term module written by `source_terms`."""
+    spec = importlib.util.spec_from_file_location(Path(path).stem, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        description="Generate (or look up in the cache) the source terms of the manufactured solution.\n"
+        "Inputs: --input_parameter_file\n"
+        "Outputs: --output_source_terms"
+    )
+    parser.add_argument(
+        "--input_parameter_file",
+        required=True,
+        help="JSON file containing simulation parameters (input)",
+    )
+    parser.add_argument(
+        "--cache_dir",
+        default=str(DEFAULT_CACHE_DIR),
+        help="Directory of the generated modules, shared by all runs",
+    )
+    parser.add_argument(
+        "--output_source_terms",
+        required=True,
+        help="Path to the generated python module (output)",
+    )
+    args, _ = parser.parse_known_args()
+    with open(args.input_parameter_file) as f:
+        parameters = json.load(f)
+    path, hit = source_terms(parameters, args.cache_dir)
+    print(f"source terms {path.name}: {'cache hit' if hit else 'generated'}")
+    shutil.copyfile(path, args.output_source_terms)
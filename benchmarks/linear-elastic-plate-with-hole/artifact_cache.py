@@ -0,0 +1,288 @@
+import ast
+import hashlib
+import json
+import os
+import shutil
+import stat
+import subprocess
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser
+
+# bump to invalidate all cache entries, e.g. if the layout of an entry changes
+CACHE_VERSION = "2"
+
+# environment variable that makes a step run (and its cache entry be replaced) instead of
+# being restored, e.g. for forced reruns (ARTIFACT_CACHE_REFRESH=1 snakemake --force ...)
+REFRESH_VARIABLE = "ARTIFACT_CACHE_REFRESH"
+
+
+def file_hash(file_path: str) -> str:
+    """sha256 of the file content."""
+    sha256 = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def _module_file(name: str, search_dirs: list[str]) -> list[str]:
+    """Files of the repo-local module or package `name`, empty for other (installed) modules."""
+    for directory in search_dirs:
+        if os.path.isfile(os.path.join(directory, f"{name}.py")):
+            return [os.path.join(directory, f"{name}.py")]
+        package_dir = os.path.join(directory, name)
+        if os.path.isfile(os.path.join(package_dir, "__init__.py")):
+            return sorted(
+                os.path.join(root, file)
+                for root, _, files in os.walk(package_dir)
+                for file in files
+                if file.endswith(".py")
+            )
+    return []
+
+
+def local_modules(script: str) -> list[str]:
+    """
+    The repo-local python files imported by `script`, directly or indirectly (also imports in
+    functions). Modules are looked up like the scripts import them: in the directory of the
+    importing file, its parent (the solver scripts add it to sys.path) and the src directories
+    above it (meshhelper).
+    """
+    found = []
+    # (Nextflow stages the scripts as symlinks into the work directory)
+    queue = [os.path.realpath(script)]
+    while queue:
+        file = queue.pop()
+        directory = os.path.dirname(file)
+        search_dirs = [directory, os.path.dirname(directory)]
+        ancestor = directory
+        while os.path.dirname(ancestor) != ancestor:
+            if os.path.isdir(os.path.join(ancestor, "src")):
+                search_dirs.append(os.path.join(ancestor, "src"))
+            ancestor = os.path.dirname(ancestor)
+        with open(file) as f:
+            tree = ast.parse(f.read(), filename=file)
+        names = set()
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names.update(alias.name.split(".")[0] for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+                names.add(node.module.split(".")[0])
+        for name in sorted(names):
+            for module_file in _module_file(name, search_dirs):
+                if module_file not in found and module_file != os.path.realpath(script):
+                    found.append(module_file)
+                    queue.append(module_file)
+    return found
+
+
+def _argument_entry(argument: str, outputs: list[str]) -> str:
+    """
+    An argument of the command as it enters the key: output and input paths by their file name
+    and content, such that the key does not depend on the directories of the workflow engine.
+    """
+    if argument in outputs:
+        return f"output:{os.path.basename(argument)}"
+    if os.path.isfile(argument):
+        return f"file:{file_hash(argument)}"
+    if os.path.isdir(argument):
+        return "directory"
+    return argument
+
+
+def cache_key(
+    keys: list[str],
+    env_files: list[str],
+    inputs: list[str],
+    outputs: list[str],
+    command: list[str] | None = None,
+) -> str:
+    """
+    Key of a step: hash of the extra keys (e.g. the rule name), the content of the environment
+    specs, of the inputs (the script is one of the inputs) and of the repo-local modules the
+    python inputs import (e.g. plateWithHoleSolution.py, meshhelper), the arguments of the
+    command and the file names of the outputs.
+    Only contents and file names enter the key, not the directories or the order of the inputs,
+    so the same step run by snakemake (snakemake_results/...) and Nextflow (work directory) has
+    the same key.
+    """
+    command = command or []
+    modules = {
+        module
+        for file in list(inputs) + command
+        if file.endswith(".py") and os.path.isfile(file)
+        for module in local_modules(file)
+    }
+    sha256 = hashlib.sha256()
+    entries = [("version", CACHE_VERSION)]
+    entries += sorted(("key", key) for key in keys)
+    entries += sorted(("env", file_hash(env_file)) for env_file in env_files)
+    entries += sorted(("input", file_hash(input_file)) for input_file in inputs)
+    entries += sorted(("module", file_hash(module)) for module in modules)
+    entries += [("argument", _argument_entry(argument, outputs)) for argument in command]
+    entries += sorted(("output", os.path.basename(output_file)) for output_file in outputs)
+    for entry in entries:
+        sha256.update(json.dumps(entry).encode())
+    return sha256.hexdigest()
+
+
+def _link_or_copy(source: str, destination: str, hardlink: bool = True) -> str:
+    """
+    Creates `destination` as hardlink of `source`. If that fails (e.g. different file systems)
+    or `hardlink` is False, a reflink (copy-on-write) is tried and finally a plain copy.
+    Returns the method used.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(destination)), exist_ok=True)
+    if os.path.lexists(destination):
+        os.remove(destination)
+    if hardlink:
+        try:
+            os.link(source, destination)
+            return "hardlink"
+        except OSError:
+            pass
+    try:
+        subprocess.run(
+            ["cp", "--reflink=always", source, destination],
+            check=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        return "reflink"
+    except (OSError, subprocess.CalledProcessError):
+        shutil.copy2(source, destination)
+        return "copy"
+
+
+def _entry_dir(cache_dir: str, key: str) -> str:
+    return os.path.join(cache_dir, key[:2], key)
+
+
+def lookup(cache_dir: str, key: str, outputs: list[str], inputs: list[str] | None = None) -> bool:
+    """
+    Materializes the outputs from the cache entry `key`, returns False if there is no entry.
+    The cached files share their inode with the cache entry and with the outputs of the engine
+    that stored them, their modification time is therefore never changed (snakemake would
+    consider the outputs of all later steps outdated). Only if a cached file is older than an
+    input of the step (the engines would consider the output outdated), it is restored as a
+    private reflink or copy with the current modification time.
+    """
+    entry_dir = _entry_dir(cache_dir, key)
+    # the manifest is written last, entries without manifest are incomplete
+    if not os.path.isfile(os.path.join(entry_dir, "manifest.json")):
+        return False
+    newest_input = max((os.stat(input_file).st_mtime for input_file in inputs or []), default=0.0)
+    for output_file in outputs:
+        cached_file = os.path.join(entry_dir, os.path.basename(output_file))
+        if os.stat(cached_file).st_mtime >= newest_input:
+            method = _link_or_copy(cached_file, output_file)
+        else:
+            method = _link_or_copy(cached_file, output_file, hardlink=False)
+            os.utime(output_file)
+    print(f"artifact cache: hit {key[:12]} ({method}), restored {', '.join(outputs)}")
+    return True
+
+
+def store(cache_dir: str, key: str, outputs: list[str], keys: list[str]) -> None:
+    """
+    Stores the outputs as cache entry `key`. The cached files are shared with the outputs
+    (hardlinks) and therefore made read-only, so that a modification of an output in place
+    fails instead of silently changing the cache.
+    """
+    entry_dir = _entry_dir(cache_dir, key)
+    os.makedirs(os.path.dirname(entry_dir), exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(dir=os.path.dirname(entry_dir), prefix=f".{key[:12]}_")
+    for output_file in outputs:
+        mode = os.stat(output_file).st_mode
+        os.chmod(output_file, mode & ~(stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH))
+        _link_or_copy(output_file, os.path.join(tmp_dir, os.path.basename(output_file)))
+    with open(os.path.join(tmp_dir, "manifest.json"), "w") as f:
+        json.dump(
+            {
+                "keys": keys,
+                "outputs": [os.path.basename(output_file) for output_file in outputs],
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            },
+            f,
+            indent=4,
+        )
+    try:
+        os.rename(tmp_dir, entry_dir)
+    except OSError:
+        # another run stored the same entry in the meantime
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def _mark_hit(hit_marker: str | None, key: str, hit: bool) -> None:
+    """
+    Writes the marker file of a cache hit (e.g. next to the snakemake benchmark file of the step),
+    such that the recorded runtime, which is the time of the lookup, is not used as runtime of the
+    step (see resource_usage.py). The marker of a previous hit is removed when the step runs.
+    """
+    if hit_marker is None:
+        return
+    if hit:
+        os.makedirs(os.path.dirname(os.path.abspath(hit_marker)), exist_ok=True)
+        with open(hit_marker, "w") as f:
+            json.dump({"key": key}, f)
+    elif os.path.isfile(hit_marker):
+        os.remove(hit_marker)
+
+
+def run_cached(
+    command: list[str],
+    cache_dir: str,
+    keys: list[str],
+    env_files: list[str],
+    inputs: list[str],
+    outputs: list[str],
+    hit_marker: str | None = None,
+    refresh: bool = False,
+) -> int:
+    """
+    Runs `command` unless its outputs are in the cache, stores the outputs after a successful run.
+    With `refresh`, the command is run in any case and its outputs replace the cache entry.
+    """
+    key = cache_key(keys, env_files, inputs, outputs, command)
+    if not refresh and lookup(cache_dir, key, outputs, inputs):
+        _mark_hit(hit_marker, key, True)
+        return 0
+    _mark_hit(hit_marker, key, False)
+    returncode = subprocess.run(command).returncode
+    if returncode == 0:
+        if refresh:
+            shutil.rmtree(_entry_dir(cache_dir, key), ignore_errors=True)
+        store(cache_dir, key, outputs, keys)
+        print(f"artifact cache: stored {key[:12]}")
+    return returncode
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        description="Run a workflow step with a content-addressed artifact cache shared by the snakemake\n"
+        "and Nextflow workflows. The key is the hash of the extra keys, the environment specs, the\n"
+        "input files, the repo-local modules they import, the command and the output file names.\n"
+        "On a hit, the outputs are restored by hardlink (or reflink/copy) instead of running the\n"
+        "command. With ARTIFACT_CACHE_REFRESH set, the command runs and replaces the entry.\n"
+        "Usage: artifact_cache.py [options] -- command ..."
+    )
+    parser.add_argument("--cache_dir", default=".artifact_cache", help="Directory of the cache")
+    parser.add_argument("--key", nargs="*", default=[], help="Extra keys, e.g. the name of the rule")
+    parser.add_argument("--env", nargs="*", default=[], help="Environment spec files of the step")
+    parser.add_argument("--inputs", nargs="+", required=True, help="Input files of the step, including the scripts")
+    parser.add_argument("--outputs", nargs="+", required=True, help="Output files of the step (with unique file names)")
+    parser.add_argument("--hit_marker", default=None, help="File written on a cache hit and removed otherwise (output)")
+    parser.add_argument("command", nargs="+", help="Command of the step (after --)")
+    args = parser.parse_args()
+
+    if os.environ.get("ARTIFACT_CACHE_DISABLE"):
+        _mark_hit(args.hit_marker, "", False)
+        sys.exit(subprocess.run(args.command).returncode)
+    refresh = os.environ.get(REFRESH_VARIABLE, "").lower() not in ("", "0", "false")
+    sys.exit(
+        run_cached(
+            args.command, args.cache_dir, args.key, args.env, args.inputs, args.outputs, args.hit_marker, refresh
+        )
+    )
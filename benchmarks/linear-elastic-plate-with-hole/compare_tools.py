@@ -0,0 +1,70 @@
+import json
+from argparse import ArgumentParser
+
+import numpy as np
+from meshhelper.probe import Probe, read_result
+from meshhelper.transfer import Transfer, difference_norms
+
+# compared quantities: name of the field in the FEniCS and in the Kratos result, number of
+# components (VTK pads 2D vectors to 3 components)
+COMPARED_FIELDS = {
+    "displacement": ("u", "DISPLACEMENT", 2),
+    "von_mises_stress": ("von_mises_stress", "VON_MISES_STRESS", 1),
+}
+
+
+def compare_tools(
+    parameter_file: str,
+    fenics_solution_field_data: str,
+    kratos_solution_field_data: str,
+    comparison_file: str,
+    cache_dir: str | None = None,
+) -> None:
+    """
+    Transfers the FEniCS fields of a configuration to the nodes of the Kratos mesh and writes
+    the norms of the pointwise differences. The interpolation matrices are cached in
+    `cache_dir` (keyed by the hashes of both meshes), so repeated comparisons of the same
+    meshes only cost one sparse matrix-vector product per field.
+    """
+    with open(parameter_file) as f:
+        configuration = json.load(f)["configuration"]
+
+    fenics = Probe.from_file(fenics_solution_field_data)
+    (kratos_grid,) = read_result(kratos_solution_field_data)
+    transfer = Transfer(fenics, kratos_grid, cache_dir)
+    mapped = transfer.map([fenics_name for fenics_name, _, _ in COMPARED_FIELDS.values()])
+
+    differences = {}
+    for name, (fenics_name, kratos_name, components) in COMPARED_FIELDS.items():
+        fenics_values = mapped[fenics_name].reshape(kratos_grid.n_points, -1)[:, :components]
+        kratos_values = np.asarray(kratos_grid.point_data[kratos_name]).reshape(kratos_grid.n_points, -1)[:, :components]
+        differences[name] = difference_norms(fenics_values, kratos_values)
+        print(f"{name}: relative rms difference {differences[name]['relative_rms_difference']:.3e}")
+
+    with open(comparison_file, "w") as f:
+        json.dump(
+            {"configuration": configuration, "reference": "kratos", "differences": differences},
+            f,
+            indent=4,
+        )
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        description="Compare the FEniCS and Kratos results of a configuration on the nodes of the\n"
+        "Kratos mesh (norms of the pointwise differences)."
+    )
+    parser.add_argument("--input_parameter_file", required=True, help="JSON file containing simulation parameters (input)")
+    parser.add_argument("--input_solution_field_data_fenics", required=True, help="Path to the FEniCS field store (.h5) or zipped solution files (input)")
+    parser.add_argument("--input_solution_field_data_kratos", required=True, help="Path to the Kratos field store (.h5) or zipped solution files (input)")
+    parser.add_argument("--input_cache_dir", default=None, help="Directory of the cached interpolation matrices")
+    parser.add_argument("--output_comparison_file", required=True, help="Path to the comparison JSON file (output)")
+    args, _ = parser.parse_known_args()
+
+    compare_tools(
+        args.input_parameter_file,
+        args.input_solution_field_data_fenics,
+        args.input_solution_field_data_kratos,
+        args.output_comparison_file,
+        args.input_cache_dir,
+    )
@@ -0,0 +1,138 @@
+import json
+import math
+from argparse import ArgumentParser
+
+
+def observed_order(element_sizes: list[float], values: list[float], max_order: float = 50.0) -> float | None:
+    """
+    Observed order of convergence p from the last three levels (coarse to fine) with element
+    sizes h0 > h1 > h2 and values f0, f1, f2, assuming f(h) = f_exact + C h^p.
+    With the refinement ratios r_c = h0 / h1 and r_f = h1 / h2, p solves
+
+        (f1 - f0) / (f2 - f1) = r_f^p (r_c^p - 1) / (r_f^p - 1)
+
+    (for a constant ratio r this is p = ln((f1 - f0) / (f2 - f1)) / ln(r)). The right hand side
+    is increasing in p, so p is found by bisection. None is returned if the values do not
+    converge monotonically (the levels are not in the asymptotic range).
+    """
+    h0, h1, h2 = element_sizes[-3:]
+    f0, f1, f2 = values[-3:]
+    if f2 == f1:
+        # the finest levels agree, the solution does not change anymore
+        return math.inf if f1 != f0 else None
+    ratio = (f1 - f0) / (f2 - f1)
+    r_c, r_f = h0 / h1, h1 / h2
+
+    def g(p):
+        return r_f**p * (r_c**p - 1.0) / (r_f**p - 1.0)
+
+    lower, upper = 1e-6, max_order
+    if not g(lower) < ratio < g(upper):
+        return None
+    for _ in range(200):
+        p = 0.5 * (lower + upper)
+        if g(p) < ratio:
+            lower = p
+        else:
+            upper = p
+    return 0.5 * (lower + upper)
+
+
+def richardson_extrapolation(element_sizes: list[float], values: list[float], order: float) -> float:
+    """Richardson-extrapolated value f2 + (f2 - f1) / (r^p - 1) from the two finest levels."""
+    h1, h2 = element_sizes[-2:]
+    f1, f2 = values[-2:]
+    if math.isinf(order):
+        return f2
+    return f2 + (f2 - f1) / ((h1 / h2) ** order - 1.0)
+
+
+def analyse_convergence(
+    configurations: list[str],
+    element_sizes: list[float],
+    values: list[float],
+    tolerance: float,
+) -> dict:
+    """
+    Computes the observed order, the extrapolated value and the estimated relative error
+    |f_extrapolated - f| / |f_extrapolated| of the finest level after each level (coarse to fine).
+    At least three levels are needed for an estimate. The study is converged once the estimated
+    error of the finest level is below `tolerance`.
+    """
+    levels = []
+    for idx, configuration in enumerate(configurations):
+        level = {
+            "configuration": configuration,
+            "element-size": element_sizes[idx],
+            "value": values[idx],
+            "observed_order": None,
+            "extrapolated_value": None,
+            "estimated_error": None,
+        }
+        if idx >= 2:
+            order = observed_order(element_sizes[: idx + 1], values[: idx + 1])
+            if order is not None:
+                extrapolated = richardson_extrapolation(element_sizes[: idx + 1], values[: idx + 1], order)
+                level["observed_order"] = order if not math.isinf(order) else None
+                level["extrapolated_value"] = extrapolated
+                if extrapolated != 0.0:
+                    level["estimated_error"] = abs(extrapolated - values[idx]) / abs(extrapolated)
+        levels.append(level)
+
+    estimated_error = levels[-1]["estimated_error"]
+    return {
+        "tolerance": tolerance,
+        "converged": estimated_error is not None and estimated_error < tolerance,
+        "configuration": levels[-1]["configuration"],
+        "extrapolated_value": levels[-1]["extrapolated_value"],
+        "estimated_error": estimated_error,
+        "levels": levels,
+    }
+
+
+def create_convergence_study(
+    parameter_files: list[str],
+    metrics_files: list[str],
+    metric: str,
+    tolerance: float,
+    convergence_json: str,
+) -> dict:
+    """
+    Evaluates the convergence of `metric` over the refinement levels computed so far.
+    The parameter and metrics files are aligned and ordered from coarse to fine.
+    """
+    configurations, element_sizes, values = [], [], []
+    for parameter_file, metrics_file in zip(parameter_files, metrics_files):
+        with open(parameter_file) as f:
+            parameters = json.load(f)
+        with open(metrics_file) as f:
+            metrics = json.load(f)
+        configurations.append(parameters["configuration"])
+        element_sizes.append(parameters["element-size"]["value"])
+        values.append(metrics[metric])
+
+    study = {"metric": metric}
+    study.update(analyse_convergence(configurations, element_sizes, values, tolerance))
+    with open(convergence_json, "w") as f:
+        json.dump(study, f, indent=4)
+    return study
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        description="Evaluate the mesh convergence of a metric over refinement levels (coarse to fine)\n"
+        "with the observed order of convergence and Richardson extrapolation."
+    )
+    parser.add_argument("--input_parameter_file", nargs="+", required=True, help="Parameter files of the levels, coarse to fine (input)")
+    parser.add_argument("--input_solution_metrics", nargs="+", required=True, help="Metrics JSON files of the levels, coarse to fine (input)")
+    parser.add_argument("--input_metric", required=True, help="Name of the metric in the metrics files, e.g. max_von_mises_stress_nodes (input)")
+    parser.add_argument("--input_tolerance", required=True, type=float, help="Tolerance for the estimated relative error (input)")
+    parser.add_argument("--output_convergence_json", required=True, help="Path to the convergence JSON file (output)")
+    args = parser.parse_args()
+    create_convergence_study(
+        args.input_parameter_file,
+        args.input_solution_metrics,
+        args.input_metric,
+        args.input_tolerance,
+        args.output_convergence_json,
+    )
@@ -0,0 +1,172 @@
+import glob
+import json
+import math
+import os
+from argparse import ArgumentParser
+
+from resource_usage import read_snakemake_benchmark
+
+# conversion of the length units used in the parameter files to m
+# (the cost model is evaluated when the workflow is set up, without pint)
+LENGTH_UNITS = {"m": 1.0, "dm": 1e-1, "cm": 1e-2, "mm": 1e-3}
+
+# Cost of the steps of a configuration as a linear function of the number of DOFs,
+# runtime [s] = runtime[0] + runtime[1] * dofs and memory [MB] = memory[0] + memory[1] * dofs.
+# The defaults are rough estimates, they are replaced by the calibration from recorded timings.
+DEFAULT_COST_MODEL = {
+    "create_mesh": {"runtime": [2.0, 2e-5], "memory": [150.0, 1e-3]},
+    "run_fenics_simulation": {"runtime": [10.0, 1e-4], "memory": [400.0, 5e-3]},
+    "mesh_to_mdpa": {"runtime": [2.0, 2e-5], "memory": [150.0, 1e-3]},
+    "create_kratos_input": {"runtime": [2.0, 0.0], "memory": [150.0, 0.0]},
+    "run_kratos_simulation": {"runtime": [5.0, 5e-5], "memory": [300.0, 3e-3]},
+    "run_kratos_pipeline": {"runtime": [10.0, 1e-4], "memory": [400.0, 4e-3]},
+    "postprocess_kratos_results": {"runtime": [2.0, 1e-5], "memory": [200.0, 1e-3]},
+}
+
+# the estimated memory is increased by this factor, such that jobs are not killed for a slight underestimation
+MEMORY_SAFETY_FACTOR = 1.5
+
+# number of cores of a step, all steps run in serial (a step with a parallel solver sets "cpus" in the cost model)
+DEFAULT_CPUS = 1
+
+# steps that depend on the outputs of a step of the same configuration
+STEP_SUCCESSORS = {
+    "create_mesh": ["run_fenics_simulation", "mesh_to_mdpa", "run_kratos_pipeline"],
+    "mesh_to_mdpa": ["create_kratos_input"],
+    "create_kratos_input": ["run_kratos_simulation"],
+    "run_kratos_simulation": ["postprocess_kratos_results"],
+}
+
+
+def _length(quantity: dict) -> float:
+    return quantity["value"] * LENGTH_UNITS[quantity.get("unit") or "m"]
+
+
+def estimate_size(parameters: dict) -> dict:
+    """
+    Estimates the number of cells, nodes and DOFs of a configuration from the geometry (plate
+    of length L with a quarter hole of radius r), the element-size h, element-order and
+    element-degree. The mesh consists of triangles of area sqrt(3)/4 h^2, a mesh of N triangles
+    has about N/2 vertices and a Lagrange space of degree k about k^2 N/2 nodes (2 DOFs each).
+    """
+    length = _length(parameters["length"])
+    radius = _length(parameters["radius"])
+    element_size = _length(parameters["element-size"])
+    degree = max(parameters.get("element-degree", 1), parameters.get("element-order", 1))
+
+    area = length**2 - math.pi * radius**2 / 4.0
+    cells = area / (math.sqrt(3.0) / 4.0 * element_size**2)
+    nodes = degree**2 * cells / 2.0
+    return {"cells": int(cells), "nodes": int(nodes), "dofs": int(2 * nodes)}
+
+
+def estimate(parameters: dict, cost_model: dict | None = None) -> dict:
+    """
+    Estimates the size and the runtime [s], memory [MB] and number of cores of each step of a
+    configuration.
+    """
+    cost_model = cost_model or DEFAULT_COST_MODEL
+    size = estimate_size(parameters)
+    steps = {}
+    for step, coefficients in cost_model.items():
+        runtime = coefficients["runtime"][0] + coefficients["runtime"][1] * size["dofs"]
+        memory = coefficients["memory"][0] + coefficients["memory"][1] * size["dofs"]
+        steps[step] = {
+            "runtime_s": round(runtime, 1),
+            "memory_mb": int(math.ceil(MEMORY_SAFETY_FACTOR * memory)),
+            "cpus": coefficients.get("cpus", DEFAULT_CPUS),
+        }
+    return {**size, "steps": steps}
+
+
+def step_priorities(cost_estimates: dict) -> dict[str, int]:
+    """
+    Scheduling priority of each step (0 is the lowest): the steps are ranked by their estimated
+    runtime summed over all configurations plus the runtime of the longest chain of steps that
+    depend on them, i.e. the steps on the critical path of the workflow run first.
+    """
+    runtimes = {}
+    for configuration_estimate in cost_estimates.values():
+        for step, step_estimate in configuration_estimate["steps"].items():
+            runtimes[step] = runtimes.get(step, 0.0) + step_estimate["runtime_s"]
+
+    def remaining(step):
+        return runtimes.get(step, 0.0) + max((remaining(successor) for successor in STEP_SUCCESSORS.get(step, [])), default=0.0)
+
+    return {step: rank for rank, step in enumerate(sorted(runtimes, key=remaining))}
+
+
+def _fit_linear(x_values: list[float], y_values: list[float]) -> list[float] | None:
+    """Least squares fit y = a + b x with a, b >= 0, None if there are not enough points."""
+    if len(x_values) < 2 or len(set(x_values)) < 2:
+        return None
+    n = len(x_values)
+    x_mean = sum(x_values) / n
+    y_mean = sum(y_values) / n
+    slope = sum((x - x_mean) * (y - y_mean) for x, y in zip(x_values, y_values)) / sum(
+        (x - x_mean) ** 2 for x in x_values
+    )
+    slope = max(slope, 0.0)
+    return [max(y_mean - slope * x_mean, 0.0), slope]
+
+
+def calibrate(benchmark_dir: str, configuration_to_parameter_file: dict) -> dict:
+    """
+    Calibrates the cost model from the snakemake benchmark files
+    (`{benchmark_dir}/{step}_{configuration}.tsv`): for each step, runtime (wall time) and
+    memory (max RSS) are fitted as linear functions of the estimated number of DOFs.
+    Steps without enough recorded configurations keep their default coefficients. Steps restored
+    from the artifact cache are skipped, their benchmark files record the time of the lookup.
+    """
+    dofs = {}
+    for configuration, parameter_file in configuration_to_parameter_file.items():
+        with open(parameter_file) as f:
+            dofs[configuration] = estimate_size(json.load(f))["dofs"]
+
+    records = {}
+    for benchmark_file in glob.glob(os.path.join(benchmark_dir, "*.tsv")):
+        name = os.path.basename(benchmark_file)[: -len(".tsv")]
+        configuration = next((c for c in dofs if name.endswith(f"_{c}")), None)
+        if configuration is None:
+            continue
+        step = name[: -len(configuration) - 1]
+        usage = read_snakemake_benchmark(benchmark_file)
+        if usage["cache_hit"]:
+            continue
+        records.setdefault(step, []).append((dofs[configuration], usage))
+
+    cost_model = json.loads(json.dumps(DEFAULT_COST_MODEL))
+    for step, step_records in records.items():
+        coefficients = cost_model.setdefault(step, {"runtime": [0.0, 0.0], "memory": [0.0, 0.0]})
+        for resource, key in (("runtime", "wall_time"), ("memory", "max_rss")):
+            points = [(x, usage[key]) for x, usage in step_records if usage[key] is not None]
+            fit = _fit_linear([x for x, _ in points], [y for _, y in points])
+            if fit is not None:
+                coefficients[resource] = fit
+    return cost_model
+
+
+def load_cost_model(cost_model_file: str) -> dict:
+    """The calibrated cost model if the file exists, otherwise the default model."""
+    if os.path.isfile(cost_model_file):
+        with open(cost_model_file) as f:
+            return json.load(f)
+    return DEFAULT_COST_MODEL
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        description="Calibrate the cost model (runtime and memory of the steps as function of the\n"
+        "number of DOFs) from the benchmark files of a previous snakemake run."
+    )
+    parser.add_argument("--input_benchmark_dir", required=True, help="Directory with the snakemake benchmark files (input)")
+    parser.add_argument("--input_workflow_config", default="workflow_config.json", help="Workflow config with the parameter files of the configurations (input)")
+    parser.add_argument("--output_cost_model", default="cost_model.json", help="Path to the calibrated cost model (output)")
+    args = parser.parse_args()
+
+    with open(args.input_workflow_config) as f:
+        workflow_config = json.load(f)
+    cost_model = calibrate(args.input_benchmark_dir, workflow_config["configuration_to_parameter_file"])
+    with open(args.output_cost_model, "w") as f:
+        json.dump(cost_model, f, indent=4)
+    print(f"Cost model saved as {args.output_cost_model}")
@@ -0,0 +1,28 @@
+import json
+from argparse import ArgumentParser
+
+from meshhelper.field_store import convert_result
+
+
+def create_field_store(parameter_file: str, solution_field_data: str, field_store: str) -> None:
+    """
+    Converts the zipped VTK files of a configuration into a field store (HDF5): one chunked,
+    compressed dataset per field, each mesh stored once and the parameters as metadata.
+    Probes, comparisons and plots then read only the fields (and rows) they need.
+    """
+    with open(parameter_file) as f:
+        parameters = json.load(f)
+    convert_result(solution_field_data, field_store, parameters)
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        description="Convert the zipped solution files of a configuration into a chunked, compressed\n"
+        "HDF5 field store."
+    )
+    parser.add_argument("--input_parameter_file", required=True, help="JSON file containing simulation parameters (input)")
+    parser.add_argument("--input_solution_field_data", required=True, help="Path to the zipped solution files (input)")
+    parser.add_argument("--output_field_store", required=True, help="Path to the HDF5 field store (output)")
+    args, _ = parser.parse_known_args()
+
+    create_field_store(args.input_parameter_file, args.input_solution_field_data, args.output_field_store)
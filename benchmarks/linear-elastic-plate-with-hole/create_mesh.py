@@ -1,14 +1,12 @@
 import json
 from argparse import ArgumentParser
-import os
 
 import gmsh
 from pint import UnitRegistry
 
-ureg = UnitRegistry()
-
 
 def create_mesh(parameter_file, mesh_file):
+    ureg = UnitRegistry()
     # Load parameters
     with open(parameter_file) as f:
         parameters = json.load(f)
@@ -0,0 +1,73 @@
+import json
+import math
+from argparse import ArgumentParser
+
+
+def scaling_configuration(configuration: str, mode: str, processes: int) -> str:
+    """
+    Name of the configuration derived from `configuration` for one point of a scaling study.
+    The simulation scripts use this name for their output files, so it has to be unique per
+    (configuration, mode, processes).
+    """
+    return f"{configuration}_{mode}_np{processes}"
+
+
+def create_scaling_parameters(
+    parameter_file: str, mode: str, processes: int, scaling_parameter_file: str
+) -> None:
+    """
+    Derives the parameter file for one point of a scaling study from a benchmark parameter file.
+
+    - strong scaling: the mesh is kept fixed, only the configuration name changes.
+    - weak scaling: the element-size is reduced by sqrt(processes) such that the number of
+      cells (2D) grows proportional to the number of processes and the work per process stays
+      constant. The parameter file is then interpreted as the problem size for one process.
+    """
+    with open(parameter_file) as f:
+        parameters = json.load(f)
+
+    if mode == "weak":
+        parameters["element-size"]["value"] = parameters["element-size"]["value"] / math.sqrt(
+            processes
+        )
+    elif mode != "strong":
+        raise ValueError(f"Unknown scaling mode {mode}, expected 'strong' or 'weak'")
+
+    parameters["configuration"] = scaling_configuration(
+        parameters["configuration"], mode, processes
+    )
+
+    with open(scaling_parameter_file, "w") as f:
+        json.dump(parameters, f, indent=4)
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        description="Create the parameter file for one point of a strong or weak scaling study."
+    )
+    parser.add_argument(
+        "--input_parameter_file",
+        required=True,
+        help="JSON file containing the simulation parameters of the base configuration (input)",
+    )
+    parser.add_argument(
+        "--input_mode", required=True, choices=["strong", "weak"], help="Scaling mode (input)"
+    )
+    parser.add_argument(
+        "--input_processes",
+        required=True,
+        type=int,
+        help="Number of MPI processes or threads (input)",
+    )
+    parser.add_argument(
+        "--output_parameter_file",
+        required=True,
+        help="JSON file containing the derived simulation parameters (output)",
+    )
+    args, _ = parser.parse_known_args()
+    create_scaling_parameters(
+        args.input_parameter_file,
+        args.input_mode,
+        args.input_processes,
+        args.output_parameter_file,
+    )
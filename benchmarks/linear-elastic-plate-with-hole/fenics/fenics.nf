@@ -1,8 +1,11 @@
 params.tool = "fenics"
 
 process run_simulation {
+    tag "${configuration}"
     publishDir "${params.result_dir}/${params.tool}/"
     conda './fenics/environment_simulation.yml' 
+    memory { "${params.cost_estimates[configuration]?.steps?.run_fenics_simulation?.memory_mb ?: 1000} MB" }
+    cpus { params.cost_estimates[configuration]?.steps?.run_fenics_simulation?.cpus ?: 1 }
 
     input:
     path python_script
@@ -14,6 +17,8 @@ process run_simulation {
 
     script:
     """
+    python3 ${projectDir}/artifact_cache.py --cache_dir ${params.artifact_cache} --key run_fenics_simulation --hit_marker .artifact_cache_hit --env ${projectDir}/fenics/environment_simulation.yml \
+        --inputs $python_script $parameter_file $mesh_file --outputs "solution_field_data_${configuration}.zip" "solution_metrics_${configuration}.json" -- \
     python3 $python_script --input_parameter_file $parameter_file --input_mesh_file $mesh_file --output_solution_file_zip "solution_field_data_${configuration}.zip" --output_metrics_file "solution_metrics_${configuration}.json"
     """
 }
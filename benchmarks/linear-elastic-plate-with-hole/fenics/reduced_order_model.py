@@ -0,0 +1,456 @@
+import json
+import sys
+import time
+from argparse import ArgumentParser
+from pathlib import Path
+
+import numpy as np
+
+# Only the offline stage needs dolfinx, scipy, sympy and pint (imported in
+# build_reduced_order_model), the online stage runs with numpy alone.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+PARAMETERS = ("radius", "young-modulus", "poisson-ratio", "load")
+
+
+def map_coordinates(x: np.ndarray, reference_radius: float, radius: float, L: float) -> np.ndarray:
+    """
+    Geometric mapping of the reference plate (hole of `reference_radius`) to the plate with a
+    hole of `radius`: points are moved radially, by the full change of the radius on the
+    hole boundary and linearly decaying to zero at the distance L from the origin. The
+    symmetry lines stay straight and the outer edges (x = L, y = L) do not move.
+    """
+    distance = np.linalg.norm(x, axis=1)
+    weight = np.clip((L - distance) / (L - reference_radius), 0.0, 1.0)
+    return x * (1.0 + (radius - reference_radius) * weight / distance)[:, None]
+
+
+def material_coefficients(E: float, nu: float) -> tuple[float, float]:
+    """
+    Coefficients of the plane stress stiffness A = theta_1 A_1 + theta_2 A_2 with the
+    matrices A_1 of eps(u):eps(v) and A_2 of tr(eps(u)) tr(eps(v)).
+    """
+    return E / (1.0 + nu), E * nu / (1.0 - nu**2)
+
+
+def boundary_coefficients(E: float, nu: float, load: float) -> tuple[float, float]:
+    """
+    The analytical displacement prescribed on the outer edges is
+    load / E * g_1(radius) + load * nu / E * g_2(radius).
+    """
+    return load / E, load * nu / E
+
+
+def von_mises_stress(strain: np.ndarray, E: float, nu: float) -> np.ndarray:
+    """Plane stress von Mises stress (as in run_fenics_simulation.py) of strains (n, 3) (xx, yy, xy)."""
+    factor = E / (1.0 - nu**2)
+    stress_xx = factor * (strain[:, 0] + nu * strain[:, 1])
+    stress_yy = factor * (strain[:, 1] + nu * strain[:, 0])
+    stress_xy = E / (1.0 + nu) * strain[:, 2]
+    p = (stress_xx + stress_yy) / 3.0
+    return np.sqrt(1.5 * ((stress_xx - p) ** 2 + (stress_yy - p) ** 2 + 2.0 * stress_xy**2 + p**2))
+
+
+def latin_hypercube(parameter_ranges: dict, samples: int, rng: np.random.Generator) -> np.ndarray:
+    """Latin hypercube samples (samples, 4) of the parameters in the order of PARAMETERS."""
+    columns = []
+    for name in PARAMETERS:
+        lower, upper = parameter_ranges[name]
+        stratified = (rng.permutation(samples) + rng.random(samples)) / samples
+        columns.append(lower + (upper - lower) * stratified)
+    return np.column_stack(columns)
+
+
+class ReducedOrderModel:
+    """
+    Galerkin reduced-order model of the plate with a hole for the parameters radius, Young's
+    modulus, Poisson ratio and load. The displacement is
+
+        u = load / E * g_1(radius) + load * nu / E * g_2(radius) + V c,
+
+    with the (interpolated) analytical displacement g_1, g_2 on the outer edges and the POD
+    basis V of the remaining part. Young's modulus, Poisson ratio and load enter affinely, the
+    dependence on the radius (geometric mapping of the reference mesh) is interpolated from
+    the projected operators at a grid of radii. The columns of all stored arrays belong to
+    the vectors W = [g_1, g_2, V]:
+    - operators (radii, 2, m, m): W^T A_q W,
+    - residual_gram (radii, 2m, 2m): Gram matrix of [A_1 W, A_2 W] restricted to the free dofs,
+      giving the norm of the residual of the full system without assembling it,
+    - strains[output] (radii, points, 3, m): strains (xx, yy, xy) of W at the Gauss points or
+      at the nodes of the projected stress.
+    An online evaluation only solves a linear system of the size of the basis.
+    """
+
+    def __init__(
+        self,
+        radii: np.ndarray,
+        operators: np.ndarray,
+        residual_gram: np.ndarray,
+        strains: dict[str, np.ndarray],
+        basis: np.ndarray,
+        boundary_data: np.ndarray,
+        singular_values: np.ndarray,
+        parameter_ranges: dict,
+    ):
+        self.radii = radii
+        self.operators = operators
+        self.residual_gram = residual_gram
+        self.strains = strains
+        self.basis = basis
+        self.boundary_data = boundary_data
+        self.singular_values = singular_values
+        self.parameter_ranges = parameter_ranges
+
+    @property
+    def basis_size(self) -> int:
+        return self.basis.shape[1]
+
+    def save(self, file: str) -> None:
+        np.savez(
+            file,
+            radii=self.radii,
+            operators=self.operators,
+            residual_gram=self.residual_gram,
+            basis=self.basis,
+            boundary_data=self.boundary_data,
+            singular_values=self.singular_values,
+            parameter_ranges=json.dumps(self.parameter_ranges),
+            **{f"strains_{name}": values for name, values in self.strains.items()},
+        )
+
+    @classmethod
+    def load(cls, file: str) -> "ReducedOrderModel":
+        with np.load(file) as data:
+            return cls(
+                data["radii"],
+                data["operators"],
+                data["residual_gram"],
+                {key[len("strains_"):]: data[key] for key in data.files if key.startswith("strains_")},
+                data["basis"],
+                data["boundary_data"],
+                data["singular_values"],
+                json.loads(str(data["parameter_ranges"])),
+            )
+
+    def _weights(self, radius: float) -> tuple[np.ndarray, np.ndarray]:
+        """Indices and weights of the (at most cubic) Lagrange interpolation in the radius."""
+        if not self.radii[0] - 1e-12 <= radius <= self.radii[-1] + 1e-12:
+            raise ValueError(
+                f"radius {radius} is outside of the range [{self.radii[0]}, {self.radii[-1]}] of the model"
+            )
+        order = min(4, len(self.radii))
+        start = np.clip(np.searchsorted(self.radii, radius) - order // 2, 0, len(self.radii) - order)
+        indices = np.arange(start, start + order)
+        nodes = self.radii[indices]
+        differences = nodes[:, None] - nodes[None, :]
+        np.fill_diagonal(differences, 1.0)
+        factors = (radius - nodes)[None, :] / differences
+        np.fill_diagonal(factors, 1.0)
+        return indices, factors.prod(axis=1)
+
+    def _interpolate(self, values: np.ndarray, radius: float) -> np.ndarray:
+        """Values (radii, ...) interpolated at the radius."""
+        indices, weights = self._weights(radius)
+        return (weights @ values[indices].reshape(len(indices), -1)).reshape(values.shape[1:])
+
+    def coefficients(self, radius: float, E: float, nu: float, load: float) -> tuple[np.ndarray, float]:
+        """
+        Solves the reduced system and returns the coefficients of [g_1, g_2, V] and the error
+        indicator |A u - b| / |b| (norm of the residual of the full system over the norm of
+        its right hand side, i.e. of the lifting of the prescribed displacements).
+        """
+        theta = material_coefficients(E, nu)
+        operators = self._interpolate(self.operators, radius)
+        matrix = theta[0] * operators[0] + theta[1] * operators[1]
+        z = np.empty(matrix.shape[0])
+        z[:2] = boundary_coefficients(E, nu, load)
+        z[2:] = np.linalg.solve(matrix[2:, 2:], -matrix[2:, :2] @ z[:2])
+
+        gram = self._interpolate(self.residual_gram, radius)
+        lifting = np.concatenate([z[:2], np.zeros(len(z) - 2)])
+        residual = np.concatenate([theta[0] * z, theta[1] * z])
+        rhs = np.concatenate([theta[0] * lifting, theta[1] * lifting])
+        indicator = np.sqrt(max(residual @ gram @ residual, 0.0) / (rhs @ gram @ rhs))
+        return z, float(indicator)
+
+    def displacement(self, radius: float, z: np.ndarray) -> np.ndarray:
+        """Dof vector of the displacement on the (mapped) reference mesh."""
+        return self._interpolate(self.boundary_data, radius).T @ z[:2] + self.basis @ z[2:]
+
+    def evaluate(self, radius: float, E: float, nu: float, load: float) -> dict:
+        """Maximum von Mises stress at the Gauss points and the nodes and the error indicator."""
+        z, indicator = self.coefficients(radius, E, nu, load)
+        indices, weights = self._weights(radius)
+        result = {}
+        for output, strains in self.strains.items():
+            strain = sum(weight * (strains[index] @ z) for index, weight in zip(indices, weights))
+            result[f"max_von_mises_stress_{output}"] = float(np.max(von_mises_stress(strain, E, nu)))
+        result["error_indicator"] = indicator
+        return result
+
+
+def build_reduced_order_model(parameter_file: str, mesh_file: str, rom_config_file: str, validation_file: str) -> ReducedOrderModel:
+    """
+    Offline stage: solves the full problem for Latin hypercube samples of the parameter ranges
+    of `rom_config_file` on the reference mesh (mapped to the radius of each sample),
+    compresses the snapshots by POD and projects the operators at a grid of radii. The model
+    is then compared with full solves for held-out samples, the errors, error indicators and
+    online times are written to `validation_file`. Runs in serial.
+    """
+    import basix.ufl
+    import dolfinx as df
+    import scipy.linalg
+    import scipy.sparse.linalg
+    import ufl
+    from mpi4py import MPI
+    from pint import UnitRegistry
+
+    from performance_monitor import PerformanceMonitor
+    from plateWithHoleSolution import PlateWithHoleSolution
+
+    monitor = PerformanceMonitor()
+    ureg = UnitRegistry()
+    with open(parameter_file) as f:
+        parameters = json.load(f)
+    with open(rom_config_file) as f:
+        rom_config = json.load(f)
+
+    def magnitude(value, unit):
+        return ureg.Quantity(value, unit).to_base_units().magnitude
+
+    reference_radius = magnitude(parameters["radius"]["value"], parameters["radius"]["unit"])
+    L = magnitude(parameters["length"]["value"], parameters["length"]["unit"])
+    parameter_ranges = {
+        name: [
+            magnitude(rom_config["parameter_ranges"][name][bound], rom_config["parameter_ranges"][name]["unit"])
+            for bound in ("min", "max")
+        ]
+        for name in PARAMETERS
+    }
+
+    with monitor.phase("setup"):
+        mesh, _, facet_tags = df.io.gmshio.read_from_msh(mesh_file, comm=MPI.COMM_SELF, gdim=2)
+        V = df.fem.functionspace(mesh, ("CG", parameters["element-degree"], (2,)))
+        reference_coordinates = mesh.geometry.x[:, :2].copy()
+
+        bc_left = df.fem.dirichletbc(0.0, df.fem.locate_dofs_topological(V.sub(0), 1, facet_tags.find(1)), V.sub(0))
+        bc_bottom = df.fem.dirichletbc(0.0, df.fem.locate_dofs_topological(V.sub(1), 1, facet_tags.find(2)), V.sub(1))
+        g = df.fem.Function(V)
+        bc_right = df.fem.dirichletbc(g, df.fem.locate_dofs_topological(V, 1, facet_tags.find(3)))
+        bc_top = df.fem.dirichletbc(g, df.fem.locate_dofs_topological(V, 1, facet_tags.find(4)))
+
+        def constrained(bcs):
+            x = np.full(len(g.x.array), np.nan)
+            for bc in bcs:
+                bc.set(x)
+            return ~np.isnan(x)
+
+        outer = constrained([bc_right, bc_top])
+        free = ~constrained([bc_left, bc_bottom, bc_right, bc_top])
+
+        dx = ufl.Measure(
+            "dx",
+            domain=mesh,
+            metadata={
+                "quadrature_degree": parameters["quadrature-degree"],
+                "quadrature_scheme": parameters["quadrature-rule"],
+            },
+        )
+
+        def eps(v):
+            return ufl.sym(ufl.grad(v))
+
+        u_, v_ = ufl.TrialFunction(V), ufl.TestFunction(V)
+        stiffness_forms = [
+            df.fem.form(ufl.inner(eps(u_), eps(v_)) * dx),
+            df.fem.form(ufl.tr(eps(u_)) * ufl.tr(eps(v_)) * dx),
+        ]
+
+        # strains at the Gauss points (the points of the quadrature space of the solver) and
+        # projected on the discontinuous stress space of the solver ("nodes")
+        w = df.fem.Function(V)
+        quadrature_space = df.fem.functionspace(
+            mesh,
+            basix.ufl.quadrature_element(
+                mesh.topology.cell_name(), value_shape=(1,), degree=parameters["quadrature-degree"]
+            ),
+        )
+        strain_expression = df.fem.Expression(eps(w), quadrature_space.element.interpolation_points())
+        cells = np.arange(mesh.topology.index_map(mesh.topology.dim).size_local, dtype=np.int32)
+        stress_space = df.fem.functionspace(mesh, ("DG", parameters["element-degree"] - 1, (2, 2)))
+        p_, q_ = ufl.TrialFunction(stress_space), ufl.TestFunction(stress_space)
+        mass_form = df.fem.form(ufl.inner(p_, q_) * dx)
+        projection_form = df.fem.form(ufl.inner(eps(w), q_) * dx)
+
+    def set_radius(radius):
+        mesh.geometry.x[:, :2] = map_coordinates(reference_coordinates, reference_radius, radius, L)
+
+    def assemble(form):
+        matrix = df.fem.assemble_matrix(form)
+        matrix.scatter_reverse()
+        return matrix.to_scipy().tocsr()
+
+    def boundary_data(radius):
+        """g_1 and g_2 (2, dofs), zero except on the outer edges."""
+        data = []
+        for nu in (0.0, 1.0):
+            g.interpolate(PlateWithHoleSolution(E=1.0, nu=nu, radius=radius, L=L, load=1.0).displacement)
+            data.append(np.where(outer, g.x.array, 0.0))
+        return np.array([data[0], data[1] - data[0]])
+
+    def full_solve(radius, E, nu, load):
+        """Displacement dofs and prescribed displacement of the full problem on the mapped mesh."""
+        set_radius(radius)
+        theta = material_coefficients(E, nu)
+        stiffness = theta[0] * assemble(stiffness_forms[0]) + theta[1] * assemble(stiffness_forms[1])
+        prescribed = np.array(boundary_coefficients(E, nu, load)) @ boundary_data(radius)
+        u = prescribed.copy()
+        u[free] = scipy.sparse.linalg.spsolve(stiffness[free][:, free], -(stiffness @ prescribed)[free])
+        return u, prescribed
+
+    def strains(vectors):
+        """Strains (points, 3, vectors) of the columns of `vectors` for each output."""
+        mass = scipy.sparse.linalg.splu(assemble(mass_form).tocsc())
+        gauss_points, nodes = [], []
+        for vector in vectors.T:
+            w.x.array[:] = vector
+            values = strain_expression.eval(mesh, cells).reshape(-1, 4)
+            gauss_points.append(values[:, [0, 3, 1]])
+            projected = mass.solve(df.fem.assemble_vector(projection_form).array).reshape(-1, 4)
+            nodes.append(projected[:, [0, 3, 1]])
+        return {"gauss_points": np.stack(gauss_points, axis=-1), "nodes": np.stack(nodes, axis=-1)}
+
+    rng = np.random.default_rng(rom_config["seed"])
+    training = latin_hypercube(parameter_ranges, rom_config["training_samples"], rng)
+    validation = latin_hypercube(parameter_ranges, rom_config["validation_samples"], rng)
+
+    with monitor.phase("offline"), monitor.phase("snapshots"):
+        snapshots = []
+        for radius, E, nu, load in training:
+            u, prescribed = full_solve(radius, E, nu, load)
+            # normalized, such that the POD is not dominated by the samples with large load / E
+            snapshots.append((u - prescribed) / np.linalg.norm(u - prescribed))
+    monitor.count("snapshots", len(snapshots))
+
+    with monitor.phase("offline"), monitor.phase("pod"):
+        left, singular_values, _ = scipy.linalg.svd(np.column_stack(snapshots), full_matrices=False)
+        energy = np.cumsum(singular_values**2) / np.sum(singular_values**2)
+        basis_size = min(
+            rom_config["max_basis_size"],
+            int(np.searchsorted(energy, 1.0 - rom_config["pod_tolerance"])) + 1,
+        )
+        basis = left[:, :basis_size]
+    monitor.count("basis_size", basis_size)
+
+    with monitor.phase("offline"), monitor.phase("projection"):
+        radii = np.linspace(*parameter_ranges["radius"], rom_config["radius_grid_points"])
+        operators, residual_gram, grid_strains, grid_boundary_data = [], [], [], []
+        for radius in radii:
+            set_radius(radius)
+            grid_boundary_data.append(boundary_data(radius))
+            W = np.column_stack([grid_boundary_data[-1].T, basis])
+            AW = [assemble(form) @ W for form in stiffness_forms]
+            operators.append([W.T @ AW_q for AW_q in AW])
+            residual = np.hstack([AW_q[free] for AW_q in AW])
+            residual_gram.append(residual.T @ residual)
+            grid_strains.append(strains(W))
+
+    model = ReducedOrderModel(
+        radii,
+        np.array(operators),
+        np.array(residual_gram),
+        {output: np.array([s[output] for s in grid_strains]) for output in grid_strains[0]},
+        basis,
+        np.array(grid_boundary_data),
+        singular_values,
+        parameter_ranges,
+    )
+
+    with monitor.phase("validation"):
+        results = []
+        for radius, E, nu, load in validation:
+            u, _ = full_solve(radius, E, nu, load)
+            full = {
+                f"max_von_mises_stress_{output}": float(np.max(von_mises_stress(values[:, :, 0], E, nu)))
+                for output, values in strains(u[:, None]).items()
+            }
+            start = time.perf_counter()
+            z, _ = model.coefficients(radius, E, nu, load)
+            solve_time = time.perf_counter() - start
+            start = time.perf_counter()
+            reduced = model.evaluate(radius, E, nu, load)
+            evaluation_time = time.perf_counter() - start
+            results.append(
+                {
+                    "parameters": dict(zip(PARAMETERS, (radius, E, nu, load))),
+                    "full": full,
+                    "reduced": reduced,
+                    "relative_errors": {
+                        key: abs(reduced[key] - value) / abs(value) for key, value in full.items()
+                    }
+                    | {
+                        "displacement": float(
+                            np.linalg.norm(model.displacement(radius, z) - u) / np.linalg.norm(u)
+                        )
+                    },
+                    "online_solve_time": solve_time,
+                    "online_evaluation_time": evaluation_time,
+                }
+            )
+
+    with open(validation_file, "w") as f:
+        json.dump(
+            {
+                "reference_configuration": parameters["configuration"],
+                "parameter_ranges": parameter_ranges,
+                "basis_size": basis_size,
+                "singular_values": singular_values.tolist(),
+                "radius_grid": radii.tolist(),
+                "validation": results,
+                "max_relative_errors": {
+                    key: max(result["relative_errors"][key] for result in results) for key in results[0]["relative_errors"]
+                }
+                if results
+                else {},
+                "performance": monitor.reduce(MPI.COMM_SELF),
+            },
+            f,
+            indent=4,
+        )
+    return model
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        description="Reduced-order model of the plate with a hole over radius, Young's modulus,\n"
+        "Poisson ratio and load.\n"
+        "offline: snapshots, POD and validation (FEniCS), online: evaluation (numpy only)."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    offline = subparsers.add_parser("offline", help="Build and validate the model")
+    offline.add_argument("--input_parameter_file", required=True, help="JSON file of the reference configuration (input)")
+    offline.add_argument("--input_mesh_file", required=True, help="Path to the reference mesh file (input)")
+    offline.add_argument("--input_rom_config", required=True, help="JSON file with parameter ranges and sample sizes (input)")
+    offline.add_argument("--output_model", required=True, help="Path to the model (.npz) (output)")
+    offline.add_argument("--output_validation_file", required=True, help="Path to the validation JSON file (output)")
+
+    online = subparsers.add_parser("online", help="Evaluate the model (SI units)")
+    online.add_argument("--input_model", required=True, help="Path to the model (.npz) (input)")
+    online.add_argument("--radius", type=float, required=True, help="Radius of the hole in m")
+    online.add_argument("--young_modulus", type=float, required=True, help="Young's modulus in Pa")
+    online.add_argument("--poisson_ratio", type=float, required=True, help="Poisson ratio")
+    online.add_argument("--load", type=float, required=True, help="Load in Pa")
+    args, _ = parser.parse_known_args()
+
+    if args.command == "offline":
+        model = build_reduced_order_model(
+            args.input_parameter_file,
+            args.input_mesh_file,
+            args.input_rom_config,
+            args.output_validation_file,
+        )
+        model.save(args.output_model)
+    else:
+        model = ReducedOrderModel.load(args.input_model)
+        print(json.dumps(model.evaluate(args.radius, args.young_modulus, args.poisson_ratio, args.load), indent=4))
@@ -1,50 +1,306 @@
 import json
 import sys
+import zipfile
 from argparse import ArgumentParser
+from concurrent.futures import Future, ThreadPoolExecutor
 
 from pathlib import Path
 import dolfinx as df
 import basix.ufl
 import numpy as np
 import ufl
-from dolfinx.fem.petsc import LinearProblem
-from petsc4py.PETSc import ScalarType
+from dolfinx.fem.petsc import (
+    LinearProblem,
+    apply_lifting,
+    assemble_matrix,
+    assemble_vector,
+    create_vector,
+    set_bc,
+)
+from petsc4py import PETSc
 from mpi4py import MPI
 from pint import UnitRegistry
 
 # Add parent directory to sys.path
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 from plateWithHoleSolution import PlateWithHoleSolution
+from performance_monitor import PerformanceMonitor
+
+
+def _coordinate_keys(coordinates: np.ndarray) -> np.ndarray:
+    """Sortable keys (complex numbers, sorted by x, then y) of rounded 2D coordinates."""
+    return np.round(coordinates[:, 0], 10) + 1j * np.round(coordinates[:, 1], 10)
+
+
+def write_displacement(u: df.fem.Function, displacement_file: str, element_degree: int) -> None:
+    """
+    Writes the coordinates and values of the owned displacement dofs of all ranks to an
+    .npz file (on rank 0), which can be used as initial guess of a finer level.
+    """
+    V = u.function_space
+    size_local = V.dofmap.index_map.size_local
+    gathered = V.mesh.comm.gather(
+        (
+            V.tabulate_dof_coordinates()[:size_local, :2],
+            u.x.array.reshape(-1, 2)[:size_local],
+        ),
+        root=0,
+    )
+    if V.mesh.comm.rank == 0:
+        np.savez(
+            displacement_file,
+            coordinates=np.vstack([coordinates for coordinates, _ in gathered]),
+            values=np.vstack([values for _, values in gathered]),
+            element_degree=element_degree,
+        )
+
+
+def interpolate_initial_guess(
+    u: df.fem.Function, mesh_file: str, displacement_file: str
+) -> None:
+    """
+    Interpolates the displacement of a previous (coarser) level, given by its mesh and the
+    file written by `write_displacement`, onto the function space of `u` with dolfinx's
+    interpolation between non-matching meshes.
+    """
+    data = np.load(displacement_file)
+    mesh = u.function_space.mesh
+    coarse_mesh, _, _ = df.io.gmshio.read_from_msh(mesh_file, comm=mesh.comm, gdim=2)
+    V_coarse = df.fem.functionspace(
+        coarse_mesh, ("CG", int(data["element_degree"]), (2,))
+    )
+    u_coarse = df.fem.Function(V_coarse)
+
+    # the dofs are matched by their coordinates, as their numbering depends on the partitioning
+    keys = _coordinate_keys(data["coordinates"])
+    order = np.argsort(keys)
+    local_keys = _coordinate_keys(V_coarse.tabulate_dof_coordinates()[:, :2])
+    positions = np.clip(np.searchsorted(keys[order], local_keys), 0, len(keys) - 1)
+    if not np.array_equal(keys[order][positions], local_keys):
+        raise ValueError(
+            f"The dofs of {displacement_file} do not match the mesh {mesh_file}"
+        )
+    u_coarse.x.array.reshape(-1, 2)[:] = data["values"][order[positions]]
+
+    cell_map = mesh.topology.index_map(mesh.topology.dim)
+    cells = np.arange(cell_map.size_local + cell_map.num_ghosts, dtype=np.int32)
+    interpolation_data = df.fem.create_interpolation_data(
+        u.function_space, V_coarse, cells, padding=1e-8
+    )
+    u.interpolate_nonmatching(u_coarse, cells, interpolation_data)
+    u.x.scatter_forward()
+
+
+class ElasticityOperator:
+    """
+    Python context of a PETSc shell matrix, which applies the stiffness matrix of the bilinear
+    form `a` without storing it. The product is the vector assembly of the action of `a` on the
+    input vector. As for assemble_matrix with `bcs`, the rows and columns of the constrained dofs
+    are replaced by the identity.
+
+    The diagonal (for the Jacobi preconditioner) is assembled once into a matrix whose sparsity
+    pattern only contains the diagonal blocks of the dofmap, the entries outside of it are dropped.
+    """
+
+    def __init__(self, a: ufl.Form, bcs: list[df.fem.DirichletBC]):
+        V = a.arguments()[0].ufl_function_space()
+        self.w = df.fem.Function(V)
+        self.action = df.fem.form(ufl.action(a, self.w))
+        size_owned = V.dofmap.index_map.size_local * V.dofmap.index_map_bs
+        self.constrained = np.unique(np.concatenate([bc.dof_indices()[0] for bc in bcs]))
+        self.constrained_owned = self.constrained[self.constrained < size_owned]
+
+        index_map = V.dofmap.index_map
+        pattern = df.cpp.la.SparsityPattern(
+            V.mesh.comm, [index_map, index_map], [V.dofmap.index_map_bs] * 2
+        )
+        pattern.insert_diagonal(np.arange(index_map.size_local + index_map.num_ghosts, dtype=np.int32))
+        pattern.finalize()
+        A_diagonal = df.cpp.la.petsc.create_matrix(V.mesh.comm, pattern)
+        A_diagonal.setOption(PETSc.Mat.Option.NEW_NONZERO_LOCATIONS, False)
+        assemble_matrix(A_diagonal, df.fem.form(a), bcs=bcs)
+        A_diagonal.assemble()
+        self.diagonal = A_diagonal.getDiagonal()
+        A_diagonal.destroy()
+
+    def mult(self, mat: PETSc.Mat, x: PETSc.Vec, y: PETSc.Vec) -> None:
+        x.copy(self.w.x.petsc_vec)
+        self.w.x.scatter_forward()
+        self.w.x.array[self.constrained] = 0.0
+        with y.localForm() as y_local:
+            y_local.set(0.0)
+        assemble_vector(y, self.action)
+        y.ghostUpdate(addv=PETSc.InsertMode.ADD, mode=PETSc.ScatterMode.REVERSE)
+        y.array[self.constrained_owned] = x.array_r[self.constrained_owned]
+
+    def getDiagonal(self, mat: PETSc.Mat, d: PETSc.Vec) -> None:
+        self.diagonal.copy(d)
+
+
+def create_matrix_free_operator(a: ufl.Form, bcs: list[df.fem.DirichletBC]) -> PETSc.Mat:
+    """PETSc shell matrix of the bilinear form `a` with Dirichlet conditions `bcs`, see ElasticityOperator."""
+    V = a.arguments()[0].ufl_function_space()
+    size = (
+        V.dofmap.index_map.size_local * V.dofmap.index_map_bs,
+        V.dofmap.index_map.size_global * V.dofmap.index_map_bs,
+    )
+    A = PETSc.Mat().createPython((size, size), ElasticityOperator(a, bcs), comm=V.mesh.comm)
+    A.setUp()
+    return A
+
+
+def write_solution_files(
+    functions: dict[str, df.fem.Function],
+    output_dir: Path,
+    configuration: str,
+    solution_file_zip: str,
+    comm: MPI.Comm,
+    monitor: PerformanceMonitor,
+) -> None:
+    """
+    Writes each function to its own VTK file (solution_field_data_{name}_{configuration}.vtk) on
+    all ranks and stores all .vtk, .vtu and .pvtu files of the configuration in the compressed zip
+    file on rank 0. Runs in the background thread of `write_solution_files_async`.
+    """
+    with monitor.phase("output"), monitor.phase("vtk"):
+        for name, function in functions.items():
+            with df.io.VTKFile(
+                comm, str(output_dir / f"solution_field_data_{name}_{configuration}.vtk"), "w"
+            ) as vtk:
+                vtk.write_function(function, 0.0)
+    # rank 0 can only zip the .vtu files of the other ranks once they are written
+    comm.Barrier()
+
+    if comm.rank == 0:
+        files_to_store = [
+            filepath
+            for name in functions
+            for filepath in sorted(output_dir.glob(f"solution_field_data_{name}_{configuration}*"))
+            # filter for all file endings because this is not possible with glob
+            if filepath.suffix in [".vtk", ".vtu", ".pvtu"]
+        ]
+        with monitor.phase("output"), monitor.phase("zip"):
+            with zipfile.ZipFile(solution_file_zip, "w", compression=zipfile.ZIP_DEFLATED) as zipf:
+                for filepath in files_to_store:
+                    zipf.write(filepath, arcname=filepath.name)
+
+
+def write_solution_files_async(
+    functions: dict[str, df.fem.Function],
+    output_dir: Path,
+    configuration: str,
+    solution_file_zip: str,
+    monitor: PerformanceMonitor,
+) -> tuple[Future, MPI.Comm]:
+    """
+    Snapshots the functions (copies of their values, so the originals can be modified, e.g. by
+    the load cases) and writes them with `write_solution_files` in a background thread, while
+    the caller continues. The thread uses a duplicate of COMM_WORLD, such that its barrier does
+    not interfere with the collective calls of the main thread. Returns the future and the
+    communicator, which is freed after `result()`, see `await_solution_files`.
+
+    If the MPI library does not support MPI_THREAD_MULTIPLE, the files are written before
+    returning.
+    """
+    snapshots = {}
+    for name, function in functions.items():
+        snapshots[name] = function.copy()
+        snapshots[name].name = function.name
+    comm = MPI.COMM_WORLD.Dup()
+    args = (snapshots, output_dir, configuration, solution_file_zip, comm, monitor)
+    if comm.size > 1 and MPI.Query_thread() < MPI.THREAD_MULTIPLE:
+        write_solution_files(*args)
+        future = Future()
+        future.set_result(None)
+        return future, comm
+
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="solution_output")
+    future = executor.submit(write_solution_files, *args)
+    # the thread exits after the (single) task
+    executor.shutdown(wait=False)
+    return future, comm
+
+
+def await_solution_files(output: tuple[Future, MPI.Comm]) -> None:
+    """Waits for the files written by `write_solution_files_async`, re-raises its exceptions."""
+    future, comm = output
+    try:
+        future.result()
+    finally:
+        comm.Free()
 
 
 def run_fenics_simulation(
-    parameter_file: str, mesh_file: str, solution_file_zip: str, metrics_file: str
+    parameter_file: str,
+    mesh_file: str,
+    solution_file_zip: str,
+    metrics_file: str,
+    load_cases_file: str | None = None,
+    initial_guess_file: str | None = None,
+    initial_guess_mesh_file: str | None = None,
+    displacement_file: str | None = None,
+    solver_mode: str = "assembled",
 ) -> None:
+    """
+    Solves the plate with a hole for the parameters of `parameter_file`. If a load cases file
+    (JSON, {"load_cases": [{"name": ..., "load": {"value": ..., "unit": ...}}, ...]}) is given,
+    the problem is additionally solved for each load: since only the prescribed displacements
+    change (linearly in the load), the stiffness matrix is assembled and LU-factorized once and
+    each load case only costs the assembly of its right hand side and a back-solve. The metrics
+    of the load cases are written to the "load_cases" section of the metrics file.
+
+    If the displacement of a previous (coarser) level is given (`initial_guess_file` written
+    with `displacement_file` of that level and its mesh `initial_guess_mesh_file`), it is
+    interpolated onto the mesh and used as initial guess of GMRES instead of zero.
+
+    With `solver_mode` "matrix_free", the stiffness matrix is not assembled. The system is solved
+    with CG, which applies the operator by vector assembly (see ElasticityOperator), preconditioned
+    with the inverse of the assembled diagonal (Jacobi). This needs a fraction of the memory of
+    the assembled matrix, e.g. for the finest configurations and degree 2 elements.
+    It cannot be combined with load cases, which rely on the reuse of the LU factorization (CG
+    would iterate from scratch for every load case).
+
+    The VTK files and the zip file of the solution fields are written in a background thread
+    (see write_solution_files_async), which overlaps with the remaining postprocessing and the
+    load cases. It is awaited before the metrics file is written.
+    """
+    if solver_mode == "matrix_free" and load_cases_file is not None:
+        raise ValueError("The load cases need the assembled solver mode (LU factorization)")
+
+    # timings of the individual phases, peak memory and problem size
+    # (written to the "performance" section of the metrics file)
+    monitor = PerformanceMonitor()
+
     ureg = UnitRegistry()
     with open(parameter_file) as f:
         parameters = json.load(f)
 
-    mesh, cell_tags, facet_tags = df.io.gmshio.read_from_msh(
-        mesh_file,
-        comm=MPI.COMM_WORLD,
-        gdim=2,
-    )
+    with monitor.phase("setup"), monitor.phase("mesh_read"):
+        mesh, cell_tags, facet_tags = df.io.gmshio.read_from_msh(
+            mesh_file,
+            comm=MPI.COMM_WORLD,
+            gdim=2,
+        )
 
-    V = df.fem.functionspace(mesh, ("CG", parameters["element-degree"], (2,)))
+    with monitor.phase("setup"), monitor.phase("function_space"):
+        V = df.fem.functionspace(mesh, ("CG", parameters["element-degree"], (2,)))
 
-    tags_left = facet_tags.find(1)
-    tags_bottom = facet_tags.find(2)
-    tags_right = facet_tags.find(3)
-    tags_top = facet_tags.find(4)
+        tags_left = facet_tags.find(1)
+        tags_bottom = facet_tags.find(2)
+        tags_right = facet_tags.find(3)
+        tags_top = facet_tags.find(4)
 
-    # Boundary conditions
-    dofs_left = df.fem.locate_dofs_topological(V.sub(0), 1, tags_left)
-    dofs_bottom = df.fem.locate_dofs_topological(V.sub(1), 1, tags_bottom)
-    dofs_right = df.fem.locate_dofs_topological(V, 1, tags_right)
-    dofs_top = df.fem.locate_dofs_topological(V, 1, tags_top)
+        # Boundary conditions
+        dofs_left = df.fem.locate_dofs_topological(V.sub(0), 1, tags_left)
+        dofs_bottom = df.fem.locate_dofs_topological(V.sub(1), 1, tags_bottom)
+        dofs_right = df.fem.locate_dofs_topological(V, 1, tags_right)
+        dofs_top = df.fem.locate_dofs_topological(V, 1, tags_top)
 
-    bc_left = df.fem.dirichletbc(0.0, dofs_left, V.sub(0))
-    bc_bottom = df.fem.dirichletbc(0.0, dofs_bottom, V.sub(1))
+        bc_left = df.fem.dirichletbc(0.0, dofs_left, V.sub(0))
+        bc_bottom = df.fem.dirichletbc(0.0, dofs_bottom, V.sub(1))
+
+    monitor.count("cells", mesh.topology.index_map(mesh.topology.dim).size_local)
+    monitor.count("dofs", V.dofmap.index_map.size_local * V.dofmap.index_map_bs)
 
     E = (
         ureg.Quantity(
@@ -76,13 +332,14 @@ def run_fenics_simulation(
         .magnitude
     )
 
-    analytical_solution = PlateWithHoleSolution(
-        E=E,
-        nu=nu,
-        radius=radius,
-        L=L,
-        load=load,
-    )
+    with monitor.phase("setup"), monitor.phase("analytical_solution"):
+        analytical_solution = PlateWithHoleSolution(
+            E=E,
+            nu=nu,
+            radius=radius,
+            L=L,
+            load=load,
+        )
 
     def eps(v):
         return ufl.sym(ufl.grad(v))
@@ -117,31 +374,105 @@ def run_fenics_simulation(
     stress_function = df.fem.Function(stress_space)
 
     u = df.fem.Function(V, name="u")
-    u_prescribed = df.fem.Function(V, name="u_prescribed")
-    u_prescribed.interpolate(lambda x: analytical_solution.displacement(x))
-    u_prescribed.x.scatter_forward()
+    with monitor.phase("setup"), monitor.phase("boundary_conditions"):
+        u_prescribed = df.fem.Function(V, name="u_prescribed")
+        u_prescribed.interpolate(lambda x: analytical_solution.displacement(x))
+        u_prescribed.x.scatter_forward()
+
+        bc_right = df.fem.dirichletbc(u_prescribed, dofs_right)
+        bc_top = df.fem.dirichletbc(u_prescribed, dofs_top)
+        bcs = [bc_left, bc_bottom, bc_right, bc_top]
 
     u_ = ufl.TestFunction(V)
     v_ = ufl.TrialFunction(V)
-    a = df.fem.form(ufl.inner(sigma(u_), eps(v_)) * dx)
-
-    # set rhs to zero
-    f = df.fem.form(ufl.inner(df.fem.Constant(mesh, np.array([0.0, 0.0])), u_) * ufl.ds)
-
-    bc_right = df.fem.dirichletbc(u_prescribed, dofs_right)
-    bc_top = df.fem.dirichletbc(u_prescribed, dofs_top)
-    solver = LinearProblem(
-        a,
-        f,
-        bcs=[bc_left, bc_bottom, bc_right, bc_top],
-        u=u,
-        petsc_options={
-            "ksp_type": "gmres",
-            "ksp_rtol": 1e-14,
-            "ksp_atol": 1e-14,
-        },
-    )
-    solver.solve()
+    with monitor.phase("setup"), monitor.phase("form_compilation"):
+        a_form = ufl.inner(sigma(u_), eps(v_)) * dx
+        a = df.fem.form(a_form)
+
+        # set rhs to zero
+        f = df.fem.form(
+            ufl.inner(df.fem.Constant(mesh, np.array([0.0, 0.0])), u_) * ufl.ds
+        )
+
+    def assemble_rhs(b):
+        with b.localForm() as b_local:
+            b_local.set(0.0)
+        assemble_vector(b, f)
+        apply_lifting(b, [a], bcs=[bcs])
+        b.ghostUpdate(addv=PETSc.InsertMode.ADD, mode=PETSc.ScatterMode.REVERSE)
+        set_bc(b, bcs)
+
+    # The linear system is assembled and solved explicitly (instead of using LinearProblem)
+    # such that assembly and solve can be timed separately.
+    with monitor.phase("solve"), monitor.phase("assembly"):
+        if solver_mode == "matrix_free":
+            A = create_matrix_free_operator(a_form, bcs)
+        else:
+            A = assemble_matrix(a, bcs=bcs)
+            A.assemble()
+            monitor.count("matrix_nonzeros", A.getInfo()["nz_used"])
+        b = create_vector(f)
+        assemble_rhs(b)
+
+    if initial_guess_file is not None:
+        with monitor.phase("solve"), monitor.phase("initial_guess"):
+            interpolate_initial_guess(u, initial_guess_mesh_file, initial_guess_file)
+            # the prescribed values are exact, only the free dofs have to be corrected
+            for bc in bcs:
+                bc.set(u.x.array)
+
+    with monitor.phase("solve"), monitor.phase("ksp_solve"):
+        if solver_mode == "matrix_free":
+            # CG for the symmetric operator, Jacobi from the assembled diagonal
+            petsc_options = {
+                "ksp_type": "cg",
+                "pc_type": "jacobi",
+                "ksp_rtol": 1e-12,
+                "ksp_atol": 1e-14,
+                "ksp_max_it": 100000,
+            }
+        elif load_cases_file is None:
+            petsc_options = {
+                "ksp_type": "gmres",
+                "ksp_rtol": 1e-14,
+                "ksp_atol": 1e-14,
+            }
+        else:
+            # direct solver, the factorization is computed in the first solve and reused
+            # for the back-solves of all load cases
+            petsc_options = {
+                "ksp_type": "preonly",
+                "pc_type": "lu",
+                "pc_factor_mat_solver_type": "mumps",
+            }
+        solver = PETSc.KSP().create(mesh.comm)
+        solver.setOperators(A)
+        solver.setOptionsPrefix("elasticity_")
+        options = PETSc.Options()
+        options.prefixPush("elasticity_")
+        for key, value in petsc_options.items():
+            options[key] = value
+        options.prefixPop()
+        solver.setFromOptions()
+        solver.setInitialGuessNonzero(initial_guess_file is not None)
+        solver.solve(b, u.x.petsc_vec)
+        u.x.scatter_forward()
+        if solver.getConvergedReason() < 0:
+            raise RuntimeError(f"The {solver_mode} solve did not converge (reason {solver.getConvergedReason()})")
+    monitor.count("solver_iterations", solver.getIterationNumber())
+    # the tolerances differ between the solvers (CG of the matrix-free mode stops at a larger
+    # relative residual than GMRES), they are recorded to compare the iterations and solve times
+    rtol, atol, _, _ = solver.getTolerances()
+    solver_settings = {
+        "ksp_type": solver.getType(),
+        "pc_type": solver.getPC().getType(),
+        "ksp_rtol": rtol,
+        "ksp_atol": atol,
+    }
+    monitor.count("warm_start", int(initial_guess_file is not None))
+    if displacement_file is not None:
+        with monitor.phase("output"), monitor.phase("displacement"):
+            write_displacement(u, displacement_file, parameters["element-degree"])
 
     def project(
         v: df.fem.Function | ufl.core.expr.Expr,
@@ -176,8 +507,9 @@ def run_fenics_simulation(
     plot_space_mises = df.fem.functionspace(
         mesh, ("DG", parameters["element-degree"] - 1, (1,))
     )
-    stress_nodes_red = project(sigma(u), plot_space_stress, dx)
-    stress_nodes_red.name = "stress"
+    with monitor.phase("postprocessing"), monitor.phase("projection_stress"):
+        stress_nodes_red = project(sigma(u), plot_space_stress, dx)
+        stress_nodes_red.name = "stress"
 
     def mises_stress(u):
         stress = sigma(u)
@@ -185,87 +517,100 @@ def run_fenics_simulation(
         s = stress - p * ufl.Identity(2)
         return ufl.as_vector([(3.0 / 2.0) ** 0.5 * (ufl.inner(s, s) + p * p) ** 0.5])
 
-    mises_stress_nodes = project(mises_stress(u), plot_space_mises, dx)
-    mises_stress_nodes.name = "von_mises_stress"
+    with monitor.phase("postprocessing"), monitor.phase("projection_mises"):
+        mises_stress_nodes = project(mises_stress(u), plot_space_mises, dx)
+        mises_stress_nodes.name = "von_mises_stress"
 
-    # Write each function to its own VTK file on all ranks
-    output_dir = Path(solution_file_zip).parent
-    with df.io.VTKFile(
-        MPI.COMM_WORLD,
-        str(
-            output_dir
-            / f"solution_field_data_displacements_{parameters['configuration']}.vtk"
-        ),
-        "w",
-    ) as vtk:
-        vtk.write_function(u, 0.0)
-    with df.io.VTKFile(
-        MPI.COMM_WORLD,
-        str(
-            output_dir / f"solution_field_data_stress_{parameters['configuration']}.vtk"
-        ),
-        "w",
-    ) as vtk:
-        vtk.write_function(stress_nodes_red, 0.0)
-    with df.io.VTKFile(
-        MPI.COMM_WORLD,
-        str(
-            output_dir
-            / f"solution_field_data_mises_stress_{parameters['configuration']}.vtk"
-        ),
-        "w",
-    ) as vtk:
-        vtk.write_function(mises_stress_nodes, 0.0)
+    # Write each function to its own VTK file on all ranks and zip them, in the background
+    output = write_solution_files_async(
+        {
+            "displacements": u,
+            "stress": stress_nodes_red,
+            "mises_stress": mises_stress_nodes,
+        },
+        Path(solution_file_zip).parent,
+        parameters["configuration"],
+        solution_file_zip,
+        monitor,
+    )
 
     # extract maximum von Mises stress
     max_mises_stress_nodes = np.max(mises_stress_nodes.x.array)
 
     # Compute von Mises stress at quadrature (Gauss) points and extract maximum (global across MPI)
-    quad_element = basix.ufl.quadrature_element(
-        mesh.topology.cell_name(),
-        value_shape=(1,),
-        degree=parameters["quadrature-degree"],
-    )
+    with monitor.phase("postprocessing"), monitor.phase("quadrature_interpolation"):
+        quad_element = basix.ufl.quadrature_element(
+            mesh.topology.cell_name(),
+            value_shape=(1,),
+            degree=parameters["quadrature-degree"],
+        )
 
-    Q_mises = df.fem.functionspace(mesh, quad_element)
-    mises_qp = df.fem.Function(Q_mises, name="von_mises_stress_qp")
-    expr_qp = df.fem.Expression(mises_stress(u), Q_mises.element.interpolation_points())
-    mises_qp.interpolate(expr_qp)
-    max_mises_stress_gauss_points = MPI.COMM_WORLD.allreduce(
-        np.max(mises_qp.x.array), op=MPI.MAX
-    )
+        Q_mises = df.fem.functionspace(mesh, quad_element)
+        mises_qp = df.fem.Function(Q_mises, name="von_mises_stress_qp")
+        expr_qp = df.fem.Expression(
+            mises_stress(u), Q_mises.element.interpolation_points()
+        )
+        mises_qp.interpolate(expr_qp)
+        max_mises_stress_gauss_points = MPI.COMM_WORLD.allreduce(
+            np.max(mises_qp.x.array), op=MPI.MAX
+        )
     # Save metrics
     metrics = {
         "max_von_mises_stress_nodes": max_mises_stress_nodes,
         "max_von_mises_stress_gauss_points": max_mises_stress_gauss_points,
+        "solver": solver_settings,
     }
 
+    if load_cases_file is not None:
+        # (not opened as f, which is the right hand side form used by assemble_rhs)
+        with open(load_cases_file) as load_cases_json:
+            load_cases = json.load(load_cases_json)["load_cases"]
+        # the prescribed displacements are linear in the load, so the boundary data is interpolated
+        # once for a unit load and scaled by the load of each case (also for a zero load)
+        with monitor.phase("load_cases"), monitor.phase("boundary_conditions"):
+            unit_load_solution = PlateWithHoleSolution(E=E, nu=nu, radius=radius, L=L, load=1.0)
+            u_prescribed_unit_load = df.fem.Function(V)
+            u_prescribed_unit_load.interpolate(lambda x: unit_load_solution.displacement(x))
+            u_prescribed_unit_load.x.scatter_forward()
+        metrics["load_cases"] = []
+        for load_case in load_cases:
+            case_load = (
+                ureg.Quantity(load_case["load"]["value"], load_case["load"]["unit"])
+                .to_base_units()
+                .magnitude
+            )
+            with monitor.phase("load_cases"), monitor.phase("rhs_assembly"):
+                u_prescribed.x.array[:] = case_load * u_prescribed_unit_load.x.array
+                assemble_rhs(b)
+            with monitor.phase("load_cases"), monitor.phase("back_solve"):
+                solver.solve(b, u.x.petsc_vec)
+                u.x.scatter_forward()
+            with monitor.phase("load_cases"), monitor.phase("postprocessing"):
+                # the expressions depend on u and are evaluated for the current solution
+                case_mises_nodes = project(mises_stress(u), plot_space_mises, dx)
+                mises_qp.interpolate(expr_qp)
+                metrics["load_cases"].append(
+                    {
+                        "name": load_case["name"],
+                        "load": load_case["load"],
+                        "max_von_mises_stress_nodes": MPI.COMM_WORLD.allreduce(
+                            np.max(case_mises_nodes.x.array), op=MPI.MAX
+                        ),
+                        "max_von_mises_stress_gauss_points": MPI.COMM_WORLD.allreduce(
+                            np.max(mises_qp.x.array), op=MPI.MAX
+                        ),
+                    }
+                )
+        monitor.count("load_cases", len(load_cases))
+
+    with monitor.phase("output"), monitor.phase("wait"):
+        await_solution_files(output)
+
+    # reduce the timings and memory usage over all ranks (collective) and save the metrics
+    metrics["performance"] = monitor.reduce(MPI.COMM_WORLD)
     if MPI.COMM_WORLD.rank == 0:
         with open(metrics_file, "w") as f:
             json.dump(metrics, f, indent=4)
-        # store all .vtu, .pvtu and .vtk files for this configuration in the zip file
-        import zipfile
-
-        config = parameters["configuration"]
-        file_patterns = [
-            str(output_dir / f"solution_field_data_displacements_{config}*"),
-            str(output_dir / f"solution_field_data_stress_{config}*"),
-            str(output_dir / f"solution_field_data_mises_stress_{config}*"),
-        ]
-
-        files_to_store = []
-        for pattern in file_patterns:
-            files_to_store.extend(
-                filter(
-                    # filter for all file endings because this is not possible with glob
-                    lambda path: path.suffix in [".vtk", ".vtu", ".pvtu"],
-                    Path().glob(pattern),
-                )
-            )
-            # files_to_store.extend(Path().glob(pattern))
-        with zipfile.ZipFile(solution_file_zip, "w") as zipf:
-            for filepath in files_to_store:
-                zipf.write(filepath, arcname=filepath.name)
 
 
 if __name__ == "__main__":
@@ -292,10 +637,43 @@ if __name__ == "__main__":
         required=True,
         help="Path to the output metrics JSON file (output)",
     )
+    parser.add_argument(
+        "--input_load_cases",
+        default=None,
+        help="JSON file with additional load cases solved with the same factorization (input)",
+    )
+    parser.add_argument(
+        "--input_initial_guess",
+        default=None,
+        help="Displacement (.npz) of a previous level used as initial guess (input)",
+    )
+    parser.add_argument(
+        "--input_initial_guess_mesh",
+        default=None,
+        help="Path to the mesh file of the previous level (input)",
+    )
+    parser.add_argument(
+        "--output_displacement_file",
+        default=None,
+        help="Path to the displacement (.npz), the initial guess of a finer level (output)",
+    )
+    parser.add_argument(
+        "--solver_mode",
+        choices=["assembled", "matrix_free"],
+        default="assembled",
+        help="Assembled stiffness matrix (GMRES) or matrix-free operator (CG, Jacobi)",
+    )
     args, _ = parser.parse_known_args()
+    if args.solver_mode == "matrix_free" and args.input_load_cases is not None:
+        parser.error("--input_load_cases requires --solver_mode assembled")
     run_fenics_simulation(
         args.input_parameter_file,
         args.input_mesh_file,
         args.output_solution_file_zip,
         args.output_metrics_file,
+        args.input_load_cases,
+        args.input_initial_guess,
+        args.input_initial_guess_mesh,
+        args.output_displacement_file,
+        args.solver_mode,
     )
@@ -2,17 +2,18 @@
 import json
 
 from pathlib import Path
-from os.path import join
 
-files = list(Path(".").glob("parameters_*.json"))
+from cost_model import estimate, load_cost_model, step_priorities
+
+BENCHMARK = "linear-elastic-plate-with-hole"
+TOOLS = ["fenics", "kratos"]
+
 
 # extract the configuration from the parameter files
 # by reading in the json files and extracting the "configuration" value
 # configuration stores the appendix in the output files)"
-# in theory, you could make that identical so parameters_1.json with configuration "1" 
+# in theory, you could make that identical so parameters_1.json with configuration "1"
 # would produce summary_1.json
-import json
-import copy
 def get_configuration(file):
     with open(file, 'r') as f:
         data = json.load(f)
@@ -26,29 +27,57 @@ def get_configuration(file):
     # If no configuration is found, raise an error
     raise ValueError(f"Configuration key not found for file: {file}")
 
-# Create a dictionary of configurations (key is the name of the parameter file)
-# configurations: {Path("parameters_1.json"): "1", ...}
-configurations = {file: get_configuration(file) for file in files if file.is_file()}
 
-# Check for duplicate configuration values (the configurations should be unique)
-config_values = list(configurations.values())
-duplicates = set([x for x in config_values if config_values.count(x) > 1])
-if duplicates:
-    raise ValueError(f"Duplicate configuration values found in parameter files: {', '.join(duplicates)}")
+def generate_config(directory: str | Path = ".") -> dict:
+    """
+    Workflow configuration of the parameter files (parameters_*.json) in `directory`.
+    Nothing is read or written when the module is imported, e.g. by plot_provenance.py.
+    """
+    files = list(Path(directory).glob("parameters_*.json"))
+
+    # Create a dictionary of configurations (key is the name of the parameter file)
+    # configurations: {Path("parameters_1.json"): "1", ...}
+    configurations = {file: get_configuration(file) for file in files if file.is_file()}
+
+    # Check for duplicate configuration values (the configurations should be unique)
+    config_values = list(configurations.values())
+    duplicates = set([x for x in config_values if config_values.count(x) > 1])
+    if duplicates:
+        raise ValueError(f"Duplicate configuration values found in parameter files: {', '.join(duplicates)}")
+
+    # Reverse mapping for easy lookup by configuration name
+    configuration_to_parameter_file = {v: str(k) for k, v in configurations.items()}
+
+    # Estimated size, runtime and memory of each configuration (see cost_model.py). If the cost
+    # model was calibrated from a previous run (cost_model.json), the calibrated model is used.
+    cost_model = load_cost_model(str(Path(directory) / "cost_model.json"))
+    cost_estimates = {}
+    for configuration, parameter_file in configuration_to_parameter_file.items():
+        with open(parameter_file) as f:
+            cost_estimates[configuration] = estimate(json.load(f), cost_model)
+
+    # The configurations are ordered by their estimated cost (most expensive first), such that the
+    # workflow engines start the longest jobs first and they do not dominate the makespan.
+    sorted_configurations = sorted(
+        configurations.values(),
+        key=lambda c: sum(step["runtime_s"] for step in cost_estimates[c]["steps"].values()),
+        reverse=True,
+    )
 
-# Reverse mapping for easy lookup by configuration name
-configuration_to_parameter_file = {v: str(k) for k, v in configurations.items()}
+    # Template for workflow config
+    return {
+        "configuration_to_parameter_file": configuration_to_parameter_file,
+        "configurations": sorted_configurations,
+        "cost_estimates": cost_estimates,
+        "step_priorities": step_priorities(cost_estimates),
+        "tools": TOOLS,
+        "benchmark": BENCHMARK
+    }
 
-benchmark = "linear-elastic-plate-with-hole"
 
-# Template for workflow config
-workflow_config = {
-    "configuration_to_parameter_file": configuration_to_parameter_file,
-    "configurations": list(configurations.values()),
-    "tools": ["fenics", "kratos"],
-    "benchmark": benchmark
-}
+if __name__ == "__main__":
+    workflow_config = generate_config()
 
-# Write workflow configuration file
-with open("workflow_config.json", "w") as f:
-    json.dump(workflow_config, f, indent=4)
\ No newline at end of file
+    # Write workflow configuration file
+    with open("workflow_config.json", "w") as f:
+        json.dump(workflow_config, f, indent=4)
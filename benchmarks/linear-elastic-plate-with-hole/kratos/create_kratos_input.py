@@ -69,13 +69,16 @@ def create_kratos_input(
     with open(kratos_material_file, "w") as f:
         f.write(material_string)
 
+    # The paths in the kratos input file are relative (file names only), so the input files
+    # are relocatable, e.g. into the work directory of a Nextflow task. They are resolved
+    # when the simulation is run (see run_kratos_simulation.py).
     with open(kratos_input_template_file) as f:
         project_parameters_string = f.read()
     project_parameters_string = project_parameters_string.replace(
-        r"{{MESH_FILE}}", os.path.splitext(mdpa_file)[0]
+        r"{{MESH_FILE}}", os.path.splitext(os.path.basename(mdpa_file))[0]
     )
     project_parameters_string = project_parameters_string.replace(
-        r"{{MATERIAL_FILE}}", kratos_material_file
+        r"{{MATERIAL_FILE}}", os.path.basename(kratos_material_file)
     )
     project_parameters_string = project_parameters_string.replace(
         r"{{BOUNDARY_RIGHT_DISPLACEMENT_X}}", str(bc[0])
@@ -90,9 +93,7 @@ def create_kratos_input(
         r"{{BOUNDARY_TOP_DISPLACEMENT_Y}}", str(bc[1])
     )
     config = parameters["configuration"]
-    output_dir = os.path.join(os.path.dirname(os.path.abspath(kratos_input_file)), str(config))
-    os.makedirs(output_dir, exist_ok=True)
-    project_parameters_string = project_parameters_string.replace(r"{{OUTPUT_PATH}}", output_dir)
+    project_parameters_string = project_parameters_string.replace(r"{{OUTPUT_PATH}}", str(config))
 
     with open(kratos_input_file, "w") as f:
         f.write(project_parameters_string)
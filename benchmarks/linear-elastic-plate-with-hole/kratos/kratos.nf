@@ -1,8 +1,11 @@
 params.tool = "kratos"
 
 process mesh_to_mdpa {
+    tag "${configuration}"
     publishDir "${params.result_dir}/${params.tool}/"
     conda './kratos/environment_simulation.yml'
+    memory { "${params.cost_estimates[configuration]?.steps?.mesh_to_mdpa?.memory_mb ?: 1000} MB" }
+    cpus { params.cost_estimates[configuration]?.steps?.mesh_to_mdpa?.cpus ?: 1 }
     
     input:
     path python_script
@@ -13,6 +16,8 @@ process mesh_to_mdpa {
     
     script:
     """
+    python3 ${projectDir}/artifact_cache.py --cache_dir ${params.artifact_cache} --key mesh_to_mdpa --hit_marker .artifact_cache_hit --env ${projectDir}/kratos/environment_simulation.yml \
+        --inputs ${python_script} ${parameter_file} ${mesh_file} --outputs mesh_${configuration}.mdpa -- \
     python3 ${python_script} \
         --input_parameter_file ${parameter_file} \
         --input_mesh_file ${mesh_file} \
@@ -20,48 +25,76 @@ process mesh_to_mdpa {
     """
 }
 
-process create_kratos_input_and_run_simulation {
+process create_kratos_input {
 
-    // The process combines the creation of the Kratos input file (json) and the execution of the simulation. Initially, these were two separate processes. 
-    // The combination was necessary because the create_kratos_input.py specifies the location of the mesh file and the output location of the simulation results in 
-    // the json file. In the case of Nextflow, these locations are related to the process's sub-directory (inside the work directory). Executing the simulation as a 
-    // separate process results in a failure to find the mesh file and write the output files unless the paths (in the json file) are explicitly provided as an input 
-    // to the process. 
-    // This is not an issue in the case of Snakemake, as the working directory doesn't automatically change between different rules.
+    // The paths in the kratos input file are relative, they are resolved when the simulation is run
+    // (see run_kratos_simulation.py). The input files can therefore be staged into the work directory
+    // of the simulation process, and input generation and simulation are cached independently.
 
+    tag "${configuration}"
     publishDir "${params.result_dir}/${params.tool}/"
     conda './kratos/environment_simulation.yml'
+    memory { "${params.cost_estimates[configuration]?.steps?.create_kratos_input?.memory_mb ?: 1000} MB" }
+    cpus { params.cost_estimates[configuration]?.steps?.create_kratos_input?.cpus ?: 1 }
     
     input:
-    path script_create_kratos_input
-    path script_run_kratos
+    path python_script
     tuple val(configuration), path(parameters), path(mdpa)
     path kratos_input_template
     path kratos_material_template
     
     output:
-    tuple val(configuration), path("ProjectParameters_${configuration}.json"), path("MaterialParameters_${configuration}.json"), path("${configuration}/Structure_0_1.vtk")
+    tuple val(configuration), path("ProjectParameters_${configuration}.json"), path("MaterialParameters_${configuration}.json")
     
     script:
     """
-    python3 ${script_create_kratos_input} \
+    python3 ${projectDir}/artifact_cache.py --cache_dir ${params.artifact_cache} --key create_kratos_input --hit_marker .artifact_cache_hit --env ${projectDir}/kratos/environment_simulation.yml \
+        --inputs ${parameters} ${mdpa} ${kratos_input_template} ${kratos_material_template} ${python_script} \
+        --outputs ProjectParameters_${configuration}.json MaterialParameters_${configuration}.json -- \
+    python3 ${python_script} \
         --input_parameter_file ${parameters} \
         --input_mdpa_file ${mdpa} \
         --input_kratos_input_template ${kratos_input_template} \
         --input_material_template ${kratos_material_template} \
         --output_kratos_inputfile ProjectParameters_${configuration}.json \
         --output_kratos_materialfile MaterialParameters_${configuration}.json
+    """
+}
 
-    python3 ${script_run_kratos} \
+process run_kratos_simulation {
+    tag "${configuration}"
+    publishDir "${params.result_dir}/${params.tool}/"
+    conda './kratos/environment_simulation.yml'
+    memory { "${params.cost_estimates[configuration]?.steps?.run_kratos_simulation?.memory_mb ?: 1000} MB" }
+    cpus { params.cost_estimates[configuration]?.steps?.run_kratos_simulation?.cpus ?: 1 }
+    
+    input:
+    path python_script
+    tuple val(configuration), path(parameters), path(mdpa), path(kratos_inputfile), path(kratos_materialfile)
+    
+    output:
+    tuple val(configuration), path("${configuration}/Structure_0_1.vtk")
+    
+    script:
+    """
+    python3 ${projectDir}/artifact_cache.py --cache_dir ${params.artifact_cache} --key run_kratos_simulation --hit_marker .artifact_cache_hit --env ${projectDir}/kratos/environment_simulation.yml \
+        --inputs ${parameters} ${mdpa} ${kratos_inputfile} ${kratos_materialfile} ${python_script} \
+        --outputs ${configuration}/Structure_0_1.vtk -- \
+    python3 ${python_script} \
         --input_parameter_file ${parameters} \
-        --input_kratos_inputfile "ProjectParameters_${configuration}.json" \
-        --input_kratos_materialfile "MaterialParameters_${configuration}.json"
+        --input_kratos_inputfile ${kratos_inputfile} \
+        --input_kratos_materialfile ${kratos_materialfile} \
+        --input_mdpa_file ${mdpa} \
+        --output_result_dir ${configuration}
     """
 }
 
 process postprocess_kratos_results {
+    tag "${configuration}"
     publishDir "${params.result_dir}/${params.tool}/"
     conda './kratos/environment_simulation.yml'
+    memory { "${params.cost_estimates[configuration]?.steps?.postprocess_kratos_results?.memory_mb ?: 1000} MB" }
+    cpus { params.cost_estimates[configuration]?.steps?.postprocess_kratos_results?.cpus ?: 1 }
     
     input:
     path python_script
@@ -72,6 +105,8 @@ process postprocess_kratos_results {
     
     script:
     """
+    python3 ${projectDir}/artifact_cache.py --cache_dir ${params.artifact_cache} --key postprocess_kratos_results --hit_marker .artifact_cache_hit --env ${projectDir}/kratos/environment_simulation.yml \
+        --inputs ${python_script} ${parameter_file} ${result_vtk} --outputs solution_field_data_${configuration}.zip solution_metrics_${configuration}.json -- \
     python3 ${python_script} \
         --input_parameter_file ${parameter_file} \
         --input_result_vtk ${result_vtk} \
@@ -80,6 +115,39 @@ process postprocess_kratos_results {
     """
 }
 
+process run_kratos_pipeline {
+    // mesh conversion, input generation, simulation and postprocessing of a small configuration in one task
+    tag "${configuration}"
+    publishDir "${params.result_dir}/${params.tool}/"
+    conda './kratos/environment_simulation.yml'
+    memory { "${params.cost_estimates[configuration]?.steps?.run_kratos_pipeline?.memory_mb ?: 1000} MB" }
+    cpus { params.cost_estimates[configuration]?.steps?.run_kratos_pipeline?.cpus ?: 1 }
+
+    input:
+    path python_script
+    path step_scripts
+    tuple val(configuration), path(parameter_file), path(mesh_file)
+    path kratos_input_template
+    path kratos_material_template
+
+    output:
+    tuple val(configuration), path("solution_field_data_${configuration}.zip"), path("solution_metrics_${configuration}.json")
+
+    script:
+    """
+    python3 ${projectDir}/artifact_cache.py --cache_dir ${params.artifact_cache} --key run_kratos_pipeline --hit_marker .artifact_cache_hit --env ${projectDir}/kratos/environment_simulation.yml \
+        --inputs ${parameter_file} ${mesh_file} ${kratos_input_template} ${kratos_material_template} ${python_script} ${step_scripts} \
+        --outputs solution_field_data_${configuration}.zip solution_metrics_${configuration}.json -- \
+    python3 ${python_script} \
+        --input_parameter_file ${parameter_file} \
+        --input_mesh_file ${mesh_file} \
+        --input_kratos_input_template ${kratos_input_template} \
+        --input_material_template ${kratos_material_template} \
+        --output_solution_file_zip solution_field_data_${configuration}.zip \
+        --output_metrics_file solution_metrics_${configuration}.json
+    """
+}
+
 workflow kratos_workflow {
     take:
     mesh_data // tuple(configuration, parameters, mesh)  //change the name
@@ -98,26 +166,43 @@ workflow kratos_workflow {
     kratos_input_template = Channel.value(file('kratos/input_template.json'))
     kratos_material_template = Channel.value(file('kratos/StructuralMaterials_template.json'))
     
-    // Process pipeline
-    output_process_mesh_to_mdpa = mesh_to_mdpa(msh_to_mdpa_script, mesh_data)
+    // For small configurations (element-size >= params.fused_min_element_size), the scheduling and startup
+    // overhead of the individual steps exceeds their work, all steps run in one task (run_kratos_pipeline).
+    // Larger configurations run the steps as separate tasks.
+    mesh_data_by_size = mesh_data.branch { configuration, parameter_file, mesh_file ->
+        fused: new groovy.json.JsonSlurper().parse(parameter_file.toFile())["element-size"]["value"] >= params.fused_min_element_size
+        split: true
+    }
+    output_process_run_kratos_pipeline = run_kratos_pipeline(
+        Channel.value(file('kratos/run_kratos_pipeline.py')),
+        Channel.value([file('kratos/msh_to_mdpa.py'), file('kratos/create_kratos_input.py'), file('kratos/run_kratos_simulation.py'), file('kratos/postprocess_results.py'), file('plateWithHoleSolution.py')]),
+        mesh_data_by_size.fused,
+        kratos_input_template,
+        kratos_material_template
+    )
+
+    // Process pipeline of the larger configurations
+    output_process_mesh_to_mdpa = mesh_to_mdpa(msh_to_mdpa_script, mesh_data_by_size.split)
     
-    input_process_create_kratos_input = mesh_data.join(output_process_mesh_to_mdpa).map { tuple(it[0], it[1], it[3]) }
+    input_process_create_kratos_input = mesh_data_by_size.split.join(output_process_mesh_to_mdpa).map { tuple(it[0], it[1], it[3]) }
 
-    //input_process_create_kratos_input.view()
-    output_create_kratos_input_and_run_simulation = create_kratos_input_and_run_simulation(
+    output_process_create_kratos_input = create_kratos_input(
         create_input_script,
-        run_sim_script,
         input_process_create_kratos_input,
         kratos_input_template,
         kratos_material_template
     )
+
+    // tuple(configuration, parameters, mdpa, kratos input file, kratos material file)
+    input_process_run_kratos_simulation = input_process_create_kratos_input.join(output_process_create_kratos_input)
+    output_process_run_kratos_simulation = run_kratos_simulation(run_sim_script, input_process_run_kratos_simulation)
   
-    input_process_postprocess_kratos_results = mesh_data.join(output_create_kratos_input_and_run_simulation).map { tuple(it[0], it[1], it[5]) }
+    input_process_postprocess_kratos_results = mesh_data_by_size.split.join(output_process_run_kratos_simulation).map { tuple(it[0], it[1], it[3]) }
 
 
     output_process_postprocess_kratos_results = postprocess_kratos_results(postprocess_script,input_process_postprocess_kratos_results)
     
     emit:
-    output_process_postprocess_kratos_results
+    output_process_postprocess_kratos_results.mix(output_process_run_kratos_pipeline)
 }
 
@@ -1,6 +1,5 @@
 import json
 import pyvista
-from pathlib import Path
 import zipfile
 from argparse import ArgumentParser
 
@@ -0,0 +1,78 @@
+import json
+import os
+import tempfile
+from argparse import ArgumentParser
+
+from msh_to_mdpa import msh_to_mdpa
+from create_kratos_input import create_kratos_input
+from run_kratos_simulation import run_kratos_simulation
+from postprocess_results import postprocess_results
+
+
+def run_kratos_pipeline(
+    parameter_file: str,
+    mesh_file: str,
+    kratos_input_template_file: str,
+    kratos_material_template_file: str,
+    metrics_file: str,
+    solution_file_zip: str,
+    work_dir: str | None = None,
+) -> None:
+    """
+    Runs the kratos steps of a configuration (mesh conversion, input generation, simulation and
+    postprocessing) in one process. For small configurations, the work of the individual steps
+    is less than the overhead of running them as separate jobs (scheduling, activation of the
+    conda environment, python and Kratos startup). The intermediate files are written to
+    `work_dir` (default: a temporary directory that is removed afterwards).
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        work_dir = work_dir or tmp_dir
+        os.makedirs(work_dir, exist_ok=True)
+        with open(parameter_file) as f:
+            configuration = json.load(f)["configuration"]
+        mdpa_file = os.path.join(work_dir, f"mesh_{configuration}.mdpa")
+        kratos_input_file = os.path.join(work_dir, f"ProjectParameters_{configuration}.json")
+        kratos_material_file = os.path.join(work_dir, f"MaterialParameters_{configuration}.json")
+        result_dir = os.path.join(work_dir, configuration)
+
+        msh_to_mdpa(parameter_file, mesh_file, mdpa_file)
+        create_kratos_input(
+            parameter_file=parameter_file,
+            mdpa_file=mdpa_file,
+            kratos_input_template_file=kratos_input_template_file,
+            kratos_material_template_file=kratos_material_template_file,
+            kratos_input_file=kratos_input_file,
+            kratos_material_file=kratos_material_file,
+        )
+        run_kratos_simulation(kratos_input_file, kratos_material_file, mdpa_file, result_dir)
+        postprocess_results(
+            parameter_file,
+            os.path.join(result_dir, "Structure_0_1.vtk"),
+            metrics_file,
+            solution_file_zip,
+        )
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        description="Run mesh conversion, input generation, simulation and postprocessing of Kratos\n"
+        "for one configuration in a single process (used for small configurations)."
+    )
+    parser.add_argument("--input_parameter_file", required=True, help="JSON file containing simulation parameters (input)")
+    parser.add_argument("--input_mesh_file", required=True, help="Path to the mesh file (input)")
+    parser.add_argument("--input_kratos_input_template", required=True, help="Path to the kratos input template file (input)")
+    parser.add_argument("--input_material_template", required=True, help="Path to the kratos material template file (input)")
+    parser.add_argument("--output_solution_file_zip", required=True, help="Path to the zipped solution files (output)")
+    parser.add_argument("--output_metrics_file", required=True, help="Path to the metrics JSON file (output)")
+    parser.add_argument("--output_work_dir", default=None, help="Directory of the intermediate files (default: temporary directory)")
+    args, _ = parser.parse_known_args()
+
+    run_kratos_pipeline(
+        args.input_parameter_file,
+        args.input_mesh_file,
+        args.input_kratos_input_template,
+        args.input_material_template,
+        args.output_metrics_file,
+        args.output_solution_file_zip,
+        args.output_work_dir,
+    )
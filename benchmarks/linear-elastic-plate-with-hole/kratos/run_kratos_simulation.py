@@ -1,30 +1,85 @@
 from __future__ import print_function, absolute_import, division  # makes KratosMultiphysics backward compatible with python 2.6 and 2.7
 import json
-import sys
+import os
 from argparse import ArgumentParser
 
-import gmsh
-import meshio
-import re
-from pint import UnitRegistry
-import numpy as np
-import os
 
-ureg = UnitRegistry()
+def resolve_kratos_paths(
+    project_parameters: dict,
+    kratos_input_file: str,
+    mdpa_file: str | None = None,
+    kratos_material_file: str | None = None,
+    output_dir: str | None = None,
+) -> dict:
+    """
+    The kratos input file written by create_kratos_input.py contains relative paths (mesh,
+    material file and output directory). They are resolved at run time, either from the
+    files passed explicitly (e.g. the staged files of a Nextflow task) or relative to the
+    directory of the kratos input file.
+    """
+    base_dir = os.path.dirname(os.path.abspath(kratos_input_file))
+
+    def resolve(path):
+        return path if os.path.isabs(path) else os.path.join(base_dir, path)
+
+    solver_settings = project_parameters["solver_settings"]
+    model_import_settings = solver_settings["model_import_settings"]
+    if mdpa_file is not None:
+        model_import_settings["input_filename"] = os.path.splitext(os.path.abspath(mdpa_file))[0]
+    else:
+        model_import_settings["input_filename"] = resolve(model_import_settings["input_filename"])
+
+    material_import_settings = solver_settings["material_import_settings"]
+    if kratos_material_file is not None:
+        material_import_settings["materials_filename"] = os.path.abspath(kratos_material_file)
+    else:
+        material_import_settings["materials_filename"] = resolve(material_import_settings["materials_filename"])
 
-import KratosMultiphysics
-from KratosMultiphysics.StructuralMechanicsApplication.structural_mechanics_analysis import StructuralMechanicsAnalysis
-import sys
+    for vtk_output in project_parameters["output_processes"]["vtk_output"]:
+        vtk_parameters = vtk_output["Parameters"]
+        if output_dir is not None:
+            vtk_parameters["output_path"] = os.path.abspath(output_dir)
+        else:
+            vtk_parameters["output_path"] = resolve(vtk_parameters["output_path"])
+        os.makedirs(vtk_parameters["output_path"], exist_ok=True)
+    return project_parameters
 
-import pyvista
-from pathlib import Path
+
+def run_kratos_simulation(
+    kratos_input_file: str,
+    kratos_material_file: str,
+    mdpa_file: str | None = None,
+    output_dir: str | None = None,
+) -> None:
+    """Runs the Kratos simulation of a kratos input file written by create_kratos_input.py."""
+    # Kratos is imported here (not at module level), it dominates the startup time of the
+    # script and of run_kratos_pipeline.py, whose mesh conversion and input generation do
+    # not need it
+    import KratosMultiphysics
+    from KratosMultiphysics.StructuralMechanicsApplication.structural_mechanics_analysis import (
+        StructuralMechanicsAnalysis,
+    )
+
+    with open(kratos_input_file, "r") as kratos_input:
+        project_parameters = resolve_kratos_paths(
+            json.load(kratos_input),
+            kratos_input_file,
+            mdpa_file,
+            kratos_material_file,
+            output_dir,
+        )
+    parameters = KratosMultiphysics.Parameters(json.dumps(project_parameters))
+
+    model = KratosMultiphysics.Model()
+    simulation = StructuralMechanicsAnalysis(model, parameters)
+    simulation.Run()
 
 
 if __name__ == "__main__":
     parser = ArgumentParser(
-        description="Run FEniCS simulation for a plate with a hole.\n"
-        "Inputs: --input_parameter_file, --input_kratos_inputfile, --input_kratos_materialfile\n"
-        "Outputs: --output_solution_file_zip, --output_metrics_file"
+        description="Run Kratos simulation for a plate with a hole.\n"
+        "Inputs: --input_parameter_file, --input_kratos_inputfile, --input_kratos_materialfile, --input_mdpa_file\n"
+        "Outputs: --output_result_dir"
     )
     parser.add_argument(
         "--input_parameter_file",
@@ -41,11 +96,21 @@ if __name__ == "__main__":
         required=True,
         help="Path to the kratos material file (input)",
     )
+    parser.add_argument(
+        "--input_mdpa_file",
+        default=None,
+        help="Path to the MDPA mesh file (input), default: relative to the kratos input file",
+    )
+    parser.add_argument(
+        "--output_result_dir",
+        default=None,
+        help="Directory of the vtk results (output), default: relative to the kratos input file",
+    )
     args, _ = parser.parse_known_args()
 
-    with open(args.input_kratos_inputfile, "r") as kratos_input:
-        parameters = KratosMultiphysics.Parameters(kratos_input.read())
-
-    model = KratosMultiphysics.Model()
-    simulation = StructuralMechanicsAnalysis(model, parameters)
-    simulation.Run()
\ No newline at end of file
+    run_kratos_simulation(
+        args.input_kratos_inputfile,
+        args.input_kratos_materialfile,
+        args.input_mdpa_file,
+        args.output_result_dir,
+    )
@@ -3,9 +3,12 @@ include { fenics_workflow } from './fenics/fenics.nf'
 include { kratos_workflow } from './kratos/kratos.nf'
 
 process create_mesh {
+    tag "${configuration}"
     //publishDir "$result_dir/mesh/"
     publishDir "${params.result_dir}/mesh/"
     conda 'environment_mesh.yml'
+    memory { "${params.cost_estimates[configuration]?.steps?.create_mesh?.memory_mb ?: 1000} MB" }
+    cpus { params.cost_estimates[configuration]?.steps?.create_mesh?.cpus ?: 1 }
 
     input:
     path python_script
@@ -18,6 +21,8 @@ process create_mesh {
 
     script:
     """ 
+    python3 ${projectDir}/artifact_cache.py --cache_dir ${params.artifact_cache} --key create_mesh --hit_marker .artifact_cache_hit --env ${projectDir}/environment_mesh.yml \
+        --inputs $python_script $parameter_file --outputs "mesh_${configuration}.msh" -- \
     python3 $python_script --input_parameter_file $parameter_file --output_mesh_file "mesh_${configuration}.msh"
     """
 }
@@ -53,6 +58,74 @@ process summary{
     """
 }
 
+process create_field_store {
+    // the zipped VTK files of a configuration converted into a chunked, compressed HDF5 file
+    tag "${configuration}"
+    publishDir "${params.result_dir}/${tool}/"
+    conda 'environment_postprocessing.yml'
+
+    input:
+    path python_script
+    tuple val(tool), val(configuration), path(parameter_file), path(solution_field_data)
+
+    output:
+    tuple val(tool), val(configuration), path(parameter_file), path("solution_field_data_${configuration}.h5")
+
+    script:
+    """
+    python3 $python_script \
+        --input_parameter_file $parameter_file \
+        --input_solution_field_data $solution_field_data \
+        --output_field_store "solution_field_data_${configuration}.h5"
+    """
+}
+
+process probe_results {
+    // fields along the hole boundary and the symmetry lines, next to the metrics of each configuration
+    tag "${configuration}"
+    publishDir "${params.result_dir}/${tool}/"
+    conda 'environment_postprocessing.yml'
+
+    input:
+    path python_script
+    tuple val(tool), val(configuration), path(parameter_file), path(field_store)
+
+    output:
+    path("probes_${configuration}.json")
+
+    script:
+    """
+    python3 $python_script \
+        --input_parameter_file $parameter_file \
+        --input_solution_field_data $field_store \
+        --output_probe_file "probes_${configuration}.json"
+    """
+}
+
+process compare_tools {
+    // difference norms of the FEniCS and Kratos fields on the nodes of the Kratos mesh
+    tag "${configuration}"
+    publishDir "${params.result_dir}/comparison/"
+    conda 'environment_postprocessing.yml'
+
+    input:
+    path python_script
+    tuple val(configuration), path(parameter_file), path(fenics_solution_field_data), path(kratos_solution_field_data)
+
+    output:
+    path("comparison_${configuration}.json")
+
+    script:
+    """
+    python3 $python_script \
+        --input_parameter_file $parameter_file \
+        --input_solution_field_data_fenics $fenics_solution_field_data \
+        --input_solution_field_data_kratos $kratos_solution_field_data \
+        --input_cache_dir ${params.transfer_cache} \
+        --output_comparison_file "comparison_${configuration}.json"
+    """
+}
+
 
 def prepare_inputs_for_process_summary(input_process_run_simulation, output_process_run_simulation) {
 
@@ -147,6 +220,22 @@ workflow {
             ch_benchmark, \
             ch_tools)
 
+    //Converting the result fields into field stores (HDF5)
+    def ch_field_store_python_script = Channel.value(file('create_field_store.py'))
+    input_create_field_store = input_fenics_workflow.join(output_fenics_workflow).map{ c, p, _m, z, _metrics -> tuple('fenics', c, p, z) }
+        .mix(input_kratos_workflow.join(output_kratos_workflow).map{ c, p, _m, z, _metrics -> tuple('kratos', c, p, z) })
+    field_stores = create_field_store(ch_field_store_python_script, input_create_field_store)
+
+    //Probing the result fields
+    def ch_probe_python_script = Channel.value(file('probe_results.py'))
+    probe_results(ch_probe_python_script, field_stores)
+
+    //Comparing the tools
+    def ch_compare_python_script = Channel.value(file('compare_tools.py'))
+    input_compare_tools = field_stores.filter{ it[0] == 'fenics' }.map{ _t, c, p, h5 -> tuple(c, p, h5) }
+        .join(field_stores.filter{ it[0] == 'kratos' }.map{ _t, c, _p, h5 -> tuple(c, h5) })
+    compare_tools(ch_compare_python_script, input_compare_tools)
+
 }
 
 // Steps to perform to add a new simulation tool to the workflow:
@@ -0,0 +1,81 @@
+import json
+from argparse import ArgumentParser
+
+
+def _solver_statistics(metrics_file: str) -> dict:
+    """Peak memory, solve times and iterations (slowest rank) and the solver settings from a metrics file."""
+    with open(metrics_file) as f:
+        metrics = json.load(f)
+    performance = metrics["performance"]
+    phases = performance["phases"]
+    counters = performance["counters"]
+    return {
+        "peak_rss_mb": performance["peak_rss_mb"]["max"],
+        "assembly_time": phases["solve/assembly"]["max"],
+        "ksp_solve_time": phases["solve/ksp_solve"]["max"],
+        "iterations": counters["solver_iterations"]["max"],
+        "matrix_nonzeros": counters.get("matrix_nonzeros", {}).get("sum", 0),
+        # solver, preconditioner and tolerances, the iterations and times depend on them
+        "solver": metrics.get("solver", {}),
+    }
+
+
+def matrix_free_report(
+    parameter_files: list[str],
+    assembled_metrics_files: list[str],
+    matrix_free_metrics_files: list[str],
+    report_file: str,
+) -> None:
+    """
+    Compares the peak memory and the times of assembly and solve of the runs with the assembled
+    stiffness matrix with those of the matrix-free runs. The solvers stop at different relative
+    tolerances (see the solver settings of each run in the report).
+    """
+    configurations = []
+    for parameter_file, assembled_metrics, matrix_free_metrics in zip(
+        parameter_files, assembled_metrics_files, matrix_free_metrics_files
+    ):
+        with open(parameter_file) as f:
+            parameters = json.load(f)
+        configurations.append(
+            {
+                "configuration": parameters["configuration"],
+                "element-size": parameters["element-size"],
+                "element-degree": parameters["element-degree"],
+                "assembled": _solver_statistics(assembled_metrics),
+                "matrix_free": _solver_statistics(matrix_free_metrics),
+            }
+        )
+
+    print(f"{'configuration':>15} {'peak RSS MB (assembled)':>24} {'peak RSS MB (matrix-free)':>26} {'solve s (assembled)':>20} {'solve s (matrix-free)':>22}")
+    for c in configurations:
+        assembled, matrix_free = c["assembled"], c["matrix_free"]
+        print(
+            f"{c['configuration']:>15} {assembled['peak_rss_mb']:>24.1f} {matrix_free['peak_rss_mb']:>26.1f}"
+            f" {assembled['assembly_time'] + assembled['ksp_solve_time']:>20.3f}"
+            f" {matrix_free['assembly_time'] + matrix_free['ksp_solve_time']:>22.3f}"
+        )
+    for mode in ("assembled", "matrix_free"):
+        solver = configurations[0][mode]["solver"] if configurations else {}
+        if solver:
+            print(f"{mode}: {solver['ksp_type']} ({solver['pc_type']}), rtol {solver['ksp_rtol']:g}, atol {solver['ksp_atol']:g}")
+    with open(report_file, "w") as f:
+        json.dump({"configurations": configurations}, f, indent=4)
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        description="Compare peak memory and solve times of the assembled and the matrix-free solver."
+    )
+    parser.add_argument("--input_parameter_file", nargs="+", required=True, help="JSON files of the configurations (input)")
+    parser.add_argument("--input_solution_metrics_assembled", nargs="+", required=True, help="Metrics files of the runs with the assembled matrix (input)")
+    parser.add_argument("--input_solution_metrics_matrix_free", nargs="+", required=True, help="Metrics files of the matrix-free runs (input)")
+    parser.add_argument("--output_report_file", required=True, help="Path to the report JSON file (output)")
+    args, _ = parser.parse_known_args()
+
+    matrix_free_report(
+        args.input_parameter_file,
+        args.input_solution_metrics_assembled,
+        args.input_solution_metrics_matrix_free,
+        args.output_report_file,
+    )
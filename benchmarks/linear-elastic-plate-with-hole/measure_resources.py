@@ -0,0 +1,69 @@
+import resource
+import subprocess
+import sys
+import time
+from argparse import ArgumentParser, REMAINDER
+
+# columns of the benchmark files written by snakemake's benchmark directive
+BENCHMARK_COLUMNS = [
+    "s",
+    "h:m:s",
+    "max_rss",
+    "max_vms",
+    "max_uss",
+    "max_pss",
+    "io_in",
+    "io_out",
+    "mean_load",
+    "cpu_time",
+]
+
+
+def measure_resources(command: list[str], benchmark_file: str) -> int:
+    """
+    Runs `command` and writes its wall time, cpu time, peak RSS and I/O to `benchmark_file`
+    in the format of snakemake's benchmark files, so that workflows that have no benchmark
+    directive (e.g. Nextflow) produce the same records.
+
+    The peak RSS is the maximum over all (waited for) child processes, i.e. for an MPI run the
+    peak memory of the largest rank. Columns that cannot be measured with getrusage are NA.
+    """
+    start = time.perf_counter()
+    returncode = subprocess.call(command)
+    wall_time = time.perf_counter() - start
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+
+    hours, remainder = divmod(int(wall_time), 3600)
+    minutes, seconds = divmod(remainder, 60)
+    record = {
+        "s": f"{wall_time:.4f}",
+        "h:m:s": f"{hours}:{minutes:02d}:{seconds:02d}",
+        # ru_maxrss is reported in kilobytes on Linux
+        "max_rss": f"{usage.ru_maxrss / 1024:.2f}",
+        # block operations are counted in units of 512 bytes
+        "io_in": f"{usage.ru_inblock * 512 / 1024**2:.2f}",
+        "io_out": f"{usage.ru_oublock * 512 / 1024**2:.2f}",
+        "cpu_time": f"{usage.ru_utime + usage.ru_stime:.2f}",
+    }
+    with open(benchmark_file, "w") as f:
+        f.write("\t".join(BENCHMARK_COLUMNS) + "\n")
+        f.write("\t".join(record.get(column, "NA") for column in BENCHMARK_COLUMNS) + "\n")
+    return returncode
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        description="Run a command and record its resource usage in a snakemake-style benchmark file.\n"
+        "Usage: measure_resources.py --output_benchmark_file file.tsv -- command [args ...]"
+    )
+    parser.add_argument(
+        "--output_benchmark_file",
+        required=True,
+        help="Path to the benchmark file (tsv) with the resource usage (output)",
+    )
+    parser.add_argument("command", nargs=REMAINDER, help="Command to run")
+    args = parser.parse_args()
+    command = args.command[1:] if args.command[:1] == ["--"] else args.command
+    if not command:
+        parser.error("no command given")
+    sys.exit(measure_resources(command, args.output_benchmark_file))
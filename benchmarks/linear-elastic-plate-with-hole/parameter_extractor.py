@@ -1,9 +1,34 @@
 import json
 import os
+import sys
+from functools import cache
+from pathlib import Path
 from snakemake_report_plugin_metadata4ing.interfaces import (
     ParameterExtractorInterface,
 )
 
+BENCHMARK_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCHMARK_DIR))
+from resource_usage import read_snakemake_benchmark, usage_to_properties
+
+
+@cache
+def _benchmark_name() -> str:
+    """Name of the benchmark, read once from the workflow config next to this module."""
+    with open(BENCHMARK_DIR / "workflow_config.json") as f:
+        return json.load(f)["benchmark"]
+
+
+def benchmark_file(rule_name: str, configuration: str) -> str:
+    """
+    Location of the benchmark file of a rule for a configuration
+    (see the benchmark directive of the rules in the Snakefiles).
+    """
+    return str(
+        BENCHMARK_DIR / "snakemake_results" / _benchmark_name() / "benchmarks" / f"{rule_name}_{configuration}.tsv"
+    )
+
+
 class ParameterExtractor(ParameterExtractorInterface):
     def extract_params(self, rule_name: str, file_path: str) -> dict:
         results = {}
@@ -31,7 +56,19 @@ class ParameterExtractor(ParameterExtractorInterface):
                         "json-path": f"/{key}",
                         "data-type": self._get_type(val),
                     }})
-        elif (
+        if file_name.startswith("parameters_") and file_name.endswith(".json"):
+            # resource usage (wall time, cpu time, peak RSS, I/O) of the rule for this
+            # configuration, recorded by snakemake's benchmark directive
+            with open(file_path) as f:
+                configuration = json.load(f)["configuration"]
+            rule_benchmark_file = benchmark_file(rule_name, configuration)
+            # the runtime of a rule restored from the artifact cache is the time of the lookup
+            usage = read_snakemake_benchmark(rule_benchmark_file) if os.path.isfile(rule_benchmark_file) else None
+            if usage is not None and not usage["cache_hit"]:
+                results.setdefault(rule_name, {}).setdefault("investigates", []).extend(
+                    usage_to_properties(usage)
+                )
+        if (
             file_name.startswith("solution_")
             and file_name.endswith(".json")
             and (rule_name.startswith("postprocess_") or rule_name.startswith("run_"))
@@ -0,0 +1,105 @@
+import resource
+import threading
+import time
+from contextlib import contextmanager
+
+
+class PerformanceMonitor:
+    """
+    Collects the wall time of (nested) phases, counters like the number of cells or DOFs and
+    the peak memory of a simulation run.
+
+    Phases are timed with the context manager `phase`. Nested phases are stored with their
+    full path, e.g. "solve/assembly", and repeated phases are accumulated.
+    In parallel runs, each rank collects its own data which is reduced with `reduce`.
+    Phases can also be timed in other threads (e.g. output written in the background), each
+    thread has its own stack of nested phases. The phases of different threads overlap, so
+    their sum can exceed the wall time of the run.
+
+    Example:
+        monitor = PerformanceMonitor()
+        with monitor.phase("solve"):
+            with monitor.phase("assembly"):
+                ...
+        monitor.count("dofs", V.dofmap.index_map.size_local)
+        performance = monitor.reduce(MPI.COMM_WORLD)
+    """
+
+    def __init__(self) -> None:
+        self.phases = {}
+        self.counters = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @property
+    def _stack(self) -> list[str]:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextmanager
+    def phase(self, name: str):
+        stack = self._stack
+        stack.append(name)
+        path = "/".join(stack)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.phases[path] = self.phases.get(path, 0.0) + elapsed
+            stack.pop()
+
+    def count(self, name: str, value: int | float) -> None:
+        self.counters[name] = value
+
+    @staticmethod
+    def peak_rss() -> float:
+        """Peak resident set size of this process in MB (ru_maxrss is given in kB on Linux)."""
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    def reduce(self, comm=None) -> dict:
+        """
+        Reduces the data of all ranks of the MPI communicator `comm` (collective call) to
+        min/max/mean statistics. For counters, the sum over all ranks is added, e.g. the global
+        number of DOFs if the counter holds the number of owned DOFs.
+        Phases that were only executed on some ranks (e.g. writing a file on rank 0) are reduced
+        over these ranks.
+        """
+        local = {
+            "phases": self.phases,
+            "counters": self.counters,
+            "peak_rss_mb": self.peak_rss(),
+        }
+        all_ranks = comm.allgather(local) if comm is not None else [local]
+
+        def statistics(values):
+            return {
+                "min": min(values),
+                "max": max(values),
+                "mean": sum(values) / len(values),
+            }
+
+        def reduce_dicts(key):
+            names = []
+            for rank_data in all_ranks:
+                names.extend(name for name in rank_data[key] if name not in names)
+            return {
+                name: [rank_data[key][name] for rank_data in all_ranks if name in rank_data[key]]
+                for name in names
+            }
+
+        counters = {}
+        for name, values in reduce_dicts("counters").items():
+            counters[name] = statistics(values)
+            counters[name]["sum"] = sum(values)
+
+        return {
+            "num_processes": len(all_ranks),
+            "phases": {
+                name: statistics(values) for name, values in reduce_dicts("phases").items()
+            },
+            "counters": counters,
+            "peak_rss_mb": statistics([rank_data["peak_rss_mb"] for rank_data in all_ranks]),
+        }
@@ -1,36 +1,110 @@
 import os
 import argparse
-from rdflib import Graph
-import matplotlib.pyplot as plt
+import hashlib
+import json
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from rdflib import Dataset, Graph, URIRef
 from collections import defaultdict
-from generate_config import workflow_config
+from generate_config import TOOLS
 
-def load_graphs(base_dir):
+def _file_hash(file_path):
+    """sha256 of the file content, used as key of the parse cache."""
+    sha256 = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def _parse_to_cache(file_path, cache_file):
+    """
+    Parses a JSON-LD file and stores its triples as N-Triples in `cache_file` and its namespace
+    prefixes in `cache_file`.ns.json (N-Triples has no prefixes, but the query relies on them).
+    Runs in a worker process, the graph itself is not returned to avoid pickling it.
+    """
+    try:
+        g = Graph()
+        g.parse(file_path, format='json-ld')
+        tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+        g.serialize(destination=tmp_file, format='nt', encoding='utf-8')
+        with open(f"{cache_file}.ns.json", "w") as f:
+            json.dump({prefix: str(namespace) for prefix, namespace in g.namespaces()}, f)
+        os.replace(tmp_file, cache_file)
+        return None
+    except Exception as e:
+        return str(e)
+
+
+def load_graphs(base_dir, cache_dir=".provenance_cache", processes=None):
     """
-    Walk through the base_dir and load all JSON-LD files into rdflib Graphs.
+    Walk through the base_dir and load all JSON-LD files into an rdflib Dataset, each file into
+    its own named graph (identified by the file URI), such that the query does not mix up the
+    processing steps of different files.
+
+    Parsing JSON-LD is slow, therefore the files are parsed in a process pool and the triples
+    are cached as N-Triples in `cache_dir`, keyed by the sha256 of the file. Files that did not
+    change are never parsed again, their triples are read from the cache.
     """
-    graph_list = []
+    file_paths = []
     for root, _, files in os.walk(base_dir):
         for file in files:
             if file.endswith(".jsonld"):
-                file_path = os.path.join(root, file)
-                try:
-                    g = Graph()
-                    g.parse(file_path, format='json-ld')
-                    graph_list.append(g)
+                file_paths.append(os.path.join(root, file))
+
+    os.makedirs(cache_dir, exist_ok=True)
+    cache_files = {
+        file_path: os.path.join(cache_dir, f"{_file_hash(file_path)}.nt") for file_path in file_paths
+    }
+    uncached = [file_path for file_path in file_paths if not os.path.isfile(cache_files[file_path])]
+    failed = set()
+    if uncached:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            errors = executor.map(
+                _parse_to_cache, uncached, [cache_files[file_path] for file_path in uncached]
+            )
+            for file_path, error in zip(uncached, errors):
+                if error is None:
                     print(f"✅ Parsed: {file_path}")
-                except Exception as e:
-                    print(f"❌ Failed to parse {file_path}: {e}")
-    print(f"\nTotal graphs loaded: {len(graph_list)}")
-    return graph_list
-
-
-def query_and_build_table(graph_list):
+                else:
+                    print(f"❌ Failed to parse {file_path}: {error}")
+                    failed.add(file_path)
+
+    dataset = Dataset()
+    num_graphs = 0
+    for file_path in file_paths:
+        if file_path in failed:
+            continue
+        cache_file = cache_files[file_path]
+        dataset.graph(URIRef(Path(file_path).resolve().as_uri())).parse(cache_file, format='nt')
+        with open(f"{cache_file}.ns.json") as f:
+            for prefix, namespace in json.load(f).items():
+                dataset.bind(prefix, namespace, override=False)
+        num_graphs += 1
+    print(f"\nTotal graphs loaded: {num_graphs} ({len(file_paths) - len(uncached)} from cache)")
+    return dataset
+
+
+def _as_dataset(graph):
+    """A Dataset with `graph` as its only named graph (graphs loaded without load_graphs)."""
+    if isinstance(graph, Dataset):
+        return graph
+    dataset = Dataset()
+    named_graph = dataset.graph(graph.identifier)
+    named_graph += graph
+    for prefix, namespace in graph.namespaces():
+        dataset.bind(prefix, namespace, override=False)
+    return dataset
+
+
+def query_and_build_table(graphs, tools=TOOLS):
     """
-    Run SPARQL query on graphs and build a table.
+    Run SPARQL query on the named graphs of a Dataset (see load_graphs), a graph or a list of
+    graphs and build a table. The pattern is matched within each named graph, every processing
+    step of every file gives one row.
     Returns headers and table_data.
     """
-    tools = workflow_config["tools"]
+    graph_list = [graphs] if isinstance(graphs, Graph) else graphs
     filter_conditions = " || ".join(
         f'CONTAINS(LCASE(?tool_name), "{tool.lower()}")' for tool in tools
     )
@@ -38,8 +112,8 @@ def query_and_build_table(graph_list):
     PREFIX cr: <http://mlcommons.org/croissant/>
     PREFIX sio: <http://semanticscience.org/resource/>
 
-    SELECT DISTINCT ?value_element_size ?value_max_von_mises_stress_gauss_points ?tool_name
-    WHERE {{
+    SELECT ?g ?value_element_size ?value_max_von_mises_stress_gauss_points ?tool_name
+    WHERE {{ GRAPH ?g {{
       ?processing_step a schema:Action ;
             m4i:hasParameter ?element_size ;
             m4i:hasParameter ?element_order ;
@@ -67,7 +141,7 @@ def query_and_build_table(graph_list):
             rdfs:label ?tool_name .
             
       FILTER ({filter_conditions})
-    }}
+    }} }}
     """
 
     headers = [
@@ -79,7 +153,7 @@ def query_and_build_table(graph_list):
     table_data = []
 
     for g in graph_list:
-        results = g.query(query)
+        results = _as_dataset(g).query(query)
         for row in results:
             value_element_size = row.value_element_size
             value_max_von_mises_stress_gauss_points = row.value_max_von_mises_stress_gauss_points
@@ -101,6 +175,8 @@ def query_and_build_table(graph_list):
 
 def plot_element_size_vs_stress(headers, table_data, output_file="element_size_vs_stress.pdf"):
     """Plots element-size vs max-mises-stress grouped by tool and saves as PDF."""
+    # matplotlib is only imported when plotting, it takes longer to import than the rest
+    import matplotlib.pyplot as plt
 
     idx_element_size = headers.index("element-size")
     idx_stress = headers.index("max-mises-stress")
@@ -146,8 +222,10 @@ def plot_element_size_vs_stress(headers, table_data, output_file="element_size_v
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Process JSON-LD artifacts and display simulation results.")
     parser.add_argument("artifact_folder", type=str, help="Path to the folder containing unzipped artifacts")
+    parser.add_argument("--cache_dir", type=str, default=".provenance_cache", help="Directory of the cache of parsed JSON-LD files")
+    parser.add_argument("--processes", type=int, default=None, help="Number of processes used to parse the JSON-LD files (default: number of cores)")
     args = parser.parse_args()
 
-    graphs = load_graphs(args.artifact_folder)
-    headers, table_data = query_and_build_table(graphs)
+    graph = load_graphs(args.artifact_folder, args.cache_dir, args.processes)
+    headers, table_data = query_and_build_table(graph)
     plot_element_size_vs_stress(headers, table_data, output_file="element_size_vs_stress.pdf")
\ No newline at end of file
@@ -0,0 +1,72 @@
+import json
+from argparse import ArgumentParser
+
+import numpy as np
+from meshhelper.probe import Probe, sample_arc, sample_line
+
+
+def probe_lines(parameters: dict, points_per_line: int) -> dict:
+    """
+    Sampling lines of the plate (quarter of a plate of length L with a hole of radius r at the
+    origin): the hole boundary and the symmetry lines y = 0 and x = 0 between hole and edge.
+    """
+    from pint import UnitRegistry
+
+    ureg = UnitRegistry()
+    length = ureg.Quantity(parameters["length"]["value"], parameters["length"]["unit"]).to_base_units().magnitude
+    radius = ureg.Quantity(parameters["radius"]["value"], parameters["radius"]["unit"]).to_base_units().magnitude
+    return {
+        "hole_boundary": sample_arc((0.0, 0.0), radius, 0.0, np.pi / 2.0, points_per_line),
+        "symmetry_bottom": sample_line((radius, 0.0), (length, 0.0), points_per_line),
+        "symmetry_left": sample_line((0.0, radius), (0.0, length), points_per_line),
+    }
+
+
+def _to_list(values: np.ndarray) -> list:
+    """Values as nested lists with None for NaN (points outside of the mesh)."""
+    return np.where(np.isnan(values), None, values).tolist()
+
+
+def probe_results(
+    parameter_file: str, solution_field_data: str, probe_file: str, points_per_line: int = 200
+) -> None:
+    """
+    Evaluates all fields of a result (field store or zipped VTK files of FEniCS or Kratos) along the hole
+    boundary and the symmetry lines. The spatial index of the mesh is built once and all
+    points of all lines are evaluated in one batch.
+    """
+    with open(parameter_file) as f:
+        parameters = json.load(f)
+
+    lines = probe_lines(parameters, points_per_line)
+    probe = Probe.from_file(solution_field_data)
+    values = probe.evaluate(np.vstack(list(lines.values())))
+
+    result = {"configuration": parameters["configuration"], "lines": {}}
+    for index, (name, points) in enumerate(lines.items()):
+        line_slice = slice(index * points_per_line, (index + 1) * points_per_line)
+        result["lines"][name] = {
+            "coordinates": points[:, :2].tolist(),
+            "fields": {field: _to_list(field_values[line_slice]) for field, field_values in values.items()},
+        }
+    with open(probe_file, "w") as f:
+        json.dump(result, f, indent=4)
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        description="Evaluate the result fields of a configuration along the hole boundary and the\n"
+        "symmetry lines of the plate."
+    )
+    parser.add_argument("--input_parameter_file", required=True, help="JSON file containing simulation parameters (input)")
+    parser.add_argument("--input_solution_field_data", required=True, help="Path to the field store (.h5) or the zipped solution files (input)")
+    parser.add_argument("--input_points_per_line", type=int, default=200, help="Number of points per sampling line")
+    parser.add_argument("--output_probe_file", required=True, help="Path to the probe results JSON file (output)")
+    args, _ = parser.parse_known_args()
+
+    probe_results(
+        args.input_parameter_file,
+        args.input_solution_field_data,
+        args.output_probe_file,
+        args.input_points_per_line,
+    )
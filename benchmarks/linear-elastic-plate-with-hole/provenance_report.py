@@ -0,0 +1,76 @@
+import csv
+import io
+import subprocess
+import sys
+from argparse import ArgumentParser
+
+
+def stale_outputs(snakemake: list[str], snakemake_args: list[str]) -> list[tuple[str, str, str]]:
+    """
+    Returns the outputs of the workflow that would be (re)created by a workflow run as
+    (file, rule, status), using the summary of snakemake (`--summary`), which compares the
+    existing outputs with snakemake's metadata (.snakemake) without executing any job.
+    An output is stale if it is missing or older than its inputs, or if the code, parameters
+    or software environment of its rule changed.
+    """
+    result = subprocess.run(
+        snakemake + ["--summary"] + snakemake_args,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    # the summary is a tab separated table with the columns
+    # output_file, date, rule, log-file(s), input-file(s), shellcmd, status, plan
+    stale = []
+    for row in csv.DictReader(io.StringIO(result.stdout), delimiter="\t"):
+        if row.get("plan") and row["plan"] != "no update":
+            stale.append((row["output_file"], row.get("rule", ""), row.get("status", "")))
+    return stale
+
+
+def create_report(
+    snakemake: list[str], snakemake_args: list[str], paramscript: str, filename: str
+) -> None:
+    """
+    Creates the metadata4ing provenance report from the existing outputs and snakemake's
+    metadata. In report mode, snakemake does not execute any job.
+    """
+    subprocess.run(
+        snakemake
+        + [
+            "--reporter",
+            "metadata4ing",
+            "--report-metadata4ing-paramscript",
+            paramscript,
+            "--report-metadata4ing-filename",
+            filename,
+        ]
+        + snakemake_args,
+        check=True,
+    )
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        description="Generate the metadata4ing provenance report of a finished snakemake run without\n"
+        "re-executing the workflow. Fails if outputs are missing or outdated.\n"
+        "Further arguments (e.g. --cores all) are passed to snakemake."
+    )
+    parser.add_argument("--snakemake", default="snakemake", help="Snakemake executable")
+    parser.add_argument("--paramscript", default="parameter_extractor.py", help="Parameter extractor of the metadata4ing reporter")
+    parser.add_argument("--filename", default="metadata4ing_provenance", help="Name of the provenance report (output)")
+    args, snakemake_args = parser.parse_known_args()
+    snakemake = args.snakemake.split()
+
+    stale = stale_outputs(snakemake, snakemake_args)
+    if stale:
+        print(
+            f"The results are not up to date, {len(stale)} outputs would be (re)created. "
+            "Run the workflow first, the provenance report is only created from up-to-date results:",
+            file=sys.stderr,
+        )
+        for output_file, rule, status in stale:
+            print(f"  {output_file} (rule {rule}): {status}", file=sys.stderr)
+        sys.exit(1)
+
+    create_report(snakemake, snakemake_args, args.paramscript, args.filename)
@@ -0,0 +1,204 @@
+import csv
+import json
+import os
+from argparse import ArgumentParser
+from pathlib import Path
+
+# resource usage recorded for each rule/process: name -> unit
+# (the names and units follow snakemake's benchmark files)
+RESOURCE_UNITS = {
+    "wall_time": "s",
+    "cpu_time": "s",
+    "max_rss": "MB",
+    "io_in": "MB",
+    "io_out": "MB",
+}
+
+# marker files written by artifact_cache.py when the outputs of a step were restored from the
+# cache: next to the snakemake benchmark file and in the work directory of a Nextflow task.
+# The runtime recorded for such a step is the time of the cache lookup, not of the step.
+SNAKEMAKE_CACHE_HIT_SUFFIX = ".cache_hit"
+NEXTFLOW_CACHE_HIT_MARKER = ".artifact_cache_hit"
+
+# namespace of the investigates property of the usage in the provenance (as in the metadata4ing
+# provenance of the snakemake workflow)
+M4I_NAMESPACE = "http://w3id.org/nfdi4ing/metadata4ing#"
+
+
+def _to_float(value) -> float | None:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def read_snakemake_benchmark(benchmark_file: str) -> dict:
+    """
+    Reads the resource usage from a snakemake benchmark file (written by the `benchmark`
+    directive or by measure_resources.py). If the rule was benchmarked repeatedly, the first
+    run is used. Values that were not measured are None. `cache_hit` is True if the outputs of
+    the rule were restored from the artifact cache.
+    """
+    with open(benchmark_file) as f:
+        row = next(csv.DictReader(f, delimiter="\t"))
+    return {
+        "wall_time": _to_float(row.get("s")),
+        "cpu_time": _to_float(row.get("cpu_time")),
+        "max_rss": _to_float(row.get("max_rss")),
+        "io_in": _to_float(row.get("io_in")),
+        "io_out": _to_float(row.get("io_out")),
+        "cache_hit": os.path.isfile(benchmark_file + SNAKEMAKE_CACHE_HIT_SUFFIX),
+    }
+
+
+def read_nextflow_trace(trace_file: str) -> list[dict]:
+    """
+    Reads the resource usage of all completed tasks from a Nextflow trace file written with
+    `trace.raw = true` (durations in ms, memory and I/O in bytes, see nextflow.config).
+    The task tag holds the configuration. The cpu time is not traced directly and is
+    computed from the real time and the cpu usage (%cpu). Cache hits are detected by the marker
+    in the work directory of the task (the trace needs the workdir field). The id of a task is the
+    hash of the task (from its work directory), its name is the task name, e.g. "run_simulation (1)".
+    """
+    usages = []
+    with open(trace_file) as f:
+        for row in csv.DictReader(f, delimiter="\t"):
+            if row.get("status") not in ("COMPLETED", "CACHED"):
+                continue
+            realtime = _to_float(row.get("realtime"))
+            cpu_percent = _to_float(row.get("%cpu"))
+
+            def to_mb(value):
+                value = _to_float(value)
+                return value / 1024**2 if value is not None else None
+
+            # the work directory is work/<first two characters of the hash>/<rest of the hash>
+            workdir = row.get("workdir") or ""
+            usages.append(
+                {
+                    # the process name includes the calling workflows, e.g. "kratos_workflow:mesh_to_mdpa"
+                    "process": row["process"].split(":")[-1],
+                    "configuration": row.get("tag"),
+                    "id": "".join(Path(workdir).parts[-2:]) if workdir else None,
+                    "name": row.get("name"),
+                    "usage": {
+                        "wall_time": realtime / 1000 if realtime is not None else None,
+                        "cpu_time": realtime / 1000 * cpu_percent / 100
+                        if realtime is not None and cpu_percent is not None
+                        else None,
+                        "max_rss": to_mb(row.get("peak_rss")),
+                        "io_in": to_mb(row.get("rchar")),
+                        "io_out": to_mb(row.get("wchar")),
+                        "cache_hit": bool(workdir) and os.path.isfile(os.path.join(workdir, NEXTFLOW_CACHE_HIT_MARKER)),
+                    },
+                }
+            )
+    return usages
+
+
+def usage_to_properties(usage: dict) -> list[dict]:
+    """
+    Converts a resource usage (see read_snakemake_benchmark) into typed properties in the
+    format of the metadata4ing parameter extractor. Values that were not measured are skipped.
+    """
+    return [
+        {
+            name: {
+                "value": usage[name],
+                "unit": unit,
+                "json-path": f"/{name}",
+                "data-type": "schema:Float",
+            }
+        }
+        for name, unit in RESOURCE_UNITS.items()
+        if usage.get(name) is not None
+    ]
+
+
+def add_usage_to_ro_crate(ro_crate: dict, tasks: list[dict]) -> int:
+    """
+    Adds the resource usage of the Nextflow tasks (see read_nextflow_trace) to the RO-Crate
+    written by nf-prov (ro-crate-metadata.json): every measured value becomes a PropertyValue
+    that the CreateAction of the task investigates (m4i:investigates), like the usage in the
+    metadata4ing provenance of the snakemake workflow. The actions are matched by the task hash
+    (their @id) or by the task name. Tasks restored from the artifact cache are skipped, values
+    of a previous call are replaced. Returns the number of annotated tasks.
+    """
+    context = ro_crate["@context"] if isinstance(ro_crate["@context"], list) else [ro_crate["@context"]]
+    if not any(isinstance(entry, dict) and "m4i" in entry for entry in context):
+        context.append({"m4i": M4I_NAMESPACE})
+    ro_crate["@context"] = context
+
+    def types(entity):
+        return entity["@type"] if isinstance(entity.get("@type"), list) else [entity.get("@type")]
+
+    entities = {entity["@id"]: entity for entity in ro_crate["@graph"]}
+    actions = [entity for entity in ro_crate["@graph"] if "CreateAction" in types(entity)]
+    actions_by_id = {action["@id"].lstrip("#"): action for action in actions}
+    actions_by_name = {action.get("name"): action for action in actions}
+
+    annotated = 0
+    for task in tasks:
+        action = actions_by_id.get(task["id"]) or actions_by_name.get(task["name"])
+        if action is None or task["usage"]["cache_hit"]:
+            continue
+        investigates = action.setdefault("m4i:investigates", [])
+        for name, unit in RESOURCE_UNITS.items():
+            if task["usage"].get(name) is None:
+                continue
+            property_id = f"{action['@id']}-{name}"
+            if property_id not in entities:
+                entities[property_id] = {"@id": property_id}
+                ro_crate["@graph"].append(entities[property_id])
+                investigates.append({"@id": property_id})
+            entities[property_id].update(
+                {"@type": "PropertyValue", "name": name, "value": task["usage"][name], "unitText": unit}
+            )
+        annotated += 1
+    return annotated
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        description="Convert the resource usage of a Nextflow run (trace file) into typed properties\n"
+        "in the same format as the metadata4ing provenance of the snakemake workflow and add it to\n"
+        "the provenance of the run (RO-Crate written by nf-prov)."
+    )
+    parser.add_argument(
+        "--input_nextflow_trace",
+        required=True,
+        help="Path to the Nextflow trace file (input)",
+    )
+    parser.add_argument(
+        "--output_resource_usage_json",
+        required=True,
+        help="Path to the JSON file with the resource usage per process and configuration (output)",
+    )
+    parser.add_argument(
+        "--input_ro_crate",
+        default=None,
+        help="Path to the RO-Crate of the run written by nf-prov, ro-crate-metadata.json (input)",
+    )
+    parser.add_argument(
+        "--output_ro_crate",
+        default=None,
+        help="Path to the RO-Crate with the resource usage of the tasks, default: the input is updated (output)",
+    )
+    args = parser.parse_args()
+    tasks = read_nextflow_trace(args.input_nextflow_trace)
+    if args.input_ro_crate is not None:
+        with open(args.input_ro_crate) as f:
+            ro_crate = json.load(f)
+        annotated = add_usage_to_ro_crate(ro_crate, tasks)
+        with open(args.output_ro_crate or args.input_ro_crate, "w") as f:
+            json.dump(ro_crate, f, indent=4)
+        print(f"resource usage of {annotated} of {len(tasks)} tasks added to the RO-Crate")
+    resource_usage = {}
+    for task in tasks:
+        if task["usage"]["cache_hit"]:
+            continue
+        resource_usage.setdefault(task["process"], {})[task["configuration"]] = {
+            "investigates": usage_to_properties(task["usage"])
+        }
+    with open(args.output_resource_usage_json, "w") as f:
+        json.dump(resource_usage, f, indent=4)
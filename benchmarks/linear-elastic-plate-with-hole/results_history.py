@@ -0,0 +1,295 @@
+import datetime
+import glob
+import json
+import os
+import sqlite3
+import subprocess
+from argparse import ArgumentParser
+
+from resource_usage import RESOURCE_UNITS, read_nextflow_trace, read_snakemake_benchmark
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY,
+    run_timestamp TEXT NOT NULL,
+    git_commit TEXT NOT NULL,
+    engine TEXT NOT NULL,
+    UNIQUE (run_timestamp, git_commit, engine)
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id INTEGER NOT NULL REFERENCES runs (run_id) ON DELETE CASCADE,
+    tool TEXT,
+    configuration TEXT,
+    element_size REAL,
+    element_degree INTEGER,
+    name TEXT NOT NULL,
+    value REAL
+);
+CREATE TABLE IF NOT EXISTS timings (
+    run_id INTEGER NOT NULL REFERENCES runs (run_id) ON DELETE CASCADE,
+    tool TEXT,
+    configuration TEXT,
+    element_size REAL,
+    element_degree INTEGER,
+    step TEXT NOT NULL,
+    wall_time REAL,
+    cpu_time REAL,
+    max_rss REAL,
+    io_in REAL,
+    io_out REAL
+);
+CREATE INDEX IF NOT EXISTS runs_timestamp ON runs (run_timestamp, git_commit);
+CREATE INDEX IF NOT EXISTS metrics_key ON metrics (name, tool, configuration, element_size, element_degree, run_id);
+CREATE INDEX IF NOT EXISTS timings_key ON timings (step, tool, configuration, element_size, element_degree, run_id);
+"""
+
+
+def connect(database: str) -> sqlite3.Connection:
+    """Opens (and if needed creates) the results history database."""
+    connection = sqlite3.connect(database)
+    connection.execute("PRAGMA foreign_keys = ON")
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _tool_of_step(step: str, tools: list[str]) -> str | None:
+    """The tool a rule/process belongs to, if its name contains the tool, e.g. run_fenics_simulation."""
+    return next((tool for tool in tools if tool in step), None)
+
+
+def _add_run(connection: sqlite3.Connection, run_timestamp: str, commit: str, engine: str) -> int:
+    """Adds a run, a previously ingested run with the same timestamp, commit and engine is replaced."""
+    connection.execute(
+        "DELETE FROM runs WHERE run_timestamp = ? AND git_commit = ? AND engine = ?",
+        (run_timestamp, commit, engine),
+    )
+    cursor = connection.execute(
+        "INSERT INTO runs (run_timestamp, git_commit, engine) VALUES (?, ?, ?)",
+        (run_timestamp, commit, engine),
+    )
+    return cursor.lastrowid
+
+
+def ingest(
+    connection: sqlite3.Connection,
+    results_dir: str,
+    engine: str,
+    run_timestamp: str,
+    commit: str,
+    provenance_dir: str | None = None,
+) -> int:
+    """
+    Loads the results of one workflow run into the database:
+    - the metrics of each tool and configuration from `{results_dir}/{tool}/summary.json`,
+    - the resource usage of each rule from the snakemake benchmark files
+      (`{results_dir}/benchmarks/{rule}_{configuration}.tsv`) or the Nextflow trace
+      (`{results_dir}/trace.tsv`),
+    - optionally the element-size and stress of each tool from the metadata4ing provenance
+      (the configuration is unknown for these values).
+    Returns the id of the run.
+    """
+    run_id = _add_run(connection, run_timestamp, commit, engine)
+
+    # parameters of each configuration, used to index the timings as well
+    configuration_parameters = {}
+    tools = []
+    for summary_file in sorted(glob.glob(os.path.join(results_dir, "*", "summary.json"))):
+        tool = os.path.basename(os.path.dirname(summary_file))
+        tools.append(tool)
+        with open(summary_file) as f:
+            summary = json.load(f)
+        metrics = []
+        for entry in summary:
+            parameters = entry["parameters"]
+            element_size = parameters["element-size"]["value"]
+            element_degree = parameters.get("element-degree")
+            configuration_parameters[entry["configuration"]] = (element_size, element_degree)
+            for name, value in entry["metrics"].items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    metrics.append(
+                        (run_id, tool, entry["configuration"], element_size, element_degree, name, value)
+                    )
+        connection.executemany("INSERT INTO metrics VALUES (?, ?, ?, ?, ?, ?, ?)", metrics)
+
+    usages = []
+    if engine == "nextflow":
+        trace_file = os.path.join(results_dir, "trace.tsv")
+        if os.path.isfile(trace_file):
+            usages = [
+                (task["process"], task["configuration"], task["usage"])
+                for task in read_nextflow_trace(trace_file)
+            ]
+    else:
+        for benchmark_file in sorted(glob.glob(os.path.join(results_dir, "benchmarks", "*.tsv"))):
+            name = os.path.basename(benchmark_file)[: -len(".tsv")]
+            # file name is {rule}_{configuration}, both may contain underscores,
+            # therefore the known configurations are matched
+            configuration = next(
+                (c for c in configuration_parameters if name.endswith(f"_{c}")), None
+            )
+            step = name[: -len(configuration) - 1] if configuration else name
+            usages.append((step, configuration, read_snakemake_benchmark(benchmark_file)))
+    timings = []
+    for step, configuration, usage in usages:
+        # the runtime of a step restored from the artifact cache is the time of the lookup
+        if usage["cache_hit"]:
+            continue
+        element_size, element_degree = configuration_parameters.get(configuration, (None, None))
+        timings.append(
+            (run_id, _tool_of_step(step, tools), configuration, element_size, element_degree, step)
+            + tuple(usage[name] for name in RESOURCE_UNITS)
+        )
+    connection.executemany("INSERT INTO timings VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", timings)
+
+    if provenance_dir is not None:
+        from plot_provenance import load_graphs, query_and_build_table
+
+        headers, table_data = query_and_build_table(load_graphs(provenance_dir))
+        idx_element_size = headers.index("element-size")
+        idx_stress = headers.index("max-mises-stress")
+        idx_tool = headers.index("Tool Name")
+        connection.executemany(
+            "INSERT INTO metrics VALUES (?, ?, NULL, ?, NULL, 'provenance/max_von_mises_stress_nodes', ?)",
+            [
+                (run_id, str(row[idx_tool]), float(row[idx_element_size]), float(row[idx_stress]))
+                for row in table_data
+            ],
+        )
+
+    connection.commit()
+    return run_id
+
+
+def metric_history(
+    connection: sqlite3.Connection,
+    name: str,
+    tool: str | None = None,
+    configuration: str | None = None,
+) -> list[tuple]:
+    """History of a metric as (run_timestamp, git_commit, tool, configuration, element_size, value), oldest first."""
+    return connection.execute(
+        """
+        SELECT runs.run_timestamp, runs.git_commit, metrics.tool, metrics.configuration,
+               metrics.element_size, metrics.value
+        FROM metrics JOIN runs USING (run_id)
+        WHERE metrics.name = ?
+          AND (? IS NULL OR metrics.tool = ?)
+          AND (? IS NULL OR metrics.configuration = ?)
+        ORDER BY runs.run_timestamp
+        """,
+        (name, tool, tool, configuration, configuration),
+    ).fetchall()
+
+
+def timing_history(
+    connection: sqlite3.Connection,
+    step: str,
+    resource: str = "wall_time",
+    configuration: str | None = None,
+) -> list[tuple]:
+    """
+    History of the resource usage of a rule/process as
+    (run_timestamp, git_commit, tool, configuration, element_size, value), oldest first.
+    """
+    if resource not in RESOURCE_UNITS:
+        raise ValueError(f"Unknown resource {resource}, expected one of {', '.join(RESOURCE_UNITS)}")
+    return connection.execute(
+        f"""
+        SELECT runs.run_timestamp, runs.git_commit, timings.tool, timings.configuration,
+               timings.element_size, timings.{resource}
+        FROM timings JOIN runs USING (run_id)
+        WHERE timings.step = ?
+          AND (? IS NULL OR timings.configuration = ?)
+        ORDER BY runs.run_timestamp
+        """,
+        (step, configuration, configuration),
+    ).fetchall()
+
+
+def plot_history(history: list[tuple], ylabel: str, output_file: str) -> None:
+    """Plots the values of a history over the runs, one line per (tool, configuration)."""
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from collections import defaultdict
+
+    series = defaultdict(list)
+    for run_timestamp, _, tool, configuration, _, value in history:
+        series[(tool, configuration)].append((datetime.datetime.fromisoformat(run_timestamp), value))
+
+    fig, ax = plt.subplots(figsize=(12, 5))
+    for (tool, configuration), values in sorted(series.items(), key=lambda item: str(item[0])):
+        x_vals, y_vals = zip(*values)
+        ax.plot(x_vals, y_vals, marker="o", linestyle="-", label=f"{tool} ({configuration})")
+    ax.set_xlabel("run")
+    ax.set_ylabel(ylabel)
+    ax.grid(True)
+    if series:
+        ax.legend()
+    fig.autofmt_xdate()
+    fig.tight_layout()
+    fig.savefig(output_file)
+    print(f"Plot saved as {output_file}")
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        description="Local history of the results (metrics and resource usage) of the workflow runs.\n"
+        "ingest: load the results of one run into the database\n"
+        "history: query and plot the history of a metric or of the runtime of a rule/process"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    parser_ingest = subparsers.add_parser("ingest", help="Load the results of one run")
+    parser_ingest.add_argument("--database", default="results_history.db", help="Path to the SQLite database")
+    parser_ingest.add_argument("--input_results_dir", required=True, help="Results directory of the run, e.g. snakemake_results/linear-elastic-plate-with-hole (input)")
+    parser_ingest.add_argument("--input_engine", required=True, choices=["snakemake", "nextflow"], help="Workflow engine of the run (input)")
+    parser_ingest.add_argument("--input_provenance_dir", default=None, help="Folder with the unzipped metadata4ing provenance (input)")
+    parser_ingest.add_argument("--input_commit", default=None, help="Commit of the run (default: the current git commit)")
+    parser_ingest.add_argument("--input_timestamp", default=None, help="ISO timestamp of the run (default: now)")
+
+    parser_history = subparsers.add_parser("history", help="Query and plot the history of a metric or runtime")
+    parser_history.add_argument("--database", default="results_history.db", help="Path to the SQLite database")
+    group = parser_history.add_mutually_exclusive_group(required=True)
+    group.add_argument("--metric", help="Name of the metric, e.g. max_von_mises_stress_nodes")
+    group.add_argument("--step", help="Name of the rule/process, e.g. run_fenics_simulation")
+    parser_history.add_argument("--resource", default="wall_time", choices=list(RESOURCE_UNITS), help="Resource of the step")
+    parser_history.add_argument("--tool", default=None, help="Only the results of this tool")
+    parser_history.add_argument("--configuration", default=None, help="Only the results of this configuration")
+    parser_history.add_argument("--output_plot", default=None, help="Path to the plot of the history (output)")
+    args = parser.parse_args()
+
+    with connect(args.database) as connection:
+        if args.command == "ingest":
+            run_id = ingest(
+                connection,
+                args.input_results_dir,
+                args.input_engine,
+                args.input_timestamp or datetime.datetime.now().isoformat(timespec="seconds"),
+                args.input_commit or git_commit(),
+                args.input_provenance_dir,
+            )
+            print(f"Ingested run {run_id} from {args.input_results_dir}")
+        else:
+            if args.metric:
+                history = metric_history(connection, args.metric, args.tool, args.configuration)
+                ylabel = args.metric
+            else:
+                history = timing_history(connection, args.step, args.resource, args.configuration)
+                history = [row for row in history if args.tool is None or row[2] == args.tool]
+                ylabel = f"{args.step} {args.resource} [{RESOURCE_UNITS[args.resource]}]"
+            for run_timestamp, commit, tool, configuration, element_size, value in history:
+                print(f"{run_timestamp}  {commit[:8]}  {tool}  {configuration}  {element_size}  {value}")
+            if args.output_plot:
+                plot_history(history, ylabel, args.output_plot)
+    connection.close()
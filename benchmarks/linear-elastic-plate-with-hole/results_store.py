@@ -0,0 +1,393 @@
+import fcntl
+import hashlib
+import json
+import os
+from argparse import ArgumentParser
+from contextlib import contextmanager
+
+import numpy as np
+
+from resource_usage import read_snakemake_benchmark
+
+# columns that identify a row, a row is replaced if a row with the same key is added
+KEY_COLUMNS = ("tool", "configuration")
+
+# sha256 of the row file a row was ingested from (see ingest)
+DIGEST_COLUMN = "source_digest"
+
+# placeholder of a column that a row does not have (unlike None, which is a JSON null)
+_MISSING = object()
+
+# rules of the main workflow whose resource usage enters the row of a tool (timings.<rule>): the
+# rules shared by all tools and the rules of the tool. The benchmark files of all tools are in
+# one directory, the rules of the other tools and the on-demand variants (e.g.
+# run_fenics_load_cases) are not part of the row.
+SHARED_RULES = ("create_mesh",)
+TOOL_RULES = {
+    "fenics": ("run_fenics_simulation",),
+    "kratos": (
+        "mesh_to_mdpa",
+        "create_kratos_input",
+        "run_kratos_simulation",
+        "postprocess_kratos_results",
+        "run_kratos_pipeline",
+    ),
+}
+
+
+def flatten(data: dict, prefix: str = "") -> dict:
+    """
+    Flattens nested dicts into a single dict with keys joined by '.', e.g. parameters.radius.value.
+    Empty dicts are kept as values, such that unflatten restores them.
+    """
+    flat = {}
+    for key, value in data.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict) and value:
+            flat.update(flatten(value, f"{name}."))
+        else:
+            flat[name] = value
+    return flat
+
+
+def unflatten(flat: dict) -> dict:
+    """Inverse of flatten."""
+    data = {}
+    for name, value in flat.items():
+        *parents, key = name.split(".")
+        node = data
+        for parent in parents:
+            node = node.setdefault(parent, {})
+        node[key] = value
+    return data
+
+
+def summary_row(
+    benchmark: str,
+    tool: str,
+    configuration: str,
+    parameter_file: str,
+    metrics_file: str,
+    benchmark_dir: str | None = None,
+) -> dict:
+    """
+    One row of the results store: the parameters, the metrics and, if snakemake benchmark
+    files of the configuration are found in `benchmark_dir`, the resource usage of the shared
+    rules and of the rules of the tool (timings.<rule>.wall_time, ..., see TOOL_RULES).
+    """
+    with open(parameter_file) as f:
+        parameters = json.load(f)
+    with open(metrics_file) as f:
+        metrics = json.load(f)
+    row = {
+        "tool": tool,
+        "configuration": configuration,
+        "benchmark": benchmark,
+        "mesh": f"{configuration}/mesh",
+        "parameters": parameters,
+        "metrics": metrics,
+    }
+    if benchmark_dir is not None:
+        for rule in SHARED_RULES + TOOL_RULES.get(tool, ()):
+            benchmark_file = os.path.join(benchmark_dir, f"{rule}_{configuration}.tsv")
+            if not os.path.isfile(benchmark_file):
+                continue
+            usage = read_snakemake_benchmark(benchmark_file)
+            # the runtime of a rule restored from the artifact cache is the time of the lookup
+            if not usage.pop("cache_hit"):
+                row.setdefault("timings", {})[rule] = usage
+    return row
+
+
+def _kind(value) -> str:
+    """Kind of a value: bool, int, float and str are stored typed, all other values as JSON."""
+    for kind in (bool, int, float, str):
+        if type(value) is kind:
+            return kind.__name__
+    return "json"
+
+
+def _column_kind(values: list) -> str | None:
+    """
+    Common kind of the present values of a column, "json" if they differ (e.g. ints and floats,
+    which would come back as floats from a float column). None if no value is present.
+    """
+    kinds = {_kind(value) for value in values if value is not _MISSING}
+    if not kinds:
+        return None
+    return kinds.pop() if len(kinds) == 1 else "json"
+
+
+def _column_array(values: list, kind: str) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Converts a list of python values (_MISSING for missing values) of the given kind into a typed
+    column and a mask of the valid entries. Bools, ints and floats are stored with their numpy
+    type and strings as strings. Values of kind "json" (lists, dicts, None and columns of mixed
+    kinds) are stored as JSON strings and decoded when they are read.
+    """
+    valid = np.array([value is not _MISSING for value in values], dtype=bool)
+    if kind == "bool":
+        return np.array([value is True for value in values], dtype=bool), valid
+    if kind == "int":
+        return np.array([0 if value is _MISSING else value for value in values], dtype=np.int64), valid
+    if kind == "float":
+        return np.array([np.nan if value is _MISSING else value for value in values], dtype=np.float64), valid
+    if kind == "str":
+        return np.array(["" if value is _MISSING else value for value in values], dtype=str), valid
+    return np.array(["" if value is _MISSING else json.dumps(value) for value in values], dtype=str), valid
+
+
+def _inferred_kind(column: np.ndarray) -> str:
+    """Kind of a column of a store written without kinds."""
+    if column.dtype == bool:
+        return "bool"
+    if np.issubdtype(column.dtype, np.integer):
+        return "int"
+    if np.issubdtype(column.dtype, np.floating):
+        return "float"
+    return "str"
+
+
+class ResultsStore:
+    """
+    Columnar store of the results of all tools and configurations in a single NPZ file.
+
+    Each configuration of a tool contributes one row with its flattened parameters, metrics
+    and timings (see summary_row). Each column is a typed numpy array with a mask of the valid
+    entries and its kind (bool, int, float, str or json, see _column_array), such that the rows
+    are read back with the types they were added with. A column can be read for all rows at
+    once, e.g.
+    `store.column("metrics.max_von_mises_stress_nodes")` together with `store.column("tool")`.
+    Rows are updated by their key (tool, configuration), such that adding or changing a
+    configuration only touches its row (see ingest). The summary.json files are views of the store (to_summary).
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.columns = {}
+        self.masks = {}
+        self.kinds = {}
+        self.num_rows = 0
+        if os.path.isfile(path):
+            self._load()
+
+    def _load(self) -> None:
+        with np.load(self.path, allow_pickle=False) as data:
+            names = [str(name) for name in data["__columns__"]]
+            kinds = [str(kind) for kind in data["__kinds__"]] if "__kinds__" in data else None
+            for idx, name in enumerate(names):
+                self.columns[name] = data[f"c{idx}"]
+                self.masks[name] = data[f"m{idx}"]
+                self.kinds[name] = kinds[idx] if kinds else _inferred_kind(self.columns[name])
+        self.num_rows = len(next(iter(self.columns.values()))) if self.columns else 0
+
+    def save(self) -> None:
+        """Writes the store atomically (readers never see a partially written file)."""
+        names = list(self.columns)
+        arrays = {
+            "__columns__": np.array(names, dtype=str),
+            "__kinds__": np.array([self.kinds[name] for name in names], dtype=str),
+        }
+        for idx, name in enumerate(names):
+            arrays[f"c{idx}"] = self.columns[name]
+            arrays[f"m{idx}"] = self.masks[name]
+        tmp_path = f"{self.path}.tmp.npz"
+        np.savez(tmp_path, **arrays)
+        os.replace(tmp_path, self.path)
+
+    def _value(self, name: str, idx: int):
+        if not self.masks[name][idx]:
+            return _MISSING
+        value = self.columns[name][idx].item()
+        return json.loads(value) if self.kinds[name] == "json" else value
+
+    def row(self, idx: int) -> dict:
+        return {
+            name: self._value(name, idx)
+            for name in self.columns
+            if self.masks[name][idx]
+        }
+
+    def keys(self) -> list[tuple]:
+        if not self.num_rows:
+            return []
+        return list(zip(*(self.columns[name].tolist() for name in KEY_COLUMNS)))
+
+    def upsert(self, rows: list[dict]) -> None:
+        """
+        Adds rows, or replaces the rows with the same key (tool, configuration). The values of
+        the added and replaced rows are written into the existing columns, only a column whose
+        kind changes (e.g. a float is added to an int column) is converted again.
+        """
+        flat_rows = [flatten(row) for row in rows]
+        index = {key: idx for idx, key in enumerate(self.keys())}
+        new_rows = []
+        replaced = {}
+        for flat in flat_rows:
+            key = tuple(flat[name] for name in KEY_COLUMNS)
+            if key in index and index[key] < self.num_rows:
+                replaced[index[key]] = flat
+            elif key in index:
+                new_rows[index[key] - self.num_rows] = flat
+            else:
+                index[key] = self.num_rows + len(new_rows)
+                new_rows.append(flat)
+
+        names = list(self.columns)
+        for flat in flat_rows:
+            names.extend(name for name in flat if name not in names)
+
+        replaced_idx = np.array(list(replaced), dtype=np.int64)
+        for name in names:
+            replaced_values = [flat.get(name, _MISSING) for flat in replaced.values()]
+            new_values = [flat.get(name, _MISSING) for flat in new_rows]
+            old_kind = self.kinds.get(name)
+            kind = _column_kind(replaced_values + new_values) or old_kind
+            if old_kind is not None and old_kind != kind and self.masks[name].any():
+                kind = "json"
+
+            if name in self.columns and kind == old_kind:
+                column, mask = self.columns[name], self.masks[name]
+                if replaced:
+                    values, valid = _column_array(replaced_values, kind)
+                    # strings longer than the ones in the column need a wider dtype
+                    column = column.astype(np.result_type(column, values), copy=False)
+                    column[replaced_idx] = values
+                    mask[replaced_idx] = valid
+                values, valid = _column_array(new_values, kind)
+                self.columns[name] = np.concatenate([column, values])
+                self.masks[name] = np.concatenate([mask, valid])
+            else:
+                # new column or changed kind: all values of the column are converted
+                values = [_MISSING] * self.num_rows
+                if name in self.columns:
+                    values = [self._value(name, idx) for idx in range(self.num_rows)]
+                for idx, value in zip(replaced, replaced_values):
+                    values[idx] = value
+                self.columns[name], self.masks[name] = _column_array(values + new_values, kind)
+                self.kinds[name] = kind
+        self.num_rows += len(new_rows)
+
+    def column(self, name: str) -> np.ma.MaskedArray:
+        """All values of a column (missing values are masked), JSON values are decoded."""
+        column = self.columns[name]
+        if self.kinds[name] == "json":
+            decoded = np.empty(len(column), dtype=object)
+            for idx, value in enumerate(column.tolist()):
+                decoded[idx] = json.loads(value) if value else None
+            column = decoded
+        return np.ma.masked_array(column, mask=~self.masks[name])
+
+    def select(self, **equals) -> np.ndarray:
+        """Indices of the rows whose columns have the given values, e.g. select(tool="fenics")."""
+        selected = np.ones(self.num_rows, dtype=bool)
+        for name, value in equals.items():
+            selected &= self.masks[name] & (self.columns[name] == value)
+        return np.flatnonzero(selected)
+
+    def to_summary(self, tool: str, configurations: list[str] | None = None) -> list[dict]:
+        """
+        The summary of a tool (the content of summary.json) as a view of the store.
+        If `configurations` is given, only these configurations are returned in this order.
+        """
+        rows = {}
+        for idx in self.select(tool=tool):
+            row = unflatten(self.row(idx))
+            rows[row["configuration"]] = row
+        if configurations is None:
+            configurations = list(rows)
+        summary = []
+        for configuration in configurations:
+            row = rows[configuration]
+            summary.append(
+                {
+                    "benchmark": row.get("benchmark"),
+                    "parameters": row.get("parameters", {}),
+                    "mesh": row.get("mesh"),
+                    "metrics": row.get("metrics", {}),
+                    "configuration": configuration,
+                }
+            )
+        return summary
+
+
+def ingest(store: ResultsStore, tool: str, configurations: list[str], row_files: list[str]) -> None:
+    """
+    Upserts the rows of a tool into the store. `row_files` are aligned with `configurations`.
+    Each row is stored with the sha256 of its file (column source_digest), row files whose
+    digest did not change since they were ingested are not parsed again. The decision only
+    depends on the content, not on the modification times of the row files and the store,
+    which is also rewritten by the updates of the other tools.
+    """
+    ingested = {}
+    if DIGEST_COLUMN in store.columns:
+        ingested = {
+            key: store._value(DIGEST_COLUMN, idx) for idx, key in enumerate(store.keys())
+        }
+    rows = []
+    for configuration, row_file in zip(configurations, row_files):
+        with open(row_file, "rb") as f:
+            content = f.read()
+        digest = hashlib.sha256(content).hexdigest()
+        if ingested.get((tool, configuration)) != digest:
+            row = json.loads(content)
+            row[DIGEST_COLUMN] = digest
+            rows.append(row)
+    if rows:
+        store.upsert(rows)
+        store.save()
+
+
+@contextmanager
+def locked_store(path: str):
+    """Opens the store with an exclusive lock, e.g. if the summaries of several tools are updated in parallel."""
+    with open(f"{path}.lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield ResultsStore(path)
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        description="Incremental columnar store of the results of all tools and configurations.\n"
+        "row: create the row of one configuration\n"
+        "update: add/replace rows in the store and write the summary.json view of a tool"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    parser_row = subparsers.add_parser("row", help="Create the row of one configuration")
+    parser_row.add_argument("--input_benchmark", required=True, help="Name of the benchmark (input)")
+    parser_row.add_argument("--input_tool", required=True, help="Name of the tool (input)")
+    parser_row.add_argument("--input_configuration", required=True, help="Configuration name (input)")
+    parser_row.add_argument("--input_parameter_file", required=True, help="Path to the JSON file containing simulation parameters (input)")
+    parser_row.add_argument("--input_solution_metrics", required=True, help="Path to the metrics JSON file (input)")
+    parser_row.add_argument("--input_benchmark_dir", default=None, help="Directory with the snakemake benchmark files (input)")
+    parser_row.add_argument("--output_row_json", required=True, help="Path to the row JSON file (output)")
+
+    parser_update = subparsers.add_parser("update", help="Add rows to the store and export the summary of a tool")
+    parser_update.add_argument("--store", required=True, help="Path to the results store (.npz), updated in place")
+    parser_update.add_argument("--input_tool", required=True, help="Tool of the rows, its summary is exported (input)")
+    parser_update.add_argument("--input_configuration", nargs="+", required=True, help="Configuration of each row (input)")
+    parser_update.add_argument("--input_row_json", nargs="+", required=True, help="Paths to the row JSON files (input)")
+    parser_update.add_argument("--output_summary_json", required=True, help="Path to the summary JSON file (output)")
+
+    args = parser.parse_args()
+    if args.command == "row":
+        row = summary_row(
+            args.input_benchmark,
+            args.input_tool,
+            args.input_configuration,
+            args.input_parameter_file,
+            args.input_solution_metrics,
+            args.input_benchmark_dir,
+        )
+        with open(args.output_row_json, "w") as f:
+            json.dump(row, f, indent=4)
+    else:
+        with locked_store(args.store) as store:
+            ingest(store, args.input_tool, args.input_configuration, args.input_row_json)
+            summary = store.to_summary(args.input_tool, args.input_configuration)
+        with open(args.output_summary_json, "w") as f:
+            json.dump(summary, f, indent=4)
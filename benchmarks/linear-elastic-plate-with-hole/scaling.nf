@@ -0,0 +1,216 @@
+// Strong and weak scaling study of the simulation tools.
+// Run with: nextflow run scaling.nf -params-file scaling_config.json
+
+params.scaling_dir = "nextflow_results/${params.benchmark}/scaling"
+// cores reserved by each scaling run (all cores of the machine, see run_fenics_scaling)
+params.scaling_cpus = Runtime.runtime.availableProcessors()
+
+process create_scaling_parameters {
+    input:
+    path python_script
+    tuple val(mode), val(configuration), path(parameter_file), val(processes)
+
+    output:
+    tuple val(mode), val(configuration), val(processes), path("parameters_${configuration}_${mode}_np${processes}.json")
+
+    script:
+    """
+    python3 ${python_script} \
+        --input_parameter_file ${parameter_file} \
+        --input_mode ${mode} \
+        --input_processes ${processes} \
+        --output_parameter_file parameters_${configuration}_${mode}_np${processes}.json
+    """
+}
+
+process create_scaling_mesh {
+    publishDir "${params.scaling_dir}/mesh/"
+    conda 'environment_mesh.yml'
+
+    input:
+    path python_script
+    tuple val(mode), val(configuration), val(processes), path(parameter_file)
+
+    output:
+    tuple val(mode), val(configuration), val(processes), path(parameter_file), path("mesh_${configuration}_${mode}_np${processes}.msh")
+
+    script:
+    """
+    python3 ${python_script} --input_parameter_file ${parameter_file} --output_mesh_file mesh_${configuration}_${mode}_np${processes}.msh
+    """
+}
+
+// The scaling runs reserve all cores (cpus, like threads: workflow.cores in Snakefile_scaling),
+// such that the local executor runs no other task at the same time, neither the other tool nor
+// the meshes and parameters, and the timings are not disturbed by concurrent tasks (maxForks
+// only limits the tasks of one process). If more processes than cores are requested, the MPI
+// ranks (or OpenMP threads) are oversubscribed.
+process run_fenics_scaling {
+    publishDir "${params.scaling_dir}/fenics/"
+    conda './fenics/environment_scaling.yml'
+    cpus params.scaling_cpus
+    maxForks 1
+
+    input:
+    path python_script
+    path measure_script
+    tuple val(mode), val(configuration), val(processes), path(parameter_file), path(mesh_file)
+
+    output:
+    tuple val('fenics'), val(mode), val(configuration), val(processes), path("benchmark_${configuration}_${mode}_np${processes}.tsv"), path("solution_metrics_${configuration}_${mode}_np${processes}.json")
+
+    script:
+    """
+    python3 ${measure_script} --output_benchmark_file benchmark_${configuration}_${mode}_np${processes}.tsv -- \
+        ${params.mpi_launcher} ${processes} python3 ${python_script} \
+        --input_parameter_file ${parameter_file} \
+        --input_mesh_file ${mesh_file} \
+        --output_solution_file_zip solution_field_data_${configuration}_${mode}_np${processes}.zip \
+        --output_metrics_file solution_metrics_${configuration}_${mode}_np${processes}.json
+    """
+}
+
+process run_kratos_scaling {
+    // Mesh conversion, input generation, simulation and postprocessing of a scaling run are
+    // combined in one process, the relative paths in the kratos input file are resolved in the
+    // work directory of the process. Only the simulation itself is measured.
+    publishDir "${params.scaling_dir}/kratos/"
+    conda './kratos/environment_simulation.yml'
+    cpus params.scaling_cpus
+    maxForks 1
+
+    input:
+    path script_mesh_to_mdpa
+    path script_create_kratos_input
+    path script_run_kratos
+    path script_postprocess
+    path measure_script
+    path kratos_input_template
+    path kratos_material_template
+    tuple val(mode), val(configuration), val(processes), path(parameter_file), path(mesh_file)
+
+    output:
+    tuple val('kratos'), val(mode), val(configuration), val(processes), path("benchmark_${configuration}_${mode}_np${processes}.tsv"), path("solution_metrics_${configuration}_${mode}_np${processes}.json")
+
+    script:
+    def name = "${configuration}_${mode}_np${processes}"
+    """
+    python3 ${script_mesh_to_mdpa} \
+        --input_parameter_file ${parameter_file} \
+        --input_mesh_file ${mesh_file} \
+        --output_mdpa_file mesh_${name}.mdpa
+
+    python3 ${script_create_kratos_input} \
+        --input_parameter_file ${parameter_file} \
+        --input_mdpa_file mesh_${name}.mdpa \
+        --input_kratos_input_template ${kratos_input_template} \
+        --input_material_template ${kratos_material_template} \
+        --output_kratos_inputfile ProjectParameters_${name}.json \
+        --output_kratos_materialfile MaterialParameters_${name}.json
+
+    OMP_NUM_THREADS=${processes} python3 ${measure_script} --output_benchmark_file benchmark_${name}.tsv -- \
+        python3 ${script_run_kratos} \
+        --input_parameter_file ${parameter_file} \
+        --input_kratos_inputfile ProjectParameters_${name}.json \
+        --input_kratos_materialfile MaterialParameters_${name}.json
+
+    python3 ${script_postprocess} \
+        --input_parameter_file ${parameter_file} \
+        --input_result_vtk ${name}/Structure_0_1.vtk \
+        --output_solution_file_zip solution_field_data_${name}.zip \
+        --output_metrics_file solution_metrics_${name}.json
+    """
+}
+
+process scaling_summary {
+    publishDir "${params.scaling_dir}/"
+    conda 'environment_postprocessing.yml'
+
+    input:
+    path python_script
+    val tool
+    val mode
+    val configuration
+    val processes
+    path benchmark_files
+    path solution_metrics
+
+    output:
+    tuple path("scaling_summary.json"), path("scaling.pdf")
+
+    script:
+    """
+    python3 ${python_script} \
+        --input_tool ${tool.join(' ')} \
+        --input_mode ${mode.join(' ')} \
+        --input_configuration ${configuration.join(' ')} \
+        --input_processes ${processes.join(' ')} \
+        --input_benchmark_file ${benchmark_files.join(' ')} \
+        --input_solution_metrics ${solution_metrics.join(' ')} \
+        --output_summary_json scaling_summary.json \
+        --output_plot scaling.pdf
+    """
+}
+
+workflow {
+    main:
+
+    // one entry per point of the study: (mode, configuration, parameter file, processes)
+    def scaling_points = []
+    ['strong', 'weak'].each { mode ->
+        params[mode].parameter_files.each { parameter_file ->
+            def configuration = new groovy.json.JsonSlurper().parse(file(parameter_file)).configuration
+            params[mode].processes.each { processes ->
+                scaling_points.add(tuple(mode, configuration, file(parameter_file), processes))
+            }
+        }
+    }
+
+    def ch_scaling_parameters = create_scaling_parameters(
+        Channel.value(file('create_scaling_parameters.py')),
+        Channel.fromList(scaling_points)
+    )
+    def ch_meshes = create_scaling_mesh(Channel.value(file('create_mesh.py')), ch_scaling_parameters)
+    def ch_measure_script = Channel.value(file('measure_resources.py'))
+
+    def ch_runs = Channel.empty()
+    if (params.tools.contains('fenics')) {
+        ch_runs = ch_runs.mix(run_fenics_scaling(
+            Channel.value(file('fenics/run_fenics_simulation.py')),
+            ch_measure_script,
+            ch_meshes
+        ))
+    }
+    if (params.tools.contains('kratos')) {
+        ch_runs = ch_runs.mix(run_kratos_scaling(
+            Channel.value(file('kratos/msh_to_mdpa.py')),
+            Channel.value(file('kratos/create_kratos_input.py')),
+            Channel.value(file('kratos/run_kratos_simulation.py')),
+            Channel.value(file('kratos/postprocess_results.py')),
+            ch_measure_script,
+            Channel.value(file('kratos/input_template.json')),
+            Channel.value(file('kratos/StructuralMaterials_template.json')),
+            ch_meshes
+        ))
+    }
+
+    // collect all runs into aligned lists for the summary (one entry per run in each list)
+    def ch_collected = ch_runs.toList().multiMap { runs ->
+        tool : runs.collect { it[0] }
+        mode : runs.collect { it[1] }
+        configuration : runs.collect { it[2] }
+        processes : runs.collect { it[3] }
+        benchmark_file : runs.collect { it[4] }
+        metrics : runs.collect { it[5] }
+    }
+
+    scaling_summary(
+        Channel.value(file('summarise_scaling.py')),
+        ch_collected.tool,
+        ch_collected.mode,
+        ch_collected.configuration,
+        ch_collected.processes,
+        ch_collected.benchmark_file,
+        ch_collected.metrics
+    )
+}
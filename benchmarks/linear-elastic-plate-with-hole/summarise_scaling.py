@@ -0,0 +1,133 @@
+import json
+from argparse import ArgumentParser
+from collections import defaultdict
+
+from resource_usage import read_snakemake_benchmark
+
+
+def read_phases(metrics_file: str) -> dict:
+    """
+    Returns the per-phase timings from the `performance` section of a metrics file.
+    The maximum across ranks is used since the slowest rank determines the wall time.
+    Tools that do not write a performance section return an empty dict.
+    """
+    with open(metrics_file) as f:
+        metrics = json.load(f)
+    phases = metrics.get("performance", {}).get("phases", {})
+    return {name: stats["max"] for name, stats in phases.items()}
+
+
+def create_scaling_summary(
+    tools: list[str],
+    modes: list[str],
+    configurations: list[str],
+    processes: list[int],
+    benchmark_files: list[str],
+    metrics_files: list[str],
+    summary_json: str,
+) -> dict:
+    """
+    Collects the timings of all scaling runs and computes speedup and parallel efficiency
+    relative to the run with the smallest number of processes of each series
+    (tool, mode, configuration).
+
+    - strong scaling: speedup = T(p0) / T(p), efficiency = speedup * p0 / p
+    - weak scaling: efficiency = T(p0) / T(p)
+    """
+    series = defaultdict(list)
+    for idx, tool in enumerate(tools):
+        record = {"processes": int(processes[idx])}
+        record.update(read_snakemake_benchmark(benchmark_files[idx]))
+        record["phases"] = read_phases(metrics_files[idx])
+        series[(tool, modes[idx], configurations[idx])].append(record)
+
+    summary = []
+    for (tool, mode, configuration), records in sorted(series.items()):
+        records.sort(key=lambda record: record["processes"])
+        reference = records[0]
+        for record in records:
+            if reference["wall_time"] and record["wall_time"]:
+                ratio = reference["wall_time"] / record["wall_time"]
+                if mode == "strong":
+                    record["speedup"] = ratio
+                    record["efficiency"] = ratio * reference["processes"] / record["processes"]
+                else:
+                    record["efficiency"] = ratio
+        summary.append(
+            {
+                "tool": tool,
+                "mode": mode,
+                "configuration": configuration,
+                "runs": records,
+            }
+        )
+
+    with open(summary_json, "w") as f:
+        json.dump(summary, f, indent=4)
+    return summary
+
+
+def plot_scaling(summary: list[dict], output_file: str) -> None:
+    """Plots wall time (strong scaling) and parallel efficiency (weak scaling) over the number of processes."""
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    fig, (ax_strong, ax_weak) = plt.subplots(1, 2, figsize=(12, 5))
+    for entry in summary:
+        x_vals = [run["processes"] for run in entry["runs"]]
+        label = f"{entry['tool']} ({entry['configuration']})"
+        if entry["mode"] == "strong":
+            y_vals = [run["wall_time"] for run in entry["runs"]]
+            ax_strong.plot(x_vals, y_vals, marker="o", linestyle="-", label=label)
+            # ideal scaling from the first run of the series
+            ideal = [y_vals[0] * x_vals[0] / x for x in x_vals]
+            ax_strong.plot(x_vals, ideal, linestyle="--", color="gray")
+        else:
+            y_vals = [run.get("efficiency") for run in entry["runs"]]
+            ax_weak.plot(x_vals, y_vals, marker="o", linestyle="-", label=label)
+
+    ax_strong.set_title("strong scaling")
+    ax_strong.set_xlabel("processes")
+    ax_strong.set_ylabel("wall time [s]")
+    ax_strong.set_xscale("log", base=2)
+    ax_strong.set_yscale("log")
+    ax_weak.set_title("weak scaling")
+    ax_weak.set_xlabel("processes")
+    ax_weak.set_ylabel("parallel efficiency")
+    ax_weak.set_xscale("log", base=2)
+    ax_weak.set_ylim(bottom=0.0)
+    for ax in (ax_strong, ax_weak):
+        ax.grid(True)
+        if ax.get_legend_handles_labels()[0]:
+            ax.legend()
+    fig.tight_layout()
+    fig.savefig(output_file)
+    print(f"Plot saved as {output_file}")
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        description="Summarise the timings of a strong/weak scaling study and plot the results.\n"
+        "All --input_* lists are aligned, i.e. the i-th entries describe the same run."
+    )
+    parser.add_argument("--input_tool", nargs="+", required=True, help="Tool of each run (input)")
+    parser.add_argument("--input_mode", nargs="+", required=True, help="Scaling mode of each run (input)")
+    parser.add_argument("--input_configuration", nargs="+", required=True, help="Base configuration of each run (input)")
+    parser.add_argument("--input_processes", nargs="+", type=int, required=True, help="Number of processes of each run (input)")
+    parser.add_argument("--input_benchmark_file", nargs="+", required=True, help="Benchmark file (tsv) of each run (input)")
+    parser.add_argument("--input_solution_metrics", nargs="+", required=True, help="Metrics JSON file of each run (input)")
+    parser.add_argument("--output_summary_json", required=True, help="Path to the scaling summary JSON file (output)")
+    parser.add_argument("--output_plot", required=True, help="Path to the scaling plot (output)")
+    args = parser.parse_args()
+    summary = create_scaling_summary(
+        args.input_tool,
+        args.input_mode,
+        args.input_configuration,
+        args.input_processes,
+        args.input_benchmark_file,
+        args.input_solution_metrics,
+        args.output_summary_json,
+    )
+    plot_scaling(summary, args.output_plot)
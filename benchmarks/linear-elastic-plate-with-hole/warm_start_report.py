@@ -0,0 +1,64 @@
+import json
+from argparse import ArgumentParser
+
+
+def _solver_statistics(metrics_file: str) -> dict:
+    """Number of GMRES iterations and time of the solve (slowest rank) from a metrics file."""
+    with open(metrics_file) as f:
+        performance = json.load(f)["performance"]
+    phases = performance["phases"]
+    return {
+        "iterations": performance["counters"]["solver_iterations"]["max"],
+        "ksp_solve_time": phases["solve/ksp_solve"]["max"],
+        "initial_guess_time": phases.get("solve/initial_guess", {}).get("max", 0.0),
+    }
+
+
+def warm_start_report(
+    parameter_files: list[str],
+    cold_metrics_files: list[str],
+    warm_metrics_files: list[str],
+    report_file: str,
+) -> None:
+    """
+    Compares the GMRES iterations and solve times of the refinement levels (coarse to fine)
+    started from zero with those started from the interpolated solution of the previous level.
+    """
+    levels = []
+    for parameter_file, cold_metrics, warm_metrics in zip(parameter_files, cold_metrics_files, warm_metrics_files):
+        with open(parameter_file) as f:
+            parameters = json.load(f)
+        levels.append(
+            {
+                "configuration": parameters["configuration"],
+                "element-size": parameters["element-size"],
+                "cold_start": _solver_statistics(cold_metrics),
+                "warm_start": _solver_statistics(warm_metrics),
+            }
+        )
+
+    print(f"{'configuration':>15} {'iterations (zero)':>18} {'iterations (warm)':>18}")
+    for level in levels:
+        print(
+            f"{level['configuration']:>15} {level['cold_start']['iterations']:>18} {level['warm_start']['iterations']:>18}"
+        )
+    with open(report_file, "w") as f:
+        json.dump({"levels": levels}, f, indent=4)
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        description="Compare the solver iterations of the refinement levels with and without warm start."
+    )
+    parser.add_argument("--input_parameter_file", nargs="+", required=True, help="JSON files of the levels, coarse to fine (input)")
+    parser.add_argument("--input_solution_metrics_cold", nargs="+", required=True, help="Metrics files of the runs started from zero (input)")
+    parser.add_argument("--input_solution_metrics_warm", nargs="+", required=True, help="Metrics files of the warm-started runs (input)")
+    parser.add_argument("--output_report_file", required=True, help="Path to the report JSON file (output)")
+    args, _ = parser.parse_known_args()
+
+    warm_start_report(
+        args.input_parameter_file,
+        args.input_solution_metrics_cold,
+        args.input_solution_metrics_warm,
+        args.output_report_file,
+    )
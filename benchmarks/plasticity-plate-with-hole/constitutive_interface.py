@@ -0,0 +1,212 @@
+from dataclasses import dataclass
+from typing import Protocol
+
+import numpy as np
+
+# Batched counterpart of the umat interface of docs/interface.md: one call evaluates all material
+# points. All arrays are structure-of-arrays, the last axis is the material point, such that each
+# component (e.g. the xx strain of all points) is one contiguous row.
+#
+#   Abaqus (Ansys)      batched interface
+#   STRAN (Strain)      strain          (n_stress_strain, points), at the beginning of the increment
+#   DSTRAN (dStrain)    del_strain      (n_stress_strain, points)
+#   PROPS (prop)        properties      (n_properties, points) or (n_properties, 1) for all points
+#   STATEV (ustatev)    state_vars      (n_state_vars, points), input, at the beginning of the increment
+#                       state_vars_new  (n_state_vars, points), output, at the end of the increment
+#   STRESS (stress)     stress          (n_stress_strain, points), output
+#   DDSDDE (dsdePl)     tangent         (n_stress_strain, n_stress_strain, points), output
+#   TIME, DTIME         time, del_time
+#
+# Unlike STATEV, the state at the beginning of the increment is not overwritten, so the iterations
+# of a load step can be evaluated without copying it and the converged state is committed by
+# swapping the buffers.
+
+
+class ConstitutiveModel(Protocol):
+    n_stress_strain: int
+    n_state_vars: int
+    n_properties: int
+
+    def __call__(
+        self,
+        strain: np.ndarray,
+        del_strain: np.ndarray,
+        properties: np.ndarray,
+        state_vars: np.ndarray,
+        stress: np.ndarray,
+        tangent: np.ndarray,
+        state_vars_new: np.ndarray,
+        time: float,
+        del_time: float,
+    ) -> None: ...
+
+
+@dataclass
+class MaterialPointBuffers:
+    """Preallocated, contiguous structure-of-arrays buffers of all material points of a model."""
+
+    strain: np.ndarray
+    del_strain: np.ndarray
+    properties: np.ndarray
+    state_vars: np.ndarray
+    stress: np.ndarray
+    tangent: np.ndarray
+    state_vars_new: np.ndarray
+
+    @classmethod
+    def allocate(cls, model: ConstitutiveModel, points: int, properties: np.ndarray) -> "MaterialPointBuffers":
+        """
+        Zero-initialized buffers of `points` material points, `properties` are the properties of
+        all points (n_properties,) or of each point (n_properties, points).
+        """
+        n = model.n_stress_strain
+        properties = np.asarray(properties, dtype=float)
+        return cls(
+            strain=np.zeros((n, points)),
+            del_strain=np.zeros((n, points)),
+            properties=np.ascontiguousarray(properties.reshape(model.n_properties, -1)),
+            state_vars=np.zeros((model.n_state_vars, points)),
+            stress=np.zeros((n, points)),
+            tangent=np.zeros((n, n, points)),
+            state_vars_new=np.zeros((model.n_state_vars, points)),
+        )
+
+    def evaluate(self, model: ConstitutiveModel, time: float = 0.0, del_time: float = 0.0) -> None:
+        model(
+            self.strain,
+            self.del_strain,
+            self.properties,
+            self.state_vars,
+            self.stress,
+            self.tangent,
+            self.state_vars_new,
+            time,
+            del_time,
+        )
+
+    def commit(self) -> None:
+        """Makes the state at the end of the increment the state at the beginning of the next one."""
+        self.state_vars, self.state_vars_new = self.state_vars_new, self.state_vars
+        self.strain += self.del_strain
+        self.del_strain[:] = 0.0
+
+
+class MisesPlasticity:
+    """
+    Mises plasticity with linear isotropic and kinematic hardening of return_mapping.py behind
+    the batched interface, in Mandel notation (xx, yy, zz, sqrt(2) xy) of the plane strain state.
+
+    properties: E, nu, yield stress, isotropic and kinematic hardening modulus
+    state_vars: plastic strain (4), back stress (4), equivalent plastic strain alpha
+
+    The intermediate results are computed component by component into work arrays, which
+    are allocated on the first call and reused as long as the number of points is the same.
+    """
+
+    n_stress_strain = 4
+    n_state_vars = 9
+    n_properties = 5
+
+    def __init__(self):
+        self._work = None
+
+    def _work_arrays(self, points: int) -> dict[str, np.ndarray]:
+        if self._work is None or self._work["f"].shape[0] != points:
+            self._work = {
+                name: np.empty((4, points)) if name in ("elastic_strain", "xi") else np.empty(points)
+                for name in ("elastic_strain", "xi", "trace", "norm", "f", "delta_gamma", "theta", "theta_bar", "tmp")
+            }
+        return self._work
+
+    def __call__(self, strain, del_strain, properties, state_vars, stress, tangent, state_vars_new, time=0.0, del_time=0.0):
+        E, nu, yield_stress, isotropic_hardening, kinematic_hardening = properties
+        mu = E / (2.0 * (1.0 + nu))
+        kappa = E / (3.0 * (1.0 - 2.0 * nu))
+        hardening = isotropic_hardening + kinematic_hardening
+
+        w = self._work_arrays(strain.shape[1])
+        plastic_strain, back_stress, alpha = state_vars[0:4], state_vars[4:8], state_vars[8]
+        elastic_strain, xi = w["elastic_strain"], w["xi"]
+
+        # trial state: deviatoric trial stress 2 mu dev(eps_e) minus back stress, and yield function
+        np.add(strain, del_strain, out=elastic_strain)
+        elastic_strain -= plastic_strain
+        trace = np.sum(elastic_strain[:3], axis=0, out=w["trace"])
+        np.multiply(2.0 * mu, elastic_strain, out=xi)
+        xi[:3] -= (2.0 * mu / 3.0) * trace
+        # the deviatoric trial stress is stored in stress until the return
+        stress[:] = xi
+        xi -= back_stress
+        norm = np.sqrt(np.einsum("ip,ip->p", xi, xi, out=w["norm"]), out=w["norm"])
+        f = np.multiply(np.sqrt(2.0 / 3.0) * isotropic_hardening, alpha, out=w["f"])
+        f += np.sqrt(2.0 / 3.0) * yield_stress
+        np.subtract(norm, f, out=f)
+        plastic = f > 0.0
+
+        delta_gamma = np.maximum(f, 0.0, out=w["delta_gamma"])
+        delta_gamma /= 2.0 * mu + 2.0 / 3.0 * hardening
+        # xi becomes the flow direction n (xi is zero where its norm is zero)
+        n = np.divide(xi, norm, out=xi, where=norm > 0.0)
+
+        # return of the stress and update of the history variables
+        tmp = np.multiply(2.0 * mu, delta_gamma, out=w["tmp"])
+        stress -= np.multiply(tmp, n, out=elastic_strain)
+        stress[:3] += kappa * trace
+        np.multiply(delta_gamma, n, out=state_vars_new[0:4])
+        state_vars_new[0:4] += plastic_strain
+        np.multiply((2.0 / 3.0) * kinematic_hardening * delta_gamma, n, out=state_vars_new[4:8])
+        state_vars_new[4:8] += back_stress
+        np.multiply(np.sqrt(2.0 / 3.0), delta_gamma, out=state_vars_new[8])
+        state_vars_new[8] += alpha
+
+        # consistent tangent C = kappa 1 x 1 + 2 mu theta P - 2 mu theta_bar n x n
+        theta = np.divide(tmp, norm, out=w["theta"], where=plastic)
+        theta[~plastic] = 0.0
+        np.subtract(1.0, theta, out=theta)
+        theta_bar = np.subtract(1.0 / (1.0 + hardening / (3.0 * mu)), 1.0, out=w["theta_bar"])
+        theta_bar += theta
+        theta_bar[~plastic] = 0.0
+        theta *= 2.0 * mu
+        theta_bar *= 2.0 * mu
+        # volumetric part of the normal components, kappa - 2 mu theta / 3
+        volumetric = np.multiply(-1.0 / 3.0, theta, out=tmp)
+        volumetric += kappa
+        for i in range(4):
+            for j in range(4):
+                np.multiply(theta_bar, n[i], out=tangent[i, j])
+                np.multiply(tangent[i, j], n[j], out=tangent[i, j])
+                np.negative(tangent[i, j], out=tangent[i, j])
+                if i == j:
+                    tangent[i, j] += theta
+                if i < 3 and j < 3:
+                    tangent[i, j] += volumetric
+
+
+class QuadratureFunctionAdapter:
+    """
+    Evaluates a batched model for the quadrature-space Functions of the FEniCS solver. The
+    Functions store the components of each point contiguously (points, n), the strain is
+    copied into the component-major buffers and stress and tangent are copied back. The
+    strain buffer holds the strain of the last committed increment, the difference to the
+    strain Function is the strain increment.
+    """
+
+    def __init__(self, model: ConstitutiveModel, strain, stress, tangent, properties: np.ndarray):
+        self.model = model
+        self.strain = strain
+        self.stress = stress
+        self.tangent = tangent
+        self.points = len(strain.x.array) // model.n_stress_strain
+        self.buffers = MaterialPointBuffers.allocate(model, self.points, properties)
+
+    def update(self, time: float = 0.0, del_time: float = 0.0) -> None:
+        """Stress and tangent of the strain Function, the new state is kept until `commit`."""
+        n = self.model.n_stress_strain
+        buffers = self.buffers
+        np.subtract(self.strain.x.array.reshape(self.points, n).T, buffers.strain, out=buffers.del_strain)
+        buffers.evaluate(self.model, time, del_time)
+        self.stress.x.array.reshape(self.points, n)[:] = buffers.stress.T
+        self.tangent.x.array.reshape(self.points, n, n)[:] = buffers.tangent.transpose(2, 0, 1)
+
+    def commit(self) -> None:
+        self.buffers.commit()
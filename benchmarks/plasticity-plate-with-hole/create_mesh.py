@@ -0,0 +1,86 @@
+import json
+from argparse import ArgumentParser
+
+import gmsh
+
+
+def create_mesh(parameter_file, mesh_file):
+    from pint import UnitRegistry
+
+    ureg = UnitRegistry()
+    with open(parameter_file) as f:
+        parameters = json.load(f)
+
+    configuration = parameters["configuration"]
+    length = (
+        ureg.Quantity(parameters["length"]["value"], parameters["length"]["unit"])
+        .to_base_units()
+        .magnitude
+    )
+    radius = (
+        ureg.Quantity(parameters["radius"]["value"], parameters["radius"]["unit"])
+        .to_base_units()
+        .magnitude
+    )
+    element_size = (
+        ureg.Quantity(
+            parameters["element-size"]["value"], parameters["element-size"]["unit"]
+        )
+        .to_base_units()
+        .magnitude
+    )
+    # quarter of the plate with a hole, as in the linear elastic benchmark
+    r"""
+    4---------3
+    |         |
+    5_        |
+      \       |
+       1______2
+
+    """
+
+    gmsh.initialize()
+    gmsh.model.add(configuration)
+
+    gmsh.option.setNumber("Mesh.CharacteristicLengthMin", element_size)
+    gmsh.option.setNumber("Mesh.CharacteristicLengthMax", element_size)
+    gmsh.option.setNumber("Mesh.CharacteristicLengthFactor", 1.0)
+    gmsh.option.setNumber("Mesh.ElementOrder", parameters["element-order"])
+
+    z = 0.0
+    lc = 1.0
+
+    center = gmsh.model.geo.addPoint(0.0, 0.0, z, lc)
+    p1 = gmsh.model.geo.addPoint(radius, 0.0, z, lc)
+    p2 = gmsh.model.geo.addPoint(length, 0.0, z, lc)
+    p3 = gmsh.model.geo.addPoint(length, length, z, lc)
+    p4 = gmsh.model.geo.addPoint(0.0, length, z, lc)
+    p5 = gmsh.model.geo.addPoint(0.0, radius, z, lc)
+
+    l1 = gmsh.model.geo.addLine(p1, p2)
+    l2 = gmsh.model.geo.addLine(p2, p3)
+    l3 = gmsh.model.geo.addLine(p3, p4)
+    l4 = gmsh.model.geo.addLine(p4, p5)
+    l5 = gmsh.model.geo.addCircleArc(p5, center, p1)
+
+    curve = gmsh.model.geo.addCurveLoop([l1, l2, l3, l4, l5])
+    plane = gmsh.model.geo.addPlaneSurface([curve])
+    gmsh.model.geo.synchronize()
+    gmsh.model.geo.removeAllDuplicates()
+    gmsh.model.addPhysicalGroup(2, [plane], 1, name="surface")
+    gmsh.model.addPhysicalGroup(1, [l4], 1, name="boundary_left")
+    gmsh.model.addPhysicalGroup(1, [l1], 2, name="boundary_bottom")
+    gmsh.model.addPhysicalGroup(1, [l2], 3, name="boundary_right")
+    gmsh.model.addPhysicalGroup(1, [l3], 4, name="boundary_top")
+
+    gmsh.model.mesh.generate(2)
+    gmsh.write(mesh_file)
+    gmsh.finalize()
+
+
+if __name__ == "__main__":
+    PARSER = ArgumentParser(description="Create the mesh of the plate with a hole for the plasticity benchmark")
+    PARSER.add_argument("--input_parameter_file", required=True, help="JSON file containing simulation parameters")
+    PARSER.add_argument("--output_mesh_file", required=True, help="Output path for the generated mesh (.msh)")
+    ARGS = vars(PARSER.parse_args())
+    create_mesh(ARGS["input_parameter_file"], ARGS["output_mesh_file"])
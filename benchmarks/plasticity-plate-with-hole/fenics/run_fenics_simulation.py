@@ -0,0 +1,294 @@
+import json
+import sys
+import time
+from argparse import ArgumentParser
+from pathlib import Path
+
+import basix.ufl
+import dolfinx as df
+import numpy as np
+import ufl
+from dolfinx.fem.petsc import (
+    LinearProblem,
+    apply_lifting,
+    assemble_matrix,
+    assemble_vector,
+    create_matrix,
+    create_vector,
+    set_bc,
+)
+from mpi4py import MPI
+from petsc4py import PETSc
+from pint import UnitRegistry
+
+# Add parent directory to sys.path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from constitutive_interface import MisesPlasticity, QuadratureFunctionAdapter
+from return_mapping import equivalent_stress
+
+
+def run_fenics_simulation(
+    parameter_file: str,
+    mesh_file: str,
+    solution_file_zip: str,
+    metrics_file: str,
+    max_iterations: int = 25,
+    rtol: float = 1e-10,
+) -> None:
+    """
+    Loads the plate with a hole (plane strain) by a vertical displacement of the top edge which
+    is increased in `load-steps` equal steps. Each load step is solved with Newton's method.
+    The stresses and consistent tangents are stored in quadrature spaces and computed for all
+    quadrature points at once by the batched constitutive model of `constitutive_interface.py`.
+    The history variables are only updated once a step has converged. The load-displacement curve (reaction
+    force of the top edge per unit thickness) is written to the metrics file.
+    """
+    ureg = UnitRegistry()
+    with open(parameter_file) as f:
+        parameters = json.load(f)
+
+    def magnitude(name):
+        return (
+            ureg.Quantity(parameters[name]["value"], parameters[name]["unit"])
+            .to_base_units()
+            .magnitude
+        )
+
+    # properties of MisesPlasticity
+    properties = np.array(
+        [
+            magnitude("young-modulus"),
+            magnitude("poisson-ratio"),
+            magnitude("yield-stress"),
+            magnitude("isotropic-hardening-modulus"),
+            magnitude("kinematic-hardening-modulus"),
+        ]
+    )
+    prescribed_displacement = magnitude("prescribed-displacement")
+    load_steps = parameters["load-steps"]
+
+    mesh, cell_tags, facet_tags = df.io.gmshio.read_from_msh(
+        mesh_file,
+        comm=MPI.COMM_WORLD,
+        gdim=2,
+    )
+    V = df.fem.functionspace(mesh, ("CG", parameters["element-degree"], (2,)))
+
+    # symmetry on the left and bottom edge, prescribed vertical displacement of the top edge
+    dofs_left = df.fem.locate_dofs_topological(V.sub(0), 1, facet_tags.find(1))
+    dofs_bottom = df.fem.locate_dofs_topological(V.sub(1), 1, facet_tags.find(2))
+    dofs_top = df.fem.locate_dofs_topological(V.sub(1), 1, facet_tags.find(4))
+    top_displacement = df.fem.Constant(mesh, 0.0)
+    bcs = [
+        df.fem.dirichletbc(0.0, dofs_left, V.sub(0)),
+        df.fem.dirichletbc(0.0, dofs_bottom, V.sub(1)),
+        df.fem.dirichletbc(top_displacement, dofs_top, V.sub(1)),
+    ]
+    owned_dofs_top = dofs_top[dofs_top < V.dofmap.index_map.size_local * V.dofmap.index_map_bs]
+
+    # stresses, strains (Mandel notation, see constitutive_interface.py) and tangents at the quadrature points
+    quadrature_degree = parameters["quadrature-degree"]
+
+    def quadrature_space(value_shape):
+        return df.fem.functionspace(
+            mesh,
+            basix.ufl.quadrature_element(
+                mesh.topology.cell_name(), value_shape=value_shape, degree=quadrature_degree
+            ),
+        )
+
+    Q_vector = quadrature_space((4,))
+    Q_tensor = quadrature_space((4, 4))
+    Q_scalar = quadrature_space((1,))
+    strain = df.fem.Function(Q_vector, name="strain")
+    stress = df.fem.Function(Q_vector, name="stress")
+    tangent = df.fem.Function(Q_tensor, name="tangent")
+    points = len(strain.x.array) // 4
+    owned_points = Q_vector.dofmap.index_map.size_local
+
+    dx = ufl.Measure(
+        "dx",
+        domain=mesh,
+        metadata={"quadrature_degree": quadrature_degree, "quadrature_scheme": "default"},
+    )
+
+    def eps(v):
+        # plane strain in Mandel notation (xx, yy, zz, sqrt(2) xy)
+        e = ufl.sym(ufl.grad(v))
+        return ufl.as_vector([e[0, 0], e[1, 1], 0.0, np.sqrt(2.0) * e[0, 1]])
+
+    u = df.fem.Function(V, name="u")
+    du = df.fem.Function(V)
+    v_ = ufl.TestFunction(V)
+    du_ = ufl.TrialFunction(V)
+    residual_form = df.fem.form(ufl.inner(stress, eps(v_)) * dx)
+    jacobian_form = df.fem.form(ufl.inner(ufl.dot(tangent, eps(du_)), eps(v_)) * dx)
+    strain_expression = df.fem.Expression(eps(u), Q_vector.element.interpolation_points())
+
+    A = create_matrix(jacobian_form)
+    b = create_vector(residual_form)
+    internal_force = create_vector(residual_form)
+
+    solver = PETSc.KSP().create(mesh.comm)
+    solver.setOperators(A)
+    solver.setOptionsPrefix("plasticity_")
+    options = PETSc.Options()
+    options.prefixPush("plasticity_")
+    for key, value in {
+        "ksp_type": "preonly",
+        "pc_type": "lu",
+        "pc_factor_mat_solver_type": "mumps",
+    }.items():
+        options[key] = value
+    options.prefixPop()
+    solver.setFromOptions()
+
+    constitutive_model = QuadratureFunctionAdapter(MisesPlasticity(), strain, stress, tangent, properties)
+    constitutive_time = 0.0
+    constitutive_updates = 0
+
+    def update_constitutive():
+        """Stresses and tangents of the current displacement (the history variables are not committed)."""
+        nonlocal constitutive_time, constitutive_updates
+        strain.interpolate(strain_expression)
+        start = time.perf_counter()
+        constitutive_model.update()
+        constitutive_time += time.perf_counter() - start
+        constitutive_updates += points
+
+    load_displacement_curve = []
+    for step in range(1, load_steps + 1):
+        top_displacement.value = step / load_steps * prescribed_displacement
+        # Newton's method for the increment of the step, the residual is F(u) and the
+        # correction solves J du = F with the prescribed values of u - g on the boundary
+        for iteration in range(1, max_iterations + 1):
+            update_constitutive()
+            with b.localForm() as b_local:
+                b_local.set(0.0)
+            assemble_vector(b, residual_form)
+            apply_lifting(b, [jacobian_form], bcs=[bcs], x0=[u.x.petsc_vec], alpha=-1.0)
+            b.ghostUpdate(addv=PETSc.InsertMode.ADD, mode=PETSc.ScatterMode.REVERSE)
+            set_bc(b, bcs, u.x.petsc_vec, -1.0)
+
+            A.zeroEntries()
+            assemble_matrix(A, jacobian_form, bcs=bcs)
+            A.assemble()
+            solver.solve(b, du.x.petsc_vec)
+            du.x.scatter_forward()
+            u.x.array[:] -= du.x.array
+            if du.x.petsc_vec.norm() <= rtol * u.x.petsc_vec.norm():
+                break
+        else:
+            raise RuntimeError(
+                f"Newton's method did not converge in {max_iterations} iterations in load step {step}"
+            )
+
+        # history variables and stresses of the converged displacement
+        update_constitutive()
+        constitutive_model.commit()
+        with internal_force.localForm() as f_local:
+            f_local.set(0.0)
+        assemble_vector(internal_force, residual_form)
+        internal_force.ghostUpdate(addv=PETSc.InsertMode.ADD, mode=PETSc.ScatterMode.REVERSE)
+        load_displacement_curve.append(
+            {
+                "prescribed_displacement": float(top_displacement.value),
+                "reaction_force": MPI.COMM_WORLD.allreduce(
+                    float(np.sum(internal_force.array[owned_dofs_top])), op=MPI.SUM
+                ),
+                "newton_iterations": iteration,
+            }
+        )
+        print(
+            f"step {step}: displacement {load_displacement_curve[-1]['prescribed_displacement']:.3e}, "
+            f"reaction force {load_displacement_curve[-1]['reaction_force']:.4e}, {iteration} iterations"
+        )
+
+    # equivalent plastic strain (projected on piecewise constants for the output)
+    alpha = df.fem.Function(Q_scalar)
+    equivalent_plastic_strain = constitutive_model.buffers.state_vars[8]
+    alpha.x.array[:] = equivalent_plastic_strain
+    plot_space = df.fem.functionspace(mesh, ("DG", 0, (1,)))
+    alpha_cells = LinearProblem(
+        ufl.inner(ufl.TrialFunction(plot_space), ufl.TestFunction(plot_space)) * dx,
+        ufl.inner(alpha, ufl.TestFunction(plot_space)) * dx,
+    ).solve()
+    alpha_cells.name = "equivalent_plastic_strain"
+
+    output_dir = Path(solution_file_zip).parent
+    configuration = parameters["configuration"]
+    files = {
+        "displacements": u,
+        "equivalent_plastic_strain": alpha_cells,
+    }
+    for name, function in files.items():
+        with df.io.VTKFile(
+            MPI.COMM_WORLD,
+            str(output_dir / f"solution_field_data_{name}_{configuration}.vtk"),
+            "w",
+        ) as vtk:
+            vtk.write_function(function, 0.0)
+
+    metrics = {
+        "reaction_force": load_displacement_curve[-1]["reaction_force"],
+        "max_equivalent_plastic_strain": MPI.COMM_WORLD.allreduce(
+            float(np.max(equivalent_plastic_strain[:owned_points])), op=MPI.MAX
+        ),
+        "max_von_mises_stress_gauss_points": MPI.COMM_WORLD.allreduce(
+            float(np.max(equivalent_stress(stress.x.array.reshape(-1, 4)[:owned_points]))),
+            op=MPI.MAX,
+        ),
+        "plastic_points": MPI.COMM_WORLD.allreduce(
+            int(np.count_nonzero(equivalent_plastic_strain[:owned_points] > 0.0)), op=MPI.SUM
+        ),
+        "quadrature_points": MPI.COMM_WORLD.allreduce(owned_points, op=MPI.SUM),
+        "load_displacement_curve": load_displacement_curve,
+        "constitutive_updates_per_second": MPI.COMM_WORLD.allreduce(
+            constitutive_updates / constitutive_time, op=MPI.SUM
+        ),
+    }
+
+    if MPI.COMM_WORLD.rank == 0:
+        # store all .vtu, .pvtu and .vtk files for this configuration in the zip file
+        import zipfile
+
+        with zipfile.ZipFile(solution_file_zip, "w") as zipf:
+            for name in files:
+                for filepath in output_dir.glob(f"solution_field_data_{name}_{configuration}*"):
+                    if filepath.suffix in [".vtk", ".vtu", ".pvtu"]:
+                        zipf.write(filepath, arcname=filepath.name)
+        with open(metrics_file, "w") as f:
+            json.dump(metrics, f, indent=4)
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        description="Run the FEniCS simulation of the elastoplastic plate with a hole.\n"
+        "Inputs: --input_parameter_file, --input_mesh_file\n"
+        "Outputs: --output_solution_file_zip, --output_metrics_file"
+    )
+    parser.add_argument(
+        "--input_parameter_file",
+        required=True,
+        help="JSON file containing simulation parameters (input)",
+    )
+    parser.add_argument(
+        "--input_mesh_file", required=True, help="Path to the mesh file (input)"
+    )
+    parser.add_argument(
+        "--output_solution_file_zip",
+        required=True,
+        help="Path to the zipped solution files (output)",
+    )
+    parser.add_argument(
+        "--output_metrics_file",
+        required=True,
+        help="Path to the output metrics JSON file (output)",
+    )
+    args, _ = parser.parse_known_args()
+    run_fenics_simulation(
+        args.input_parameter_file,
+        args.input_mesh_file,
+        args.output_solution_file_zip,
+        args.output_metrics_file,
+    )
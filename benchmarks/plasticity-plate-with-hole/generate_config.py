@@ -0,0 +1,32 @@
+import json
+from pathlib import Path
+
+benchmark = "plasticity-plate-with-hole"
+
+
+def generate_config(config_file: str = "workflow_config.json") -> dict:
+    """
+    Writes the workflow configuration of all parameter files (parameters_*.json) in the
+    current directory, used by the snakemake (configfile) and the Nextflow (-params-file) workflow.
+    """
+    configuration_to_parameter_file = {}
+    for parameter_file in sorted(Path(".").glob("parameters_*.json")):
+        with open(parameter_file) as f:
+            configuration = json.load(f)["configuration"]
+        if configuration in configuration_to_parameter_file:
+            raise ValueError(f"Duplicate configuration value found in parameter files: {configuration}")
+        configuration_to_parameter_file[configuration] = str(parameter_file)
+
+    workflow_config = {
+        "configuration_to_parameter_file": configuration_to_parameter_file,
+        "configurations": list(configuration_to_parameter_file),
+        "tools": ["fenics"],
+        "benchmark": benchmark,
+    }
+    with open(config_file, "w") as f:
+        json.dump(workflow_config, f, indent=4)
+    return workflow_config
+
+
+if __name__ == "__main__":
+    generate_config()
@@ -0,0 +1,78 @@
+include { fenics_workflow } from './fenics/fenics.nf'
+
+process create_mesh {
+    tag "${configuration}"
+    publishDir "${params.result_dir}/mesh/"
+    conda 'environment_mesh.yml'
+
+    input:
+    path python_script
+    val configuration
+    path parameter_file
+
+    output:
+    tuple val(configuration), path("mesh_${configuration}.msh")
+
+    script:
+    """
+    python3 $python_script --input_parameter_file $parameter_file --output_mesh_file "mesh_${configuration}.msh"
+    """
+}
+
+process summary {
+    publishDir "${params.result_dir}/${tool}/"
+    conda 'environment_postprocessing.yml'
+
+    input:
+    path python_script
+    val configuration
+    val parameter_file
+    val solution_metrics
+    val benchmark
+    val tool
+
+    output:
+    path("summary.json")
+
+    script:
+    """
+    python3 $python_script \
+        --input_configuration ${configuration.join(' ')} \
+        --input_parameter_file ${parameter_file.join(' ')} \
+        --input_solution_metrics ${solution_metrics.join(' ')} \
+        --input_benchmark ${benchmark} \
+        --output_summary_json "summary.json"
+    """
+}
+
+workflow {
+    main:
+
+    def parameter_files_path = []
+    params.configurations.each { elem ->
+        parameter_files_path.add(file(params.configuration_to_parameter_file[elem]))
+    }
+
+    def ch_parameter_files = Channel.fromList(parameter_files_path)
+    def ch_configurations = Channel.fromList(params.configurations)
+    def ch_mesh_python_script = Channel.value(file('create_mesh.py'))
+
+    //Creating Mesh
+    output_process_create_mesh = create_mesh(ch_mesh_python_script, ch_configurations, ch_parameter_files)
+    input_fenics_workflow = ch_configurations.merge(ch_parameter_files).join(output_process_create_mesh)
+
+    //Running Simulation
+    fenics_workflow(input_fenics_workflow, params.result_dir)
+
+    //Summarizing results (configuration, parameter file and metrics of all configurations)
+    def matched_channels = input_fenics_workflow.join(fenics_workflow.out).multiMap{ c, p, _m, _z, metrics ->
+        configuration : c
+        parameter_file : p
+        metrics : metrics }
+    summary(Channel.value(file('summarise_results.py')), \
+            matched_channels.configuration.collect(), \
+            matched_channels.parameter_file.collect(), \
+            matched_channels.metrics.collect(), \
+            Channel.value(params.benchmark), \
+            Channel.value('fenics'))
+}
@@ -0,0 +1,81 @@
+import numpy as np
+
+# Strains and stresses are stored in Mandel notation with the components (xx, yy, zz, sqrt(2) xy)
+# of the plane strain state, such that the double contraction of tensors is the dot product.
+IDENTITY = np.array([1.0, 1.0, 1.0, 0.0])
+DEVIATORIC_PROJECTOR = np.eye(4) - np.outer(IDENTITY, IDENTITY) / 3.0
+
+
+def initial_state(points: int) -> dict[str, np.ndarray]:
+    """History variables of `points` quadrature points in the virgin state."""
+    return {
+        "plastic_strain": np.zeros((points, 4)),
+        "back_stress": np.zeros((points, 4)),
+        "alpha": np.zeros(points),
+    }
+
+
+def return_mapping(
+    strain: np.ndarray,
+    state: dict[str, np.ndarray],
+    E: float,
+    nu: float,
+    yield_stress: float,
+    isotropic_hardening: float,
+    kinematic_hardening: float,
+) -> tuple[np.ndarray, np.ndarray, dict[str, np.ndarray]]:
+    """
+    Radial return mapping of Mises plasticity with linear isotropic and kinematic hardening
+    (Simo and Hughes, BOX 3.1 and 3.2) for all quadrature points at once.
+
+    Args:
+        strain: Total strains (points, 4) at the end of the step.
+        state: History variables at the beginning of the step, "plastic_strain" (points, 4),
+            "back_stress" (points, 4) and the equivalent plastic strain "alpha" (points,).
+        E, nu: Young's modulus and Poisson ratio.
+        yield_stress: Initial yield stress sigma_0 of K(alpha) = sigma_0 + H_iso alpha.
+        isotropic_hardening, kinematic_hardening: Hardening moduli H_iso and H_kin.
+
+    Returns:
+        The stresses (points, 4), the consistent tangents (points, 4, 4) and the history
+        variables at the end of the step (a new dict, `state` is not modified).
+    """
+    mu = E / (2.0 * (1.0 + nu))
+    kappa = E / (3.0 * (1.0 - 2.0 * nu))
+
+    elastic_strain = strain - state["plastic_strain"]
+    volumetric_stress = kappa * (elastic_strain @ IDENTITY)
+    deviatoric_trial = 2.0 * mu * (elastic_strain @ DEVIATORIC_PROJECTOR)
+
+    # trial state and yield function
+    xi = deviatoric_trial - state["back_stress"]
+    xi_norm = np.linalg.norm(xi, axis=1)
+    f = xi_norm - np.sqrt(2.0 / 3.0) * (yield_stress + isotropic_hardening * state["alpha"])
+    plastic = f > 0.0
+
+    hardening = isotropic_hardening + kinematic_hardening
+    delta_gamma = np.where(plastic, f, 0.0) / (2.0 * mu + 2.0 / 3.0 * hardening)
+    n = np.divide(xi, xi_norm[:, None], out=np.zeros_like(xi), where=xi_norm[:, None] > 0.0)
+
+    stress = volumetric_stress[:, None] * IDENTITY + deviatoric_trial - 2.0 * mu * delta_gamma[:, None] * n
+    new_state = {
+        "plastic_strain": state["plastic_strain"] + delta_gamma[:, None] * n,
+        "back_stress": state["back_stress"] + 2.0 / 3.0 * kinematic_hardening * delta_gamma[:, None] * n,
+        "alpha": state["alpha"] + np.sqrt(2.0 / 3.0) * delta_gamma,
+    }
+
+    # consistent tangent C = kappa 1 x 1 + 2 mu theta P - 2 mu theta_bar n x n
+    theta = 1.0 - 2.0 * mu * np.divide(delta_gamma, xi_norm, out=np.zeros_like(xi_norm), where=plastic)
+    theta_bar = np.where(plastic, 1.0 / (1.0 + hardening / (3.0 * mu)) - (1.0 - theta), 0.0)
+    tangent = (
+        kappa * np.outer(IDENTITY, IDENTITY)
+        + 2.0 * mu * theta[:, None, None] * DEVIATORIC_PROJECTOR
+        - 2.0 * mu * theta_bar[:, None, None] * n[:, :, None] * n[:, None, :]
+    )
+    return stress, tangent, new_state
+
+
+def equivalent_stress(stress: np.ndarray) -> np.ndarray:
+    """Mises equivalent stress sqrt(3/2 s:s) of stresses (points, 4) in Mandel notation."""
+    deviator = stress @ DEVIATORIC_PROJECTOR
+    return np.sqrt(1.5 * np.sum(deviator**2, axis=1))
@@ -0,0 +1,45 @@
+import json
+from argparse import ArgumentParser
+
+
+def create_summary(
+    configurations: list[str],
+    parameter_files: list[str],
+    solution_metrics: list[str],
+    benchmark: str,
+    summary_json: str,
+) -> None:
+    """Collects the parameters and metrics of all configurations of a tool in one JSON file."""
+    all_summaries = []
+    for configuration, parameter_file, metrics_file in zip(configurations, parameter_files, solution_metrics):
+        with open(parameter_file) as f:
+            parameters = json.load(f)
+        with open(metrics_file) as f:
+            metrics = json.load(f)
+        all_summaries.append(
+            {
+                "benchmark": benchmark,
+                "configuration": configuration,
+                "parameters": parameters,
+                "metrics": metrics,
+            }
+        )
+    with open(summary_json, "w") as f:
+        json.dump(all_summaries, f, indent=4)
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Summarise the results of all configurations of the plasticity benchmark.")
+    parser.add_argument("--input_configuration", nargs="+", required=True, help="Configuration names (input)")
+    parser.add_argument("--input_parameter_file", nargs="+", required=True, help="Path to the JSON file containing simulation parameters (input)")
+    parser.add_argument("--input_solution_metrics", nargs="+", required=True, help="Path to the metrics JSON file (input)")
+    parser.add_argument("--input_benchmark", required=True, help="Name of the benchmark (input)")
+    parser.add_argument("--output_summary_json", required=True, help="Path to the summary JSON file (output)")
+    args = parser.parse_args()
+    create_summary(
+        args.input_configuration,
+        args.input_parameter_file,
+        args.input_solution_metrics,
+        args.input_benchmark,
+        args.output_summary_json,
+    )
@@ -0,0 +1,38 @@
+from harness import benchmark
+
+PARAMETERS = {"E": 210e9, "nu": 0.3, "radius": 0.33, "L": 1.0, "load": 100e6}
+
+
+def _points(size: int):
+    """`size` random points (shape (2, size)) in the plate outside of the hole."""
+    import numpy as np
+
+    rng = np.random.default_rng(42)
+    r = rng.uniform(PARAMETERS["radius"], PARAMETERS["L"], size)
+    theta = rng.uniform(0.0, 0.5 * np.pi, size)
+    return np.vstack([r * np.cos(theta), r * np.sin(theta)])
+
+
+@benchmark(requires=("numpy", "sympy"))
+def construction(size, tmp_dir):
+    from plateWithHoleSolution import PlateWithHoleSolution
+
+    return lambda: PlateWithHoleSolution(**PARAMETERS)
+
+
+@benchmark(sizes=(10**3, 10**5, 10**6), requires=("numpy", "sympy"))
+def displacement(size, tmp_dir):
+    from plateWithHoleSolution import PlateWithHoleSolution
+
+    solution = PlateWithHoleSolution(**PARAMETERS)
+    x = _points(size)
+    return lambda: solution.displacement(x)
+
+
+@benchmark(sizes=(10**3, 10**5, 10**6), requires=("numpy", "sympy"))
+def stress(size, tmp_dir):
+    from plateWithHoleSolution import PlateWithHoleSolution
+
+    solution = PlateWithHoleSolution(**PARAMETERS)
+    x = _points(size)
+    return lambda: solution.stress(x)
@@ -0,0 +1,46 @@
+import json
+import os
+
+from harness import benchmark
+
+
+def _parameter_file(element_size: float, tmp_dir: str) -> str:
+    """Writes a parameter file of the plate with hole for the given element-size."""
+    parameters = {
+        "configuration": f"perf_{element_size}",
+        "radius": {"value": 0.33, "unit": "m"},
+        "length": {"value": 1.0, "unit": "m"},
+        "load": {"value": 100.0, "unit": "MPa"},
+        "element-size": {"value": element_size, "unit": "m"},
+        "element-order": 1,
+        "element-degree": 1,
+        "quadrature-rule": "gauss",
+        "quadrature-degree": 1,
+        "young-modulus": {"value": 210e9, "unit": "Pa"},
+        "poisson-ratio": {"value": 0.3, "unit": ""},
+    }
+    parameter_file = os.path.join(tmp_dir, f"parameters_perf_{element_size}.json")
+    with open(parameter_file, "w") as f:
+        json.dump(parameters, f)
+    return parameter_file
+
+
+@benchmark(sizes=(0.1, 0.025, 0.00625), requires=("gmsh", "pint"))
+def create_mesh(size, tmp_dir):
+    from create_mesh import create_mesh
+
+    parameter_file = _parameter_file(size, tmp_dir)
+    mesh_file = os.path.join(tmp_dir, f"mesh_perf_{size}.msh")
+    return lambda: create_mesh(parameter_file, mesh_file)
+
+
+@benchmark(sizes=(0.1, 0.025, 0.00625), requires=("gmsh", "pint", "meshio", "numpy"))
+def msh_to_mdpa(size, tmp_dir):
+    from create_mesh import create_mesh
+    from msh_to_mdpa import msh_to_mdpa
+
+    parameter_file = _parameter_file(size, tmp_dir)
+    mesh_file = os.path.join(tmp_dir, f"mesh_perf_{size}.msh")
+    create_mesh(parameter_file, mesh_file)
+    mdpa_file = os.path.join(tmp_dir, f"mesh_perf_{size}.mdpa")
+    return lambda: msh_to_mdpa(parameter_file, mesh_file, mdpa_file)
@@ -0,0 +1,125 @@
+from harness import benchmark
+
+
+def _structured_triangles(n: int):
+    """Points and triangles of the unit square with n x n squares split into 2 triangles each."""
+    import numpy as np
+
+    x, y = np.meshgrid(np.linspace(0.0, 1.0, n + 1), np.linspace(0.0, 1.0, n + 1))
+    points = np.column_stack([x.ravel(), y.ravel(), np.zeros(x.size)])
+    i, j = np.meshgrid(np.arange(n), np.arange(n), indexing="ij")
+    lower_left = (i * (n + 1) + j).ravel()
+    lower_right = lower_left + 1
+    upper_left = lower_left + n + 1
+    upper_right = upper_left + 1
+    triangles = np.vstack(
+        [
+            np.column_stack([lower_left, lower_right, upper_right]),
+            np.column_stack([lower_left, upper_right, upper_left]),
+        ]
+    )
+    return points, triangles
+
+
+def _structured_triangle_grid(n: int):
+    """pyvista grid of the unit square with n x n squares split into 2 triangles each."""
+    import numpy as np
+    import pyvista
+
+    points, triangles = _structured_triangles(n)
+    cells = np.column_stack([np.full(len(triangles), 3), triangles]).ravel()
+    celltypes = np.full(len(triangles), 5, dtype=np.uint8)
+    grid = pyvista.UnstructuredGrid(cells, celltypes, points)
+    grid.point_data["u"] = points[:, :2].copy()
+    return grid
+
+
+@benchmark(sizes=(32, 128, 512), requires=("dolfinx", "pyvista", "mpi4py"))
+def pyvista_mesh_to_dolfinx(size, tmp_dir):
+    from mpi4py import MPI
+    from meshhelper.io import pyvista_mesh_to_dolfinx
+
+    grid = _structured_triangle_grid(size)
+    return lambda: pyvista_mesh_to_dolfinx(MPI.COMM_SELF, grid)
+
+
+@benchmark(sizes=(32, 128, 512), requires=("dolfinx", "pyvista", "mpi4py"))
+def pyvista_mesh_to_dolfinx_with_data(size, tmp_dir):
+    from mpi4py import MPI
+    from meshhelper.io import pyvista_mesh_to_dolfinx
+
+    grid = _structured_triangle_grid(size)
+    return lambda: pyvista_mesh_to_dolfinx(MPI.COMM_SELF, grid, ["u"])
+
+
+@benchmark(sizes=(10_000, 100_000, 1_000_000), requires=("numpy",))
+def probe_locate_and_interpolate(size, tmp_dir):
+    import numpy as np
+    from meshhelper.probe import CellLocator
+
+    points, triangles = _structured_triangles(256)
+    locator = CellLocator(points, triangles)
+    values = points[:, :2].copy()
+    query_points = np.random.default_rng(0).random((size, 2))
+
+    def probe():
+        cells, barycentric = locator.locate(query_points)
+        return locator.interpolate(values, cells, barycentric)
+
+    return probe
+
+
+@benchmark(sizes=(64, 256), requires=("numpy", "scipy"))
+def transfer_interpolation_matrix(size, tmp_dir):
+    from meshhelper.probe import CellLocator
+    from meshhelper.transfer import interpolation_matrix
+
+    source_points, source_triangles = _structured_triangles(size)
+    target_points, _ = _structured_triangles(size + 7)
+    return lambda: interpolation_matrix(CellLocator(source_points, source_triangles), target_points)
+
+
+@benchmark(sizes=(64, 256), requires=("numpy", "scipy"))
+def transfer_map_field(size, tmp_dir):
+    from meshhelper.probe import CellLocator
+    from meshhelper.transfer import interpolation_matrix
+
+    source_points, source_triangles = _structured_triangles(size)
+    target_points, _ = _structured_triangles(size + 7)
+    matrix = interpolation_matrix(CellLocator(source_points, source_triangles), target_points)
+    values = source_points[:, :2].copy()
+    return lambda: matrix @ values
+
+
+@benchmark(sizes=(128, 512), requires=("numpy", "h5py", "pyvista"))
+def field_store_read_field(size, tmp_dir):
+    import os
+    from meshhelper.field_store import FieldStore, write_field_store
+
+    grid = _structured_triangle_grid(size)
+    grid.point_data["v"] = grid.points[:, :2] ** 2
+    store_file = os.path.join(tmp_dir, f"field_store_{size}.h5")
+    write_field_store(store_file, [grid])
+
+    def read():
+        with FieldStore(store_file) as store:
+            return store.read("u")
+
+    return read
+
+
+@benchmark(sizes=(128, 512), requires=("numpy", "pyvista"))
+def zipped_vtk_read_field(size, tmp_dir):
+    import os
+    import zipfile
+    from meshhelper.probe import read_result
+
+    grid = _structured_triangle_grid(size)
+    grid.point_data["v"] = grid.points[:, :2] ** 2
+    vtu_file = os.path.join(tmp_dir, f"result_{size}.vtu")
+    zip_file = os.path.join(tmp_dir, f"result_{size}.zip")
+    grid.save(vtu_file)
+    with zipfile.ZipFile(zip_file, "w") as zipf:
+        zipf.write(vtu_file, arcname=os.path.basename(vtu_file))
+
+    return lambda: read_result(zip_file)[0].point_data["u"]
@@ -0,0 +1,41 @@
+import json
+from pathlib import Path
+
+from harness import benchmark
+
+PARAMETER_FILE = Path(__file__).resolve().parent.parent / "benchmarks" / "linear-elastic-mms" / "parameters_01.json"
+
+
+def _parameters() -> dict:
+    with open(PARAMETER_FILE) as f:
+        return json.load(f)
+
+
+@benchmark(requires=("sympy", "pint"))
+def symbolic_derivation(size, tmp_dir):
+    """Derivation of the source terms and code generation, paid once per cache key."""
+    from mms_codegen import generate_source
+
+    parameters = _parameters()
+    return lambda: generate_source(parameters)
+
+
+@benchmark(requires=("sympy", "pint", "numpy"))
+def cache_hit(size, tmp_dir):
+    """Lookup and import of the cached source term module, paid by every run."""
+    from mms_codegen import load_source_terms, source_terms
+
+    parameters = _parameters()
+    source_terms(parameters, tmp_dir)
+    return lambda: load_source_terms(source_terms(parameters, tmp_dir)[0])
+
+
+@benchmark(sizes=(10**4, 10**5, 10**6), requires=("sympy", "pint", "numpy"))
+def body_force(size, tmp_dir):
+    """Generated NumPy body force at `size` points, e.g. the nodes of the kratos mesh."""
+    import numpy as np
+    from mms_codegen import load_source_terms, source_terms
+
+    module = load_source_terms(source_terms(_parameters(), tmp_dir)[0])
+    x = np.random.default_rng(42).random((3, size))
+    return lambda: module.body_force(x)
@@ -0,0 +1,67 @@
+from harness import benchmark
+
+MATERIAL = {
+    "E": 210e9,
+    "nu": 0.3,
+    "yield_stress": 250e6,
+    "isotropic_hardening": 2.1e9,
+    "kinematic_hardening": 2.1e9,
+}
+
+
+@benchmark(sizes=(10**4, 10**5, 10**6), requires=("numpy",))
+def return_mapping(size, tmp_dir):
+    """
+    One constitutive update of `size` quadrature points (about half of them plastic), the
+    throughput in updates per second is size / time per call.
+    """
+    import numpy as np
+    from return_mapping import initial_state, return_mapping
+
+    rng = np.random.default_rng(42)
+    strain = rng.normal(0.0, 1.5e-3, (size, 4)) * np.array([1.0, 1.0, 0.0, 1.0])
+    state = initial_state(size)
+    return lambda: return_mapping(strain, state, **MATERIAL)
+
+
+def _material_point_buffers(size):
+    import numpy as np
+    from constitutive_interface import MaterialPointBuffers, MisesPlasticity
+
+    model = MisesPlasticity()
+    rng = np.random.default_rng(42)
+    buffers = MaterialPointBuffers.allocate(model, size, list(MATERIAL.values()))
+    buffers.del_strain[:] = rng.normal(0.0, 1.5e-3, (4, size)) * np.array([[1.0], [1.0], [0.0], [1.0]])
+    return model, buffers
+
+
+@benchmark(sizes=(10**4, 10**5, 10**6), requires=("numpy",))
+def batched(size, tmp_dir):
+    """
+    One call of the batched constitutive interface for `size` points in the preallocated
+    structure-of-arrays buffers, compare with return_mapping (same model, allocating) and per_point.
+    """
+    model, buffers = _material_point_buffers(size)
+    return lambda: buffers.evaluate(model)
+
+
+@benchmark(sizes=(10**3, 10**4), requires=("numpy",))
+def per_point(size, tmp_dir):
+    """
+    One call of the same model per point (as the umat interface is called), the time grows
+    linearly with the number of points, 10**6 points take about 10**2 times the largest size
+    (about 100 s at 0.1 ms per point).
+    """
+    model, buffers = _material_point_buffers(size)
+    _, point = _material_point_buffers(1)
+
+    def evaluate():
+        for i in range(size):
+            point.del_strain[:, 0] = buffers.del_strain[:, i]
+            point.state_vars[:, 0] = buffers.state_vars[:, i]
+            point.evaluate(model)
+            buffers.stress[:, i] = point.stress[:, 0]
+            buffers.tangent[:, :, i] = point.tangent[:, :, 0]
+            buffers.state_vars_new[:, i] = point.state_vars_new[:, 0]
+
+    return evaluate
@@ -0,0 +1,110 @@
+import contextlib
+import io
+import json
+import os
+
+from harness import benchmark
+
+
+@benchmark(sizes=(10, 100, 1000))
+def create_summary(size, tmp_dir):
+    from summarise_results import create_summary
+
+    configurations = [f"c{idx}" for idx in range(size)]
+    parameter_files, metrics_files = [], []
+    for configuration in configurations:
+        parameter_files.append(os.path.join(tmp_dir, f"parameters_{configuration}.json"))
+        with open(parameter_files[-1], "w") as f:
+            json.dump(
+                {
+                    "configuration": configuration,
+                    "element-size": {"value": 0.1, "unit": "m"},
+                    "element-degree": 1,
+                },
+                f,
+            )
+        metrics_files.append(os.path.join(tmp_dir, f"solution_metrics_{configuration}.json"))
+        with open(metrics_files[-1], "w") as f:
+            json.dump({"max_von_mises_stress_nodes": 3.0e8}, f)
+    summary_json = os.path.join(tmp_dir, "summary.json")
+
+    def run():
+        # create_summary prints a line per configuration
+        with contextlib.redirect_stdout(io.StringIO()):
+            create_summary(
+                configurations,
+                parameter_files,
+                [""] * size,
+                metrics_files,
+                [""] * size,
+                "perf",
+                summary_json,
+            )
+
+    return run
+
+
+def _provenance_graph(idx: int):
+    """
+    A graph with one processing step in the structure of the metadata4ing provenance that is
+    queried by plot_provenance.query_and_build_table.
+    """
+    from rdflib import BNode, Graph, Literal, Namespace, URIRef
+    from rdflib.namespace import RDF, RDFS
+
+    SCHEMA = Namespace("https://schema.org/")
+    M4I = Namespace("http://w3id.org/nfdi4ing/metadata4ing#")
+    g = Graph()
+    g.bind("schema", SCHEMA)
+    g.bind("m4i", M4I)
+    step = URIRef(f"https://example.org/step_{idx}")
+    tool = URIRef(f"https://example.org/tool_{idx % 2}")
+    g.add((step, RDF.type, SCHEMA.Action))
+    g.add((step, SCHEMA.instrument, tool))
+    g.add((tool, RDF.type, SCHEMA.SoftwareApplication))
+    g.add((tool, RDFS.label, Literal("fenics" if idx % 2 == 0 else "kratos")))
+    for label, value, predicate in [
+        ("element_size", 0.1 / (1 + idx), M4I.hasParameter),
+        ("element_order", 1, M4I.hasParameter),
+        ("element_degree", 1, M4I.hasParameter),
+        ("max_von_mises_stress_nodes", 3.0e8 + idx, M4I.investigates),
+    ]:
+        node = BNode()
+        g.add((step, predicate, node))
+        g.add((node, RDF.type, SCHEMA.PropertyValue))
+        g.add((node, RDFS.label, Literal(label)))
+        g.add((node, SCHEMA.value, Literal(value)))
+    return g
+
+
+@benchmark(sizes=(10, 100, 1000), requires=("rdflib",))
+def query_and_build_table(size, tmp_dir):
+    from plot_provenance import query_and_build_table
+
+    # the query runs once on the graph merged from all provenance files (see load_graphs)
+    graph = _provenance_graph(0)
+    for idx in range(1, size):
+        graph += _provenance_graph(idx)
+    return lambda: query_and_build_table(graph)
+
+
+@benchmark(sizes=(10, 100), requires=("rdflib",))
+def load_graphs_cached(size, tmp_dir):
+    from plot_provenance import load_graphs
+
+    artifact_dir = os.path.join(tmp_dir, "artifacts")
+    cache_dir = os.path.join(tmp_dir, "cache")
+    for idx in range(size):
+        os.makedirs(os.path.join(artifact_dir, f"run_{idx}"))
+        _provenance_graph(idx).serialize(
+            os.path.join(artifact_dir, f"run_{idx}", "provenance.jsonld"), format="json-ld"
+        )
+    # the first call parses the JSON-LD files and fills the cache, only loading from the cache is timed
+    with contextlib.redirect_stdout(io.StringIO()):
+        load_graphs(artifact_dir, cache_dir)
+
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            load_graphs(artifact_dir, cache_dir)
+
+    return run
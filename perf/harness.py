@@ -0,0 +1,60 @@
+import importlib.util
+import statistics
+import timeit
+from dataclasses import dataclass, field
+from typing import Callable
+
+# all registered benchmarks, name -> Benchmark
+BENCHMARKS = {}
+
+
+@dataclass
+class Benchmark:
+    """
+    A benchmark is a function `setup(size, tmp_dir)` that prepares the (synthetic) input for the
+    given size and returns a callable without arguments. Only the returned callable is timed.
+    """
+
+    name: str
+    setup: Callable
+    sizes: tuple = (None,)
+    requires: tuple = ()
+    missing: list = field(default_factory=list)
+
+    def is_available(self) -> bool:
+        self.missing = [
+            module for module in self.requires if importlib.util.find_spec(module) is None
+        ]
+        return not self.missing
+
+    def run(self, size, tmp_dir: str, repeat: int) -> dict:
+        """
+        Times the benchmark for one size. The number of calls per measurement is determined
+        with timeit's autorange (at least 0.2 s per measurement), the measurement is repeated
+        `repeat` times and the min and median time per call are returned.
+        """
+        function = self.setup(size, tmp_dir)
+        timer = timeit.Timer(function)
+        number, _ = timer.autorange()
+        times = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+        return {
+            "min": min(times),
+            "median": statistics.median(times),
+            "number": number,
+            "repeat": repeat,
+        }
+
+
+def benchmark(sizes=(None,), requires=()):
+    """
+    Registers a benchmark. `sizes` are passed one after another to the setup function and
+    `requires` lists the modules that need to be importable, otherwise the benchmark is skipped
+    (e.g. when dolfinx is not installed in the current environment).
+    """
+
+    def decorator(setup):
+        name = f"{setup.__module__.removeprefix('bench_')}.{setup.__name__}"
+        BENCHMARKS[name] = Benchmark(name, setup, tuple(sizes), tuple(requires))
+        return setup
+
+    return decorator
@@ -0,0 +1,134 @@
+import datetime
+import importlib
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+from argparse import ArgumentParser
+from pathlib import Path
+
+PERF_DIR = Path(__file__).resolve().parent
+ROOT_DIR = PERF_DIR.parent
+BENCHMARK_DIR = ROOT_DIR / "benchmarks" / "linear-elastic-plate-with-hole"
+PLASTICITY_DIR = ROOT_DIR / "benchmarks" / "plasticity-plate-with-hole"
+MMS_DIR = ROOT_DIR / "benchmarks" / "linear-elastic-mms"
+
+# the benchmarked scripts are no packages, they are imported from their directories
+for path in [PERF_DIR, ROOT_DIR / "src", BENCHMARK_DIR, BENCHMARK_DIR / "kratos"]:
+    sys.path.insert(0, str(path))
+# the other benchmarks also contain a create_mesh.py, their directories come after the one of
+# the linear elastic plate with a hole
+for path in [PLASTICITY_DIR, MMS_DIR]:
+    sys.path.append(str(path))
+
+from harness import BENCHMARKS
+
+BENCHMARK_MODULES = [
+    "bench_analytical_solution",
+    "bench_meshhelper",
+    "bench_mesh",
+    "bench_mms_codegen",
+    "bench_plasticity",
+    "bench_summary",
+]
+
+
+def result_key(name: str, size) -> str:
+    return name if size is None else f"{name}[{size}]"
+
+
+def run_benchmarks(name_filter: str | None, repeat: int) -> dict:
+    """Runs all registered benchmarks whose name contains `name_filter`."""
+    for module in BENCHMARK_MODULES:
+        importlib.import_module(module)
+
+    results = {}
+    for name, bench in BENCHMARKS.items():
+        if name_filter and name_filter not in name:
+            continue
+        if not bench.is_available():
+            print(f"skipped {name} (missing {', '.join(bench.missing)})")
+            continue
+        for size in bench.sizes:
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                result = bench.run(size, tmp_dir, repeat)
+            results[result_key(name, size)] = result
+            print(f"{result_key(name, size):60s} {result['min'] * 1e3:12.4f} ms")
+    return results
+
+
+def compare_to_baseline(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """
+    Returns the benchmarks whose minimal time exceeds the baseline by more than the relative
+    `threshold` (e.g. 0.25 for 25%). Benchmarks that are not part of both runs are ignored.
+    """
+    regressions = []
+    for key, result in results.items():
+        if key not in baseline["results"]:
+            continue
+        ratio = result["min"] / baseline["results"][key]["min"]
+        if ratio > 1.0 + threshold:
+            regressions.append(f"{key}: {ratio:.2f}x slower than the baseline")
+    return regressions
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], cwd=ROOT_DIR, text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        description="Run the performance benchmarks of the python hot paths and compare them to a stored baseline.\n"
+        "Benchmarks whose dependencies are not installed in the current environment are skipped."
+    )
+    parser.add_argument("--filter", default=None, help="Only run benchmarks whose name contains this string")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of repeated measurements per benchmark")
+    parser.add_argument("--output", default="perf_results.json", help="Path to the results JSON file (output)")
+    parser.add_argument(
+        "--baseline",
+        default=str(PERF_DIR / "baseline.json"),
+        help="Path to the baseline JSON file the results are compared to (input)",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Relative slowdown compared to the baseline that counts as a regression",
+    )
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Store the results as the new baseline instead of comparing to it",
+    )
+    args = parser.parse_args()
+
+    results = {
+        "date": datetime.datetime.now().isoformat(),
+        "commit": git_commit(),
+        "machine": platform.node(),
+        "python": platform.python_version(),
+        "results": run_benchmarks(args.filter, args.repeat),
+    }
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=4)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=4)
+        print(f"Baseline saved as {args.baseline}")
+    elif Path(args.baseline).is_file():
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(results["results"], baseline, args.threshold)
+        if regressions:
+            print("\nPerformance regressions:\n" + "\n".join(regressions))
+            sys.exit(1)
+        print(f"\nNo regressions compared to {args.baseline} (threshold {args.threshold:.0%})")
+    else:
+        print(f"\nNo baseline found at {args.baseline}, run with --save-baseline to create one")
@@ -0,0 +1,176 @@
+import json
+import os
+import subprocess
+import sys
+from argparse import ArgumentParser
+from functools import cache
+from pathlib import Path
+
+PERF_DIR = Path(__file__).resolve().parent
+ROOT_DIR = PERF_DIR.parent
+BENCHMARKS_DIR = ROOT_DIR / "benchmarks"
+
+# Budget of the time [ms] to import each workflow entry-point script, i.e. everything that runs
+# before its main block (imports and module-level code). The scripts run as many short jobs,
+# heavy modules should only be imported on the code paths that need them (e.g. matplotlib
+# only when plotting). The budgets of the solver scripts include the import of the solver.
+STARTUP_BUDGETS_MS = {
+    "linear-elastic-plate-with-hole/artifact_cache.py": 50,
+    "linear-elastic-plate-with-hole/compare_tools.py": 500,
+    "linear-elastic-plate-with-hole/convergence_study.py": 50,
+    "linear-elastic-plate-with-hole/cost_model.py": 50,
+    "linear-elastic-plate-with-hole/create_field_store.py": 500,
+    "linear-elastic-plate-with-hole/create_mesh.py": 600,
+    "linear-elastic-plate-with-hole/create_scaling_parameters.py": 50,
+    "linear-elastic-plate-with-hole/generate_config.py": 50,
+    "linear-elastic-plate-with-hole/matrix_free_report.py": 50,
+    "linear-elastic-plate-with-hole/measure_resources.py": 50,
+    "linear-elastic-plate-with-hole/plot_provenance.py": 600,
+    "linear-elastic-plate-with-hole/probe_results.py": 500,
+    "linear-elastic-plate-with-hole/provenance_report.py": 50,
+    "linear-elastic-plate-with-hole/resource_usage.py": 50,
+    "linear-elastic-plate-with-hole/results_history.py": 100,
+    "linear-elastic-plate-with-hole/results_store.py": 250,
+    "linear-elastic-plate-with-hole/summarise_results.py": 50,
+    "linear-elastic-plate-with-hole/summarise_scaling.py": 50,
+    "linear-elastic-plate-with-hole/warm_start_report.py": 50,
+    "linear-elastic-plate-with-hole/fenics/reduced_order_model.py": 3000,
+    "linear-elastic-plate-with-hole/fenics/run_fenics_simulation.py": 3000,
+    "linear-elastic-plate-with-hole/kratos/create_kratos_input.py": 1000,
+    "linear-elastic-plate-with-hole/kratos/msh_to_mdpa.py": 800,
+    "linear-elastic-plate-with-hole/kratos/postprocess_results.py": 800,
+    "linear-elastic-plate-with-hole/kratos/run_kratos_pipeline.py": 1500,
+    "linear-elastic-plate-with-hole/kratos/run_kratos_simulation.py": 50,
+    "plasticity-plate-with-hole/create_mesh.py": 600,
+    "plasticity-plate-with-hole/generate_config.py": 50,
+    "plasticity-plate-with-hole/summarise_results.py": 50,
+    "plasticity-plate-with-hole/fenics/run_fenics_simulation.py": 3000,
+    "linear-elastic-mms/convergence_report.py": 50,
+    "linear-elastic-mms/create_mesh.py": 600,
+    "linear-elastic-mms/generate_config.py": 50,
+    "linear-elastic-mms/mms_codegen.py": 50,
+    "linear-elastic-mms/fenics/run_fenics_simulation.py": 3000,
+    "linear-elastic-mms/kratos/create_kratos_input.py": 800,
+    "linear-elastic-mms/kratos/msh_to_mdpa.py": 800,
+    "linear-elastic-mms/kratos/postprocess_results.py": 800,
+    "linear-elastic-mms/kratos/run_kratos_simulation.py": 50,
+}
+
+# imports the module and prints the time of the import, the -X importtime report goes to stderr
+# (the marker separates the imports of the interpreter startup from the ones of the script)
+IMPORT_MARKER = "startup_budget: import"
+IMPORT_SNIPPET = """
+import importlib, sys, time
+print({marker!r}, file=sys.stderr)
+start = time.perf_counter()
+importlib.import_module({module!r})
+print("startup_budget", time.perf_counter() - start)
+"""
+
+
+@cache
+def repo_modules() -> frozenset[str]:
+    """Names of the modules and packages defined in the repository (e.g. plateWithHoleSolution, meshhelper)."""
+    names = set()
+    for root, dirs, files in os.walk(ROOT_DIR):
+        dirs[:] = [name for name in dirs if not name.startswith(".") and name != "__pycache__"]
+        names.update(file[: -len(".py")] for file in files if file.endswith(".py"))
+        if "__init__.py" in files:
+            names.add(os.path.basename(root))
+    return frozenset(names)
+
+
+def parse_importtime(stderr: str) -> dict[str, float]:
+    """
+    Cumulative import time [ms] of the modules imported directly by the script (the top level
+    of the -X importtime tree, "import time: self [us] | cumulative | imported package").
+    """
+    imports = {}
+    for line in stderr.partition(IMPORT_MARKER)[2].splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, package = line.removeprefix("import time:").split("|")
+        # nested imports are indented by two spaces per level
+        if not package.startswith("  ") and package.strip():
+            imports[package.strip()] = int(cumulative) / 1e3
+    return imports
+
+
+def measure_startup(script: Path, repeat: int) -> dict:
+    """
+    Imports `script` as a module (without running its main block) in `repeat` fresh interpreters
+    with `-X importtime` and returns the min import time [ms] and the slowest direct imports of
+    the fastest run. A script that cannot be imported because a third-party module is missing
+    (e.g. dolfinx outside of its conda environment) is skipped, a missing module of the repository
+    (e.g. a wrong import path) is an error. Files created or modified in the directory of the
+    script by the import are reported as side effects.
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(ROOT_DIR / "src"), env.get("PYTHONPATH")]))
+    command = [sys.executable, "-X", "importtime", "-c", IMPORT_SNIPPET.format(module=script.stem, marker=IMPORT_MARKER)]
+
+    def files():
+        return {path.name: path.stat().st_mtime_ns for path in script.parent.iterdir() if path.name != "__pycache__"}
+
+    before = files()
+
+    runs = []
+    # the first run writes the bytecode cache and is not timed
+    for _ in range(repeat + 1):
+        process = subprocess.run(command, cwd=script.parent, env=env, capture_output=True, text=True)
+        if process.returncode != 0:
+            missing = [line for line in process.stderr.splitlines() if line.startswith("ModuleNotFoundError")]
+            if missing and "'" in missing[-1]:
+                module = missing[-1].split("'")[1]
+                if module.split(".")[0] not in repo_modules():
+                    return {"skipped": module}
+            raise RuntimeError(f"Importing {script} failed:\n{process.stderr}")
+        seconds = float(process.stdout.splitlines()[-1].split()[-1])
+        runs.append((seconds * 1e3, parse_importtime(process.stderr)))
+
+    # files created or modified by the import
+    created = sorted(name for name, mtime in files().items() if before.get(name) != mtime)
+    time_ms, imports = min(runs[1:], key=lambda run: run[0])
+    slowest = dict(sorted(imports.items(), key=lambda item: item[1], reverse=True)[:5])
+    return {"time_ms": time_ms, "slowest_imports_ms": slowest, "side_effects": created}
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        description="Check the import time of the workflow entry-point scripts against their budget."
+    )
+    parser.add_argument("--filter", default=None, help="Only check scripts whose path contains this string")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of timed imports per script (min is used)")
+    parser.add_argument("--output", default="startup_results.json", help="Path to the results JSON file (output)")
+    args = parser.parse_args()
+
+    results = {}
+    failed = []
+    for name, budget in STARTUP_BUDGETS_MS.items():
+        if args.filter and args.filter not in name:
+            continue
+        result = measure_startup(BENCHMARKS_DIR / name, args.repeat)
+        if "skipped" in result:
+            print(f"skipped {name} (missing {result['skipped']})")
+            continue
+        result["budget_ms"] = budget
+        results[name] = result
+
+        status = "ok"
+        if result["time_ms"] > budget:
+            status = "OVER BUDGET"
+        if result["side_effects"]:
+            status = f"SIDE EFFECTS ({', '.join(result['side_effects'])})"
+        if status != "ok":
+            failed.append(name)
+        slowest = ", ".join(f"{module} {ms:.0f}" for module, ms in list(result["slowest_imports_ms"].items())[:3])
+        print(f"{name:65s} {result['time_ms']:8.1f} / {budget:5d} ms  {status:12s} {slowest}")
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=4)
+
+    if failed:
+        print(f"\n{len(failed)} script(s) exceed their startup budget or have import side effects:")
+        for name in failed:
+            print(f"  {name}")
+        sys.exit(1)
@@ -1 +1,30 @@
-from .io import pyvista_mesh_to_dolfinx, vtu_to_dolfinx
+from importlib import import_module
+
+# The submodules are imported on first access, such that e.g. the probes can be used in
+# environments without dolfinx.
+_exports = {
+    "pyvista_mesh_to_dolfinx": "io",
+    "vtu_to_dolfinx": "io",
+    "CellLocator": "probe",
+    "FunctionProbe": "probe",
+    "Probe": "probe",
+    "mesh_hash": "probe",
+    "read_result": "probe",
+    "sample_arc": "probe",
+    "sample_line": "probe",
+    "FieldStore": "field_store",
+    "convert_result": "field_store",
+    "write_field_store": "field_store",
+    "Transfer": "transfer",
+    "cached_interpolation_matrix": "transfer",
+    "difference_norms": "transfer",
+    "interpolation_matrix": "transfer",
+}
+
+__all__ = list(_exports)
+
+
+def __getattr__(name):
+    if name in _exports:
+        return getattr(import_module(f".{_exports[name]}", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
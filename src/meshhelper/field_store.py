@@ -0,0 +1,190 @@
+import json
+from pathlib import Path
+
+import h5py
+import numpy as np
+
+from .probe import _triangles, mesh_hash, read_result
+
+# chunks of about 1 MB (float64), such that reading a field or a part of it only
+# decompresses the chunks that contain the requested rows
+CHUNK_VALUES = 1 << 17
+
+
+def _chunks(shape: tuple) -> tuple:
+    row_size = int(np.prod(shape[1:])) if len(shape) > 1 else 1
+    rows = max(1, min(shape[0], CHUNK_VALUES // row_size))
+    return (rows,) + tuple(shape[1:])
+
+
+def _create_dataset(group: h5py.Group, name: str, data: np.ndarray, compression: str | None, level: int | None):
+    data = np.ascontiguousarray(data)
+    if data.size == 0:
+        return group.create_dataset(name, data=data)
+    return group.create_dataset(
+        name,
+        data=data,
+        chunks=_chunks(data.shape),
+        compression=compression,
+        compression_opts=level if compression == "gzip" else None,
+        shuffle=compression is not None,
+    )
+
+
+def write_field_store(
+    file: str | Path,
+    grids: list,
+    parameters: dict | None = None,
+    compression: str | None = "gzip",
+    level: int | None = 4,
+) -> None:
+    """
+    Writes the fields of result grids (pyvista) to an HDF5 file:
+    - /meshes/{mesh hash}/points and /cells: each mesh is stored once, even if several
+      grids (e.g. the files of one FEniCS result) share it,
+    - /fields/{name}: one chunked and compressed dataset per field with the attributes
+      `mesh` (hash of its mesh) and `location` ("point" or "cell"),
+    - the parameters of the configuration as JSON in the attribute `parameters` of the root.
+    The field names have to be unique across the grids, a field that is contained in several
+    grids is only allowed (and stored once) if it has the same mesh, location and values.
+    """
+    with h5py.File(file, "w") as f:
+        meshes = f.create_group("meshes")
+        fields = f.create_group("fields")
+        if parameters is not None:
+            f.attrs["parameters"] = json.dumps(parameters)
+            f.attrs["configuration"] = parameters.get("configuration", "")
+        for grid in grids:
+            points, cells, mask = _triangles(grid)
+            key = mesh_hash(points[:, :2], cells)
+            if key not in meshes:
+                mesh = meshes.create_group(key)
+                _create_dataset(mesh, "points", points, compression, level)
+                _create_dataset(mesh, "cells", cells, compression, level)
+                mesh.attrs["cell_type"] = int(np.asarray(grid.celltypes)[mask][0])
+            for location, data in (("point", grid.point_data), ("cell", grid.cell_data)):
+                for name in data.keys():
+                    values = np.asarray(data[name])
+                    if location == "cell":
+                        values = values[mask]
+                    if name in fields:
+                        existing = fields[name]
+                        if (
+                            existing.attrs["mesh"] != key
+                            or existing.attrs["location"] != location
+                            or not np.array_equal(existing[()], values)
+                        ):
+                            raise ValueError(
+                                f"Field '{name}' is contained in several grids with different data "
+                                f"(meshes {existing.attrs['mesh'][:12]} and {key[:12]}), field names have to be unique"
+                            )
+                        continue
+                    dataset = _create_dataset(fields, name, values, compression, level)
+                    dataset.attrs["mesh"] = key
+                    dataset.attrs["location"] = location
+
+
+class FieldStore:
+    """
+    Lazy reader of a field store written by `write_field_store`. Only the requested fields,
+    and of these only the chunks of the requested rows, are read and decompressed.
+
+    ```python
+    with FieldStore("solution_field_data_1.h5") as store:
+        displacement = store.field("u")[:1000]  # h5py dataset, sliced lazily
+        grids = store.to_pyvista(["u"])         # e.g. for a Probe
+    ```
+    """
+
+    def __init__(self, file: str | Path):
+        self.file = h5py.File(file, "r")
+
+    def __enter__(self) -> "FieldStore":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.file.close()
+
+    @property
+    def fields(self) -> list[str]:
+        return list(self.file["fields"])
+
+    @property
+    def parameters(self) -> dict | None:
+        parameters = self.file.attrs.get("parameters")
+        return None if parameters is None else json.loads(parameters)
+
+    def field(self, name: str) -> h5py.Dataset:
+        """The dataset of a field, slicing it (e.g. `store.field("u")[10:20]`) reads only these rows."""
+        return self.file["fields"][name]
+
+    def read(self, name: str, rows=slice(None)) -> np.ndarray:
+        """Values of a field as array, optionally only the given rows (slice or increasing indices)."""
+        return self.field(name)[rows]
+
+    def location(self, name: str) -> str:
+        return self.field(name).attrs["location"]
+
+    def mesh(self, name: str) -> tuple[h5py.Dataset, h5py.Dataset, int]:
+        """Points, cells (lazy datasets) and VTK cell type of the mesh of a field."""
+        mesh = self.file["meshes"][self.field(name).attrs["mesh"]]
+        return mesh["points"], mesh["cells"], int(mesh.attrs["cell_type"])
+
+    def read_region(self, name: str, lower, upper) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Indices and values of the points (or cells, by their first node) of a field inside
+        the box [lower, upper]. The coordinates are read, but of the field only the chunks
+        between the first and the last point of the region.
+        """
+        points, cells, _ = self.mesh(name)
+        points = points[:, : len(lower)]
+        if self.location(name) == "cell":
+            points = points[cells[:, 0]]
+        inside = np.all((points >= lower) & (points <= upper), axis=1)
+        indices = np.flatnonzero(inside)
+        if len(indices) == 0:
+            return indices, self.read(name, slice(0, 0))
+        # one contiguous read of the rows between the first and the last index (h5py's point
+        # selection is slow for many indices), then the selection in memory
+        values = self.read(name, slice(indices[0], indices[-1] + 1))
+        return indices, values[indices - indices[0]]
+
+    def to_pyvista(self, names: list[str] | None = None) -> list:
+        """One pyvista grid per mesh with the (requested) fields as point and cell data."""
+        import pyvista
+
+        names = self.fields if names is None else names
+        grids = {}
+        for name in names:
+            key = self.field(name).attrs["mesh"]
+            if key not in grids:
+                points, cells, cell_type = self.mesh(name)
+                points, cells = points[:], cells[:]
+                if points.shape[1] == 2:
+                    points = np.column_stack([points, np.zeros(len(points))])
+                vtk_cells = np.column_stack([np.full(len(cells), cells.shape[1]), cells]).ravel()
+                grids[key] = pyvista.UnstructuredGrid(
+                    vtk_cells, np.full(len(cells), cell_type, dtype=np.uint8), points
+                )
+            data = grids[key].point_data if self.location(name) == "point" else grids[key].cell_data
+            data[name] = self.read(name)
+        return list(grids.values())
+
+    def export_vtk(self, directory: str | Path, names: list[str] | None = None) -> list[Path]:
+        """Writes one .vtu file per mesh for viewers (e.g. ParaView), returns the file names."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        stem = Path(self.file.filename).stem
+        files = []
+        for index, grid in enumerate(self.to_pyvista(names)):
+            files.append(directory / f"{stem}_{index}.vtu")
+            grid.save(files[-1])
+        return files
+
+
+def convert_result(result_file: str | Path, store_file: str | Path, parameters: dict | None = None, **kwargs) -> None:
+    """Converts a result (VTK files or the zip archive of the workflows) into a field store."""
+    write_field_store(store_file, read_result(result_file), parameters, **kwargs)
@@ -0,0 +1,353 @@
+import hashlib
+import tempfile
+import xml.etree.ElementTree as ET
+import zipfile
+from pathlib import Path
+
+import numpy as np
+
+# VTK cell types of triangles, the number of nodes distinguishes linear and quadratic cells.
+# The nodes are ordered as vertices 0, 1, 2 followed by the midside nodes of the edges (0, 1),
+# (1, 2) and (2, 0) for both the quadratic (22) and the Lagrange (69) triangle.
+triangle_cell_types = (5, 22, 69)
+
+
+def mesh_hash(points: np.ndarray, cells: np.ndarray) -> str:
+    """sha256 of the coordinates and the connectivity of a mesh."""
+    sha256 = hashlib.sha256()
+    for array in (points, cells):
+        array = np.ascontiguousarray(array)
+        sha256.update(str((array.dtype.str, array.shape)).encode())
+        sha256.update(array.tobytes())
+    return sha256.hexdigest()
+
+
+def shape_functions(barycentric: np.ndarray, nodes_per_cell: int) -> np.ndarray:
+    """Values (n, nodes_per_cell) of the linear (3 nodes) or quadratic (6 nodes) Lagrange basis."""
+    if nodes_per_cell == 3:
+        return barycentric
+    if nodes_per_cell == 6:
+        l0, l1, l2 = barycentric.T
+        return np.column_stack(
+            [l0 * (2 * l0 - 1), l1 * (2 * l1 - 1), l2 * (2 * l2 - 1), 4 * l0 * l1, 4 * l1 * l2, 4 * l2 * l0]
+        )
+    raise NotImplementedError(f"Triangles with {nodes_per_cell} nodes are not supported")
+
+
+def _quadratic_shape_derivatives(xi: np.ndarray) -> np.ndarray:
+    """Derivatives (n, 6, 2) of the quadratic basis w.r.t. the reference coordinates xi = (l1, l2)."""
+    l1, l2 = xi.T
+    l0 = 1.0 - l1 - l2
+    zero = np.zeros_like(l1)
+    d_xi1 = [1 - 4 * l0, 4 * l1 - 1, zero, 4 * (l0 - l1), 4 * l2, -4 * l2]
+    d_xi2 = [1 - 4 * l0, zero, 4 * l2 - 1, -4 * l1, 4 * l1, 4 * (l0 - l2)]
+    return np.stack([np.column_stack(d_xi1), np.column_stack(d_xi2)], axis=2)
+
+
+class CellLocator:
+    """
+    Spatial index of a triangle mesh (linear or quadratic cells in the x-y plane) that finds
+    the cell and the barycentric coordinates of many query points at once.
+
+    The bounding boxes of the cells are sorted into a uniform grid of bins (`bins_per_cell`
+    bins per cell in total) once. A query only tests the cells of the bin of each point,
+    all points of a batch are processed with array operations. Curved quadratic cells are
+    inverted with a few Newton iterations of the isoparametric map. The index is built on the
+    first query, e.g. not at all if only cached interpolation matrices are used.
+    """
+
+    def __init__(self, points: np.ndarray, cells: np.ndarray, bins_per_cell: float = 1.0):
+        self.points = np.ascontiguousarray(np.asarray(points, dtype=float)[:, :2])
+        self.cells = np.ascontiguousarray(cells, dtype=np.int64)
+        if self.cells.ndim != 2 or self.cells.shape[1] not in (3, 6):
+            raise NotImplementedError("Only linear (3 nodes) and quadratic (6 nodes) triangles are supported")
+        self.bins_per_cell = bins_per_cell
+        self._bin_cells = None
+
+    def _build_index(self) -> None:
+        vertices = self.points[self.cells[:, :3]]
+        self._origin = vertices[:, 0]
+        jacobian = np.stack([vertices[:, 1] - vertices[:, 0], vertices[:, 2] - vertices[:, 0]], axis=2)
+        self._inverse_jacobian = np.linalg.inv(jacobian)
+
+        cell_points = self.points[self.cells]
+        lower = cell_points.min(axis=1)
+        upper = cell_points.max(axis=1)
+        size = (upper - lower).max(axis=1)
+        if self.cells.shape[1] == 6:
+            midpoints = 0.5 * (vertices + vertices[:, [1, 2, 0]])
+            deviation = np.linalg.norm(cell_points[:, 3:] - midpoints, axis=2).max(axis=1)
+            self._curved = deviation > 1e-10 * size
+        else:
+            self._curved = np.zeros(len(self.cells), dtype=bool)
+        # curved edges may bulge slightly beyond the bounding box of the nodes
+        padding = np.where(self._curved, 0.25, 0.0) * size
+        lower -= padding[:, None]
+        upper += padding[:, None]
+
+        self._lower = lower.min(axis=0)
+        self._upper = upper.max(axis=0)
+        span = np.maximum(self._upper - self._lower, 1e-300)
+        n_bins = max(1.0, len(self.cells) * self.bins_per_cell)
+        nx = max(1, int(round(np.sqrt(n_bins * span[0] / span[1]))))
+        ny = max(1, int(round(n_bins / nx)))
+        self._shape = np.array([nx, ny])
+        self._bin_size = span / self._shape
+
+        # expand each cell to all bins overlapped by its bounding box
+        first = self._bin_index(lower)
+        last = self._bin_index(upper)
+        width = last[:, 0] - first[:, 0] + 1
+        counts = width * (last[:, 1] - first[:, 1] + 1)
+        cell_ids = np.repeat(np.arange(len(self.cells)), counts)
+        local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        ix = np.repeat(first[:, 0], counts) + local % np.repeat(width, counts)
+        iy = np.repeat(first[:, 1], counts) + local // np.repeat(width, counts)
+        bins = ix * ny + iy
+        self._bin_cells = cell_ids[np.argsort(bins, kind="stable")]
+        self._bin_offsets = np.zeros(nx * ny + 1, dtype=np.int64)
+        np.cumsum(np.bincount(bins, minlength=nx * ny), out=self._bin_offsets[1:])
+
+    def _bin_index(self, x: np.ndarray) -> np.ndarray:
+        index = np.floor((x - self._lower) / self._bin_size).astype(np.int64)
+        return np.clip(index, 0, self._shape - 1)
+
+    def _newton(self, cells: np.ndarray, x: np.ndarray, xi: np.ndarray, iterations: int = 6) -> np.ndarray:
+        """Reference coordinates of the points x in the curved quadratic cells (isoparametric map)."""
+        cell_points = self.points[self.cells[cells]]
+        for _ in range(iterations):
+            l1, l2 = xi.T
+            values = shape_functions(np.column_stack([1.0 - l1 - l2, l1, l2]), 6)
+            residual = np.einsum("nk,nkd->nd", values, cell_points) - x
+            jacobian = np.einsum("nkd,nke->nde", cell_points, _quadratic_shape_derivatives(xi))
+            xi = xi - np.linalg.solve(jacobian, residual[:, :, None])[:, :, 0]
+        return xi
+
+    def locate(
+        self, query_points: np.ndarray, batch_size: int = 100_000, tolerance: float = 1e-8
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the cell (-1 for points outside of the mesh) and the barycentric coordinates
+        (n, 3) of each query point. Points on shared edges are assigned to one of the cells.
+        """
+        if self._bin_cells is None:
+            self._build_index()
+        query_points = np.asarray(query_points, dtype=float)[:, :2]
+        cells = np.full(len(query_points), -1, dtype=np.int64)
+        barycentric = np.full((len(query_points), 3), np.nan)
+        for start in range(0, len(query_points), batch_size):
+            x = query_points[start : start + batch_size]
+            bins = self._bin_index(x) @ np.array([self._shape[1], 1])
+            counts = self._bin_offsets[bins + 1] - self._bin_offsets[bins]
+            # points on the boundary of the mesh may be outside of the bounding box by round-off
+            margin = tolerance * (self._upper - self._lower)
+            counts[np.any((x < self._lower - margin) | (x > self._upper + margin), axis=1)] = 0
+
+            # all (point, candidate cell) pairs of the batch
+            pair_point = np.repeat(np.arange(len(x)), counts)
+            local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+            pair_cell = self._bin_cells[np.repeat(self._bin_offsets[bins], counts) + local]
+            xi = np.einsum(
+                "nij,nj->ni", self._inverse_jacobian[pair_cell], x[pair_point] - self._origin[pair_cell]
+            )
+            curved = self._curved[pair_cell]
+            if curved.any():
+                xi[curved] = self._newton(pair_cell[curved], x[pair_point[curved]], xi[curved])
+            pair_barycentric = np.column_stack([1.0 - xi.sum(axis=1), xi])
+
+            if len(pair_point) == 0:
+                continue
+            # per point, the first candidate with the largest minimal barycentric coordinate
+            # (the pairs are grouped by point)
+            score = pair_barycentric.min(axis=1)
+            has_candidates = counts > 0
+            best_score = np.maximum.reduceat(score, (np.cumsum(counts) - counts)[has_candidates])
+            best = np.flatnonzero(score == np.repeat(best_score, counts[has_candidates]))
+            best = best[np.r_[True, pair_point[best[1:]] != pair_point[best[:-1]]]]
+            best = best[score[best] >= -tolerance]
+            cells[start + pair_point[best]] = pair_cell[best]
+            barycentric[start + pair_point[best]] = pair_barycentric[best]
+        return cells, barycentric
+
+    def interpolate(
+        self, values: np.ndarray, cells: np.ndarray, barycentric: np.ndarray, cell_data: bool = False
+    ) -> np.ndarray:
+        """
+        Interpolates nodal values (n_points, ...) with the basis of the cells, or takes the
+        value of the cell for cell data (n_cells, ...). Points outside of the mesh are NaN.
+        """
+        values = np.asarray(values, dtype=float)
+        found = cells >= 0
+        result = np.full((len(cells),) + values.shape[1:], np.nan)
+        if cell_data:
+            result[found] = values[cells[found]]
+            return result
+        weights = shape_functions(barycentric[found], self.cells.shape[1])
+        result[found] = np.einsum("nk,nk...->n...", weights, values[self.cells[cells[found]]])
+        return result
+
+
+def _triangles(grid) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Points, triangle connectivity and the mask of the triangles among all cells of a pyvista grid."""
+    cells_dict = grid.cells_dict
+    cell_types = [cell_type for cell_type in triangle_cell_types if cell_type in cells_dict]
+    if len(cell_types) != 1:
+        raise ValueError(f"Expected triangles of a single type, found the VTK cell types {list(cells_dict)}")
+    mask = np.asarray(grid.celltypes) == cell_types[0]
+    return np.asarray(grid.points), np.asarray(cells_dict[cell_types[0]]), mask
+
+
+def _read_grid(file: Path) -> list:
+    """Reads a VTK file; for a ParaView collection (.pvd, dolfinx writes them as .vtk), the datasets of the last time step."""
+    import pyvista
+
+    with open(file, "rb") as f:
+        is_xml = f.read(5) == b"<?xml"
+    if is_xml and file.suffix in (".vtk", ".pvd"):
+        datasets = ET.parse(file).getroot().findall(".//DataSet")
+        last_step = max(float(dataset.get("timestep", 0)) for dataset in datasets)
+        files = [
+            file.parent / dataset.get("file")
+            for dataset in datasets
+            if float(dataset.get("timestep", 0)) == last_step
+        ]
+        return [grid for dataset_file in files for grid in _read_grid(dataset_file)]
+    grid = pyvista.read(file)
+    if isinstance(grid, pyvista.MultiBlock):
+        grid = grid.combine()
+    return [grid]
+
+
+def read_result(file: str | Path) -> list:
+    """
+    Reads the grids of a result: a VTK file (.vtk, .vtu, .pvtu, .pvd), a zip archive of
+    VTK files as written by the workflows (solution_field_data_{configuration}.zip) or a
+    field store (.h5, see meshhelper.field_store).
+    """
+    file = Path(file)
+    if file.suffix in (".h5", ".hdf5"):
+        from .field_store import FieldStore
+
+        with FieldStore(file) as store:
+            return store.to_pyvista()
+    if file.suffix != ".zip":
+        return _read_grid(file)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        with zipfile.ZipFile(file) as zipf:
+            zipf.extractall(tmp_dir)
+        files = sorted(Path(tmp_dir).glob("*.vtk"))
+        # pieces of parallel and time-dependent outputs are read through their collections
+        files = files or sorted(Path(tmp_dir).glob("*.pvtu")) or sorted(Path(tmp_dir).glob("*.vtu"))
+        return [grid for result_file in files for grid in _read_grid(result_file)]
+
+
+class Probe:
+    """
+    Evaluates the fields (point and cell data) of result grids at arbitrary points.
+    Grids with the same mesh (e.g. the files of the fields of one FEniCS result) share one
+    CellLocator, which is built once and reused for all queries.
+    """
+
+    def __init__(self, grids, bins_per_cell: float = 1.0):
+        if not isinstance(grids, (list, tuple)):
+            grids = [grids]
+        self._locators = {}
+        # name -> (mesh hash, values, is cell data)
+        self._fields = {}
+        for grid in grids:
+            points, cells, mask = _triangles(grid)
+            key = mesh_hash(points[:, :2], cells)
+            if key not in self._locators:
+                self._locators[key] = CellLocator(points, cells, bins_per_cell)
+            for name in grid.point_data.keys():
+                self._fields[name] = (key, np.asarray(grid.point_data[name]), False)
+            for name in grid.cell_data.keys():
+                self._fields[name] = (key, np.asarray(grid.cell_data[name])[mask], True)
+
+    @classmethod
+    def from_file(cls, file: str | Path, bins_per_cell: float = 1.0) -> "Probe":
+        return cls(read_result(file), bins_per_cell)
+
+    @property
+    def fields(self) -> list[str]:
+        return list(self._fields)
+
+    def field_data(self, name: str) -> tuple[str, CellLocator, np.ndarray, bool]:
+        """Hash and locator of the mesh of a field, its values and whether it is cell data."""
+        key, values, cell_data = self._fields[name]
+        return key, self._locators[key], values, cell_data
+
+    def evaluate(
+        self, query_points: np.ndarray, fields: list[str] | None = None, batch_size: int = 100_000
+    ) -> dict[str, np.ndarray]:
+        """Values of the fields at the query points (n, 2 or 3), NaN outside of the mesh."""
+        fields = self.fields if fields is None else fields
+        located = {}
+        result = {}
+        for name in fields:
+            key, values, cell_data = self._fields[name]
+            if key not in located:
+                located[key] = self._locators[key].locate(query_points, batch_size)
+            result[name] = self._locators[key].interpolate(values, *located[key], cell_data=cell_data)
+        return result
+
+
+class FunctionProbe:
+    """
+    Evaluates dolfinx Functions on one mesh at arbitrary points, using the bounding box tree
+    of the cells that is built once. Only the points on the cells of the current process are
+    found, the remaining values are NaN.
+    """
+
+    def __init__(self, mesh):
+        import dolfinx as df
+
+        self.mesh = mesh
+        self._tree = df.geometry.bb_tree(mesh, mesh.topology.dim)
+
+    def locate(self, query_points: np.ndarray) -> np.ndarray:
+        """The first colliding cell of each point, -1 if there is none."""
+        import dolfinx as df
+
+        candidates = df.geometry.compute_collisions_points(self._tree, query_points)
+        colliding = df.geometry.compute_colliding_cells(self.mesh, candidates, query_points)
+        offsets = colliding.offsets
+        cells = np.full(len(query_points), -1, dtype=np.int32)
+        has_cell = np.diff(offsets) > 0
+        cells[has_cell] = colliding.array[offsets[:-1][has_cell]]
+        return cells
+
+    def evaluate(self, functions: list, query_points: np.ndarray, batch_size: int = 100_000) -> dict[str, np.ndarray]:
+        """Values of the functions (by name) at the query points (n, 2 or 3)."""
+        query_points = np.asarray(query_points, dtype=float)
+        query_points = np.column_stack(
+            [query_points, np.zeros((len(query_points), 3 - query_points.shape[1]))]
+        )
+        result = {
+            function.name: np.full((len(query_points), function.function_space.value_size), np.nan)
+            for function in functions
+        }
+        for start in range(0, len(query_points), batch_size):
+            x = np.ascontiguousarray(query_points[start : start + batch_size])
+            cells = self.locate(x)
+            found = cells >= 0
+            for function in functions:
+                result[function.name][start : start + len(x)][found] = function.eval(x[found], cells[found])
+        return result
+
+
+def sample_line(start, end, n: int) -> np.ndarray:
+    """n equidistant points (n, 3) from start to end (both included)."""
+    start_3d, end_3d = np.zeros(3), np.zeros(3)
+    start_3d[: len(start)] = start
+    end_3d[: len(end)] = end
+    t = np.linspace(0.0, 1.0, n)[:, None]
+    return (1.0 - t) * start_3d + t * end_3d
+
+
+def sample_arc(center, radius: float, start_angle: float, end_angle: float, n: int) -> np.ndarray:
+    """n equidistant points (n, 3) on a circular arc in the x-y plane, angles in radians."""
+    angles = np.linspace(start_angle, end_angle, n)
+    return np.column_stack(
+        [center[0] + radius * np.cos(angles), center[1] + radius * np.sin(angles), np.zeros(n)]
+    )
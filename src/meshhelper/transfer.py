@@ -0,0 +1,117 @@
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import scipy.sparse
+
+from .probe import CellLocator, Probe, _triangles, mesh_hash, shape_functions
+
+
+def interpolation_matrix(
+    locator: CellLocator, target_points: np.ndarray, cell_data: bool = False
+) -> scipy.sparse.csr_matrix:
+    """
+    Sparse matrix (n_target_points, n_source_points or n_source_cells) that maps the nodal
+    values (or the cell values) of the source mesh to the target points. The rows of target
+    points outside of the source mesh are empty.
+    """
+    cells, barycentric = locator.locate(target_points)
+    found = np.flatnonzero(cells >= 0)
+    if cell_data:
+        return scipy.sparse.csr_matrix(
+            (np.ones(len(found)), (found, cells[found])),
+            shape=(len(target_points), len(locator.cells)),
+        )
+    nodes_per_cell = locator.cells.shape[1]
+    weights = shape_functions(barycentric[found], nodes_per_cell)
+    return scipy.sparse.csr_matrix(
+        (weights.ravel(), (np.repeat(found, nodes_per_cell), locator.cells[cells[found]].ravel())),
+        shape=(len(target_points), len(locator.points)),
+    )
+
+
+def cached_interpolation_matrix(
+    locator: CellLocator,
+    source_hash: str,
+    target_points: np.ndarray,
+    target_hash: str,
+    cell_data: bool = False,
+    cache_dir: str | Path | None = None,
+) -> scipy.sparse.csr_matrix:
+    """
+    Interpolation matrix from the cache directory (keyed by the hashes of source and target
+    mesh), computed and stored if it is not cached yet.
+    """
+    if cache_dir is None:
+        return interpolation_matrix(locator, target_points, cell_data)
+    cache_file = Path(cache_dir) / f"{source_hash}_{target_hash}_{'cell' if cell_data else 'point'}.npz"
+    if cache_file.is_file():
+        return scipy.sparse.load_npz(cache_file)
+    matrix = interpolation_matrix(locator, target_points, cell_data)
+    os.makedirs(cache_dir, exist_ok=True)
+    # written to a temporary file first, such that concurrent jobs never read a partial file
+    fd, tmp_file = tempfile.mkstemp(dir=cache_dir, suffix=".npz")
+    os.close(fd)
+    scipy.sparse.save_npz(tmp_file, matrix)
+    os.replace(tmp_file, cache_file)
+    return matrix
+
+
+class Transfer:
+    """
+    Transfers the fields of a source result to the nodes of a (non-matching) target mesh.
+    The interpolation matrix of each source mesh is assembled once (and cached on disk if
+    `cache_dir` is given), afterwards each field is mapped with one sparse matrix-vector
+    product. Values at target nodes outside of the source mesh are NaN.
+    """
+
+    def __init__(self, source: Probe, target_grid, cache_dir: str | Path | None = None):
+        points, cells, _ = _triangles(target_grid)
+        self.source = source
+        self.target_points = points
+        self.target_hash = mesh_hash(points[:, :2], cells)
+        self.cache_dir = cache_dir
+        self._matrices = {}
+
+    def matrix(self, name: str) -> scipy.sparse.csr_matrix:
+        """The interpolation matrix of the mesh of the source field `name`."""
+        source_hash, locator, _, cell_data = self.source.field_data(name)
+        if (source_hash, cell_data) not in self._matrices:
+            self._matrices[(source_hash, cell_data)] = cached_interpolation_matrix(
+                locator, source_hash, self.target_points, self.target_hash, cell_data, self.cache_dir
+            )
+        return self._matrices[(source_hash, cell_data)]
+
+    def map(self, fields: list[str] | None = None) -> dict[str, np.ndarray]:
+        """Values of the source fields at the target nodes."""
+        fields = self.source.fields if fields is None else fields
+        result = {}
+        for name in fields:
+            _, _, values, _ = self.source.field_data(name)
+            matrix = self.matrix(name)
+            values = np.asarray(values, dtype=float)
+            mapped = (matrix @ values.reshape(len(values), -1)).reshape((matrix.shape[0],) + values.shape[1:])
+            mapped[np.diff(matrix.indptr) == 0] = np.nan
+            result[name] = mapped
+        return result
+
+
+def difference_norms(values: np.ndarray, reference: np.ndarray) -> dict[str, float]:
+    """
+    Discrete norms of the pointwise difference of two fields (n, ...) on the same points,
+    points where either field is NaN are ignored.
+    """
+    values = np.asarray(values, dtype=float).reshape(len(values), -1)
+    reference = np.asarray(reference, dtype=float).reshape(len(reference), -1)
+    valid = ~(np.isnan(values).any(axis=1) | np.isnan(reference).any(axis=1))
+    difference = np.linalg.norm(values[valid] - reference[valid], axis=1)
+    reference_norm = np.linalg.norm(reference[valid], axis=1)
+    rms_reference = float(np.sqrt(np.mean(reference_norm**2))) if valid.any() else float("nan")
+    rms_difference = float(np.sqrt(np.mean(difference**2))) if valid.any() else float("nan")
+    return {
+        "max_abs_difference": float(difference.max()) if valid.any() else float("nan"),
+        "rms_difference": rms_difference,
+        "relative_rms_difference": rms_difference / rms_reference if rms_reference > 0 else float("nan"),
+        "number_of_points": int(valid.sum()),
+    }
@@ -0,0 +1,74 @@
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks" / "linear-elastic-plate-with-hole"))
+from artifact_cache import cache_key, run_cached
+
+
+def _step(tmp_path):
+    (tmp_path / "helper.py").write_text("FACTOR = 2\n")
+    script = tmp_path / "script.py"
+    script.write_text(
+        "import sys\n"
+        "def main():\n"
+        "    from helper import FACTOR\n"
+        "    open(sys.argv[2], 'w').write(str(FACTOR * float(sys.argv[1])))\n"
+        "main()\n"
+    )
+    return str(script)
+
+
+def test_cache_key_depends_on_imports_and_arguments(tmp_path):
+    script = _step(tmp_path)
+    output = str(tmp_path / "out.txt")
+    key = cache_key(["step"], [], [script], [output], ["python3", script, "1.0", output])
+    assert key == cache_key(["step"], [], [script], [output], ["python3", script, "1.0", output])
+    assert key != cache_key(["step"], [], [script], [output], ["python3", script, "2.0", output])
+
+    (tmp_path / "helper.py").write_text("FACTOR = 3\n")
+    assert key != cache_key(["step"], [], [script], [output], ["python3", script, "1.0", output])
+
+
+def test_hit_marker_and_refresh(tmp_path):
+    script = _step(tmp_path)
+    cache_dir = str(tmp_path / "cache")
+    output = str(tmp_path / "out.txt")
+    marker = str(tmp_path / "benchmarks" / "step.tsv.cache_hit")
+    command = [sys.executable, script, "1.0", output]
+
+    assert run_cached(command, cache_dir, ["step"], [], [script], [output], marker) == 0
+    assert not Path(marker).exists()
+
+    Path(output).unlink()
+    assert run_cached(command, cache_dir, ["step"], [], [script], [output], marker) == 0
+    assert Path(marker).exists()
+    assert Path(output).read_text() == "2.0"
+
+    Path(output).unlink()
+    assert run_cached(command, cache_dir, ["step"], [], [script], [output], marker, refresh=True) == 0
+    assert not Path(marker).exists()
+
+
+def test_hit_keeps_shared_modification_time(tmp_path):
+    script = _step(tmp_path)
+    cache_dir = str(tmp_path / "cache")
+    output = str(tmp_path / "snakemake" / "out.txt")
+    restored = str(tmp_path / "nextflow" / "out.txt")
+    Path(output).parent.mkdir()
+    os.utime(script, (1e9, 1e9))
+    os.utime(tmp_path / "helper.py", (1e9, 1e9))
+
+    assert run_cached([sys.executable, script, "1.0", output], cache_dir, ["step"], [], [script], [output]) == 0
+    os.utime(output, (1.2e9, 1.2e9))
+    # the restored output of the other engine shares the inode with the cache entry and the output
+    assert run_cached([sys.executable, script, "1.0", restored], cache_dir, ["step"], [], [script], [restored]) == 0
+    assert os.stat(output).st_mtime == 1.2e9
+    assert os.stat(restored).st_mtime == 1.2e9
+
+    # an input newer than the cached output, the output is restored as a private copy
+    os.utime(script, (1.5e9, 1.5e9))
+    assert run_cached([sys.executable, script, "1.0", restored], cache_dir, ["step"], [], [script], [restored]) == 0
+    assert os.stat(output).st_mtime == 1.2e9
+    assert os.stat(restored).st_mtime > 1.5e9
+    assert os.stat(restored).st_ino != os.stat(output).st_ino
@@ -0,0 +1,38 @@
+import json
+import sys
+from pathlib import Path
+
+BENCHMARK_DIR = Path(__file__).resolve().parent.parent / "benchmarks" / "linear-elastic-plate-with-hole"
+sys.path.insert(0, str(BENCHMARK_DIR))
+from cost_model import DEFAULT_COST_MODEL, calibrate, estimate_size, step_priorities
+
+
+def test_step_priorities_follow_critical_path():
+    cost_estimates = {
+        "1": {"steps": {"create_mesh": {"runtime_s": 1.0}, "run_fenics_simulation": {"runtime_s": 10.0},
+                        "postprocess_kratos_results": {"runtime_s": 5.0}}},
+    }
+    priorities = step_priorities(cost_estimates)
+    # the cheap mesh generation precedes the simulation
+    assert priorities["create_mesh"] > priorities["run_fenics_simulation"] > priorities["postprocess_kratos_results"]
+
+
+def test_calibrate_skips_cache_hits(tmp_path):
+    configuration_to_parameter_file = {}
+    for configuration, element_size in (("1", 0.1), ("05", 0.05)):
+        parameters = {"length": {"value": 1.0, "unit": "m"}, "radius": {"value": 0.2, "unit": "m"},
+                      "element-size": {"value": element_size, "unit": "m"}}
+        parameter_file = tmp_path / f"parameters_{configuration}.json"
+        parameter_file.write_text(json.dumps(parameters))
+        configuration_to_parameter_file[configuration] = str(parameter_file)
+        dofs = estimate_size(parameters)["dofs"]
+        benchmark_file = tmp_path / f"run_fenics_simulation_{configuration}.tsv"
+        benchmark_file.write_text(f"s\tmax_rss\n{1.0 + 1e-3 * dofs}\t{100.0 + 1e-2 * dofs}\n")
+
+    cost_model = calibrate(str(tmp_path), configuration_to_parameter_file)
+    assert abs(cost_model["run_fenics_simulation"]["runtime"][1] - 1e-3) < 1e-9
+
+    # with one step restored from the cache, there are not enough points for a fit
+    (tmp_path / "run_fenics_simulation_05.tsv.cache_hit").write_text("{}")
+    cost_model = calibrate(str(tmp_path), configuration_to_parameter_file)
+    assert cost_model["run_fenics_simulation"] == DEFAULT_COST_MODEL["run_fenics_simulation"]
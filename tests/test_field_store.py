@@ -0,0 +1,29 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+import pyvista
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+from meshhelper.field_store import FieldStore, write_field_store
+
+
+def _grid(resolution, **point_data):
+    grid = pyvista.Plane(i_resolution=resolution, j_resolution=resolution).triangulate().cast_to_unstructured_grid()
+    grid.point_data.clear()
+    for name, values in point_data.items():
+        grid.point_data[name] = values
+    return grid
+
+
+def test_duplicate_field_names(tmp_path):
+    u = np.arange(16, dtype=float)
+    # the same field in two grids of the same mesh is stored once
+    write_field_store(tmp_path / "shared.h5", [_grid(3, u=u), _grid(3, u=u, s=np.ones(16))])
+    with FieldStore(tmp_path / "shared.h5") as store:
+        assert store.fields == ["s", "u"]
+        np.testing.assert_array_equal(store.read("u"), u)
+
+    with pytest.raises(ValueError, match="Field 'u'"):
+        write_field_store(tmp_path / "clash.h5", [_grid(3, u=u), _grid(4, u=np.zeros(25))])
@@ -0,0 +1,35 @@
+import json
+import os
+import stat
+import sys
+from pathlib import Path
+
+MMS_DIR = Path(__file__).resolve().parent.parent / "benchmarks" / "linear-elastic-mms"
+sys.path.insert(0, str(MMS_DIR))
+from mms_codegen import cache_key, source_terms
+
+
+def _parameters():
+    with open(MMS_DIR / "parameters_01.json") as f:
+        return json.load(f)
+
+
+def test_cache_key_normalizes_units():
+    parameters = _parameters()
+    converted = json.loads(json.dumps(parameters))
+    converted["young-modulus"] = {"value": parameters["young-modulus"]["value"] / 1e9, "unit": "GPa"}
+    assert cache_key(converted) == cache_key(parameters)
+
+    converted["young-modulus"]["value"] *= 2
+    assert cache_key(converted) != cache_key(parameters)
+
+
+def test_cached_module_permissions(tmp_path):
+    umask = os.umask(0o022)
+    try:
+        path, hit = source_terms(_parameters(), tmp_path)
+    finally:
+        os.umask(umask)
+    assert not hit
+    assert stat.S_IMODE(path.stat().st_mode) == 0o644
+    assert source_terms(_parameters(), tmp_path) == (path, True)
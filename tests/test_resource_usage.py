@@ -0,0 +1,41 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks" / "linear-elastic-plate-with-hole"))
+from resource_usage import NEXTFLOW_CACHE_HIT_MARKER, add_usage_to_ro_crate, read_nextflow_trace
+
+TRACE_FIELDS = ["task_id", "process", "name", "tag", "status", "exit", "realtime", "%cpu", "peak_rss",
+                "peak_vmem", "rchar", "wchar", "workdir"]
+
+
+def test_usage_in_ro_crate(tmp_path):
+    workdirs = [tmp_path / "work" / "ab" / "cdef", tmp_path / "work" / "12" / "3456"]
+    for workdir in workdirs:
+        workdir.mkdir(parents=True)
+    (workdirs[1] / NEXTFLOW_CACHE_HIT_MARKER).write_text("{}")
+    rows = [
+        ["1", "fenics_workflow:run_simulation", "run_simulation (1)", "1", "COMPLETED", "0", "2000", "50.0",
+         str(1024**2), str(1024**2), "0", str(2 * 1024**2), str(workdirs[0])],
+        ["2", "create_mesh", "create_mesh (1)", "1", "COMPLETED", "0", "10", "100.0",
+         str(1024**2), str(1024**2), "0", "0", str(workdirs[1])],
+    ]
+    trace_file = tmp_path / "trace.tsv"
+    trace_file.write_text("\n".join("\t".join(row) for row in [TRACE_FIELDS] + rows) + "\n")
+    tasks = read_nextflow_trace(str(trace_file))
+    assert tasks[0]["id"] == "abcdef" and tasks[0]["usage"]["cpu_time"] == 1.0
+    assert tasks[1]["usage"]["cache_hit"]
+
+    ro_crate = {
+        "@context": "https://w3id.org/ro/crate/1.1/context",
+        "@graph": [
+            {"@id": "#abcdef", "@type": "CreateAction", "name": "run_simulation (1)"},
+            {"@id": "#other", "@type": "CreateAction", "name": "create_mesh (1)"},
+        ],
+    }
+    assert add_usage_to_ro_crate(ro_crate, tasks) == 1
+    assert add_usage_to_ro_crate(ro_crate, tasks) == 1
+    action = ro_crate["@graph"][0]
+    assert len(action["m4i:investigates"]) == 5
+    wall_time = next(entity for entity in ro_crate["@graph"] if entity["@id"] == "#abcdef-wall_time")
+    assert wall_time["value"] == 2.0 and wall_time["unitText"] == "s"
+    assert "m4i:investigates" not in ro_crate["@graph"][1]
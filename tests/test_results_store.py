@@ -0,0 +1,96 @@
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks" / "linear-elastic-plate-with-hole"))
+from results_store import ResultsStore, ingest, summary_row
+
+
+def _row(tool, configuration, **metrics):
+    return {
+        "tool": tool,
+        "configuration": configuration,
+        "benchmark": "linear-elastic-plate-with-hole",
+        "mesh": f"{configuration}/mesh",
+        "parameters": {
+            "element-size": {"value": float(configuration), "unit": "m"},
+            "element-degree": 1,
+            "quadrature-rule": "GAUSS_JACOBI",
+        },
+        "metrics": metrics,
+    }
+
+
+def _write(path, row):
+    with open(path, "w") as f:
+        json.dump(row, f)
+    return str(path)
+
+
+def test_summary_round_trip(tmp_path):
+    rows = [
+        _row("fenics", "1", max_von_mises_stress_nodes=3.0e8, iterations=12, converged=True,
+             load_cases=[{"name": "a", "value": 1.0}], mixed=1, missing=None, empty={}),
+        _row("fenics", "05", max_von_mises_stress_nodes=3.1e8, iterations=15, converged=False,
+             load_cases=[], mixed=1.5, missing=None, empty={}),
+        _row("kratos", "1", max_von_mises_stress_nodes=2.9e8),
+    ]
+    store = ResultsStore(str(tmp_path / "store.npz"))
+    store.upsert(rows)
+    store.save()
+
+    expected = [
+        {key: row[key] for key in ("benchmark", "parameters", "mesh", "metrics", "configuration")}
+        for row in rows[:2]
+    ]
+    summary = ResultsStore(str(tmp_path / "store.npz")).to_summary("fenics", ["1", "05"])
+    assert summary == expected
+    assert type(summary[0]["metrics"]["mixed"]) is int
+    assert type(summary[1]["metrics"]["mixed"]) is float
+
+
+def test_upsert_changes_column_kind(tmp_path):
+    store = ResultsStore(str(tmp_path / "store.npz"))
+    store.upsert([_row("fenics", "1", iterations=12), _row("fenics", "05", iterations=15)])
+    store.upsert([_row("fenics", "05", iterations=15.5, label="a much longer string than before")])
+    summary = store.to_summary("fenics")
+    assert summary[0]["metrics"] == {"iterations": 12}
+    assert summary[1]["metrics"] == {"iterations": 15.5, "label": "a much longer string than before"}
+
+
+def test_ingest_uses_content_not_mtime(tmp_path):
+    store_path = str(tmp_path / "store.npz")
+    fenics = _write(tmp_path / "fenics.json", _row("fenics", "1", m=1.0))
+    kratos = _write(tmp_path / "kratos.json", _row("kratos", "1", m=1.0))
+    store = ResultsStore(store_path)
+    ingest(store, "fenics", ["1"], [fenics])
+    ingest(store, "kratos", ["1"], [kratos])
+
+    # the kratos row is regenerated before the fenics update rewrites the store
+    _write(tmp_path / "kratos.json", _row("kratos", "1", m=2.0))
+    _write(tmp_path / "fenics.json", _row("fenics", "1", m=2.0))
+    ingest(ResultsStore(store_path), "fenics", ["1"], [fenics])
+    os.utime(kratos, (0, 0))
+
+    store = ResultsStore(store_path)
+    ingest(store, "kratos", ["1"], [kratos])
+    assert ResultsStore(store_path).to_summary("kratos")[0]["metrics"] == {"m": 2.0}
+
+
+def test_summary_row_timings_of_the_tool(tmp_path):
+    benchmark_dir = tmp_path / "benchmarks"
+    benchmark_dir.mkdir()
+    for rule in ("create_mesh", "run_fenics_simulation", "run_fenics_load_cases", "mesh_to_mdpa",
+                 "run_kratos_simulation"):
+        (benchmark_dir / f"{rule}_1.tsv").write_text("s\tmax_rss\n1.5\t100.0\n")
+    # another configuration whose name ends like the configuration of the row
+    (benchmark_dir / "run_fenics_simulation_01.tsv").write_text("s\tmax_rss\n9.0\t100.0\n")
+    parameter_file = _write(tmp_path / "parameters_1.json", {"configuration": "1"})
+    metrics_file = _write(tmp_path / "metrics.json", {"m": 1.0})
+
+    fenics = summary_row("benchmark", "fenics", "1", parameter_file, metrics_file, str(benchmark_dir))
+    kratos = summary_row("benchmark", "kratos", "1", parameter_file, metrics_file, str(benchmark_dir))
+    assert sorted(fenics["timings"]) == ["create_mesh", "run_fenics_simulation"]
+    assert fenics["timings"]["run_fenics_simulation"]["wall_time"] == 1.5
+    assert sorted(kratos["timings"]) == ["create_mesh", "mesh_to_mdpa", "run_kratos_simulation"]